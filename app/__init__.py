@@ -10,6 +10,10 @@ from flask import Flask
 from flask_jwt_extended import JWTManager
 from config import config
 from .db_connection import init_app as init_db_connection
+from .cache import init_app as init_result_cache
+from .instrumentation import init_app as init_query_stats
+from .metrics import init_app as init_metrics
+from .profiling import init_app as init_profiling
 from utils.seed_data import seed_data
 import sys # Used for exiting the application on critical startup errors.
 
@@ -50,6 +54,10 @@ def create_app(config_name='default'):
         # init_db_connection sets up database teardown context and might raise ConnectionError.
         init_db_connection(app)  # Integrates database connection management with Flask's lifecycle.
         jwt.init_app(app) # Initializes JWT support for the application.
+        init_result_cache(app) # Creates the analysis result cache when RESULT_CACHE_ENABLED is set.
+        init_query_stats(app) # Adds the per-request query count and DB time headers when QUERY_STATS_HEADERS is set.
+        init_metrics(app) # Creates the request/repository latency metrics when METRICS_ENABLED is set.
+        init_profiling(app) # Profiles sampled (or admin-requested) requests when PROFILING_ENABLED is set.
 
         # Import and register blueprints for different functional areas of the application.
         # Blueprints help in organizing the application into modular components.
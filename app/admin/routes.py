@@ -7,4 +7,22 @@ within the Student Wellbeing Monitoring System. It includes specific routes for
 Modules, Alerts, Students, Users, and a generic CRUD mechanism for other entities.
 """
 
+from flask import Response, jsonify
+from app.metrics import CONTENT_TYPE, get_metrics
+from app.utils.decorators import role_required
+from . import admin
 
+
+@admin.route('/metrics', methods=['GET'])
+@role_required('admin')
+def metrics():
+    """
+    Exposes the request and repository latency metrics in the Prometheus text format.
+
+    Returns:
+        Response: The exposition document, or a 404 JSON response if metrics are disabled.
+    """
+    registry = get_metrics()
+    if registry is None:
+        return jsonify({"msg": "Metrics are disabled."}), 404
+    return Response(registry.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,304 @@
+"""
+Result caching for expensive, read-mostly repository queries.
+
+This module provides a small, pluggable result cache used by the
+`AnalysisRepository` methods behind the staff dashboard. Results are keyed
+by the method, its arguments and the current *version* of every table the
+method reads. The repositories' write methods record the tables they write
+(`mark_tables_written()` in `app/db_connection.py`), and once the unit of
+work commits, each table's version is bumped, so the cached results that
+depend on it become unreachable; they then age out through the LRU/TTL
+policy.
+
+Results are neither read from nor stored in the cache while the context's
+write connection has uncommitted work, since they may include it. A TTL
+bounds staleness for writes made outside the repositories (e.g., by another
+process using a purely in-process cache).
+
+The default backend is an in-process LRU with per-entry TTL. A shared backend
+(e.g., a thin wrapper around Redis or memcached) can be plugged in through the
+`RESULT_CACHE_BACKEND` setting; it must implement `get`, `set`, `incr` and
+`clear` with the same semantics as `LRUTTLBackend`, and then the table
+version counters are shared across processes too.
+"""
+
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, g, has_app_context
+from werkzeug.utils import import_string
+from app.metrics import get_metrics
+
+_MISSING = object()
+
+
+class LRUTTLBackend:
+    """
+    An in-process, thread-safe LRU store with a time-to-live per entry.
+
+    Table version counters are kept separately from cached results so that
+    they are never evicted.
+    """
+    def __init__(self, max_entries=1024, default_ttl=300):
+        """
+        Initializes the LRUTTLBackend instance.
+
+        Args:
+            max_entries (int, optional): The maximum number of cached results. Defaults to 1024.
+            default_ttl (float, optional): Seconds an entry stays valid when no TTL is given. Defaults to 300.
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict() # key -> (expires_at, value)
+        self._counters = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for `key`, or `default` if absent or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Stores `value` under `key` for `ttl` seconds, evicting the least recently used entry if full.
+        """
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def incr(self, key):
+        """
+        Atomically increments the counter `key` (starting from 0) and returns its new value.
+        """
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+    def get_counter(self, key):
+        """
+        Returns the current value of the counter `key` (0 if it was never incremented).
+        """
+        return self._counters.get(key, 0)
+
+    def clear(self):
+        """
+        Removes every cached result. Counters are kept so that versions only ever increase.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ResultCache:
+    """
+    A result cache with table-level version invalidation and hit/miss metrics.
+
+    Hits and misses are counted under a lock, and also reported per cached
+    function to the application's metrics registry (`result_cache_hits_total`
+    and `result_cache_misses_total`) when metrics are enabled.
+    """
+    def __init__(self, backend=None, default_ttl=300):
+        """
+        Initializes the ResultCache instance.
+
+        Args:
+            backend (optional): The storage backend. Defaults to a new `LRUTTLBackend`.
+            default_ttl (float, optional): TTL in seconds applied when a caller does not give one. Defaults to 300.
+        """
+        self.backend = backend if backend is not None else LRUTTLBackend(default_ttl=default_ttl)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _version_key(table):
+        return f"table_version:{table}"
+
+    def table_version(self, table):
+        """
+        Returns the current version of `table`.
+        """
+        get_counter = getattr(self.backend, 'get_counter', None)
+        if get_counter is not None:
+            return get_counter(self._version_key(table))
+        return self.backend.get(self._version_key(table), 0) or 0
+
+    def bump(self, *tables):
+        """
+        Increments the version of each table, invalidating results that depend on it.
+        """
+        for table in tables:
+            self.backend.incr(self._version_key(table))
+
+    def _record_lookup(self, name, hit):
+        """Counts a hit or a miss for cached function `name`."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        registry = get_metrics()
+        counter = registry.get('result_cache_hits_total' if hit else 'result_cache_misses_total') if registry else None
+        if counter is not None:
+            counter.inc((name,))
+
+    def get_or_compute(self, name, args, tables, compute, ttl=None):
+        """
+        Returns the cached result for `name(*args)` or computes and stores it.
+
+        Args:
+            name (str): A stable name for the cached function (e.g., "AnalysisRepository.get_dashboard_summary").
+            args (tuple): The hashable call arguments that distinguish results.
+            tables (tuple[str]): The tables the result is derived from.
+            compute (callable): Zero-argument function producing the result on a miss.
+            ttl (float, optional): Seconds to keep the result. Defaults to `default_ttl`.
+
+        Returns:
+            Any: A copy of the cached or freshly computed result.
+        """
+        versions = tuple(self.table_version(table) for table in tables)
+        key = f"result:{name}:{args!r}:{versions!r}"
+        value = self.backend.get(key, _MISSING)
+        if value is not _MISSING:
+            self._record_lookup(name, hit=True)
+            return copy.deepcopy(value)
+
+        self._record_lookup(name, hit=False)
+        value = compute()
+        self.backend.set(key, copy.deepcopy(value), self.default_ttl if ttl is None else ttl)
+        return value
+
+    def clear(self):
+        """
+        Drops every cached result.
+        """
+        self.backend.clear()
+
+    def stats(self):
+        """
+        Returns hit/miss metrics for the cache.
+
+        Returns:
+            dict: 'hits', 'misses', 'hit_ratio', plus 'entries', 'evictions' and
+                  'expirations' when the backend reports them.
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        data = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+        }
+        for attribute in ('evictions', 'expirations'):
+            if hasattr(self.backend, attribute):
+                data[attribute] = getattr(self.backend, attribute)
+        if hasattr(self.backend, '__len__'):
+            data['entries'] = len(self.backend)
+        return data
+
+
+def get_result_cache():
+    """
+    Returns the current application's result cache, or None if caching is disabled
+    or there is no application context.
+    """
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('result_cache')
+
+
+def bump_table_versions(*tables):
+    """
+    Invalidates cached results derived from `tables`. A no-op when caching is disabled.
+    """
+    cache = get_result_cache()
+    if cache is not None:
+        cache.bump(*tables)
+
+
+def clear_result_cache():
+    """
+    Drops every cached result (e.g., after the database has been re-seeded).
+    """
+    cache = get_result_cache()
+    if cache is not None:
+        cache.clear()
+
+
+def _write_transaction_open():
+    """Returns True if the context's write connection has uncommitted work (see `transaction()` in `app/db_connection.py`)."""
+    db = g.get('db')
+    return bool(db is not None and db.in_transaction or g.get('db_transaction_depths'))
+
+
+def cached_result(*tables, ttl=None):
+    """
+    Decorator caching a repository method's result until one of `tables` changes.
+
+    The cache key contains the method's qualified name and its arguments
+    (excluding `self`), so arguments must have stable `repr()`s. While the
+    write connection has a transaction open, the method is called directly:
+    its result may include uncommitted writes, which must not be cached, and a
+    cached result would not show them.
+
+    Args:
+        *tables (str): The tables the method reads.
+        ttl (float, optional): Seconds to keep results. Defaults to the cache's default TTL.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = get_result_cache()
+            if cache is None or _write_transaction_open():
+                return func(self, *args, **kwargs)
+            call_args = (args, tuple(sorted(kwargs.items())))
+            return cache.get_or_compute(func.__qualname__, call_args, tables,
+                                        lambda: func(self, *args, **kwargs), ttl)
+        return wrapper
+    return decorator
+
+
+def init_app(app):
+    """
+    Creates the application's result cache if `RESULT_CACHE_ENABLED` is set.
+
+    `RESULT_CACHE_BACKEND` may name (as an import string) a factory that takes
+    the application and returns a shared backend; otherwise an in-process
+    `LRUTTLBackend` sized by `RESULT_CACHE_MAX_ENTRIES` is used.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    if not app.config.get('RESULT_CACHE_ENABLED', False):
+        return
+    ttl = app.config.get('RESULT_CACHE_TTL', 300)
+    backend_factory = app.config.get('RESULT_CACHE_BACKEND')
+    if backend_factory:
+        backend = import_string(backend_factory)(app) if isinstance(backend_factory, str) else backend_factory(app)
+    else:
+        backend = LRUTTLBackend(max_entries=app.config.get('RESULT_CACHE_MAX_ENTRIES', 1024), default_ttl=ttl)
+    app.extensions['result_cache'] = ResultCache(backend, default_ttl=ttl)
@@ -4,7 +4,24 @@ Database connection management for the Flask application.
 This module is responsible for establishing and managing the lifecycle of
 the SQLite database connection within the Flask application context.
 It ensures that a single database connection is used per request and
-is properly closed when the request finishes.
+is properly released when the request finishes. When pooling is enabled
+(`DB_POOL_ENABLED`), connections are borrowed from a per-process
+`ConnectionPool` (see `app/db_pool.py`) and returned to it on teardown
+instead of being opened and closed for every application context.
+
+Writes are grouped with the `transaction()` unit of work: repositories never
+commit on their own, so every write made inside a `transaction()` block
+(including nested blocks, which become SAVEPOINTs) is committed exactly once
+when the outermost block exits. Tables written by a unit of work are recorded
+with `mark_tables_written()`; their cached results (see `app/cache.py`) are
+invalidated only after that commit, and never for work that is rolled back.
+
+Reads can use a separate read-only connection (`get_read_db()`), opened with a
+`file:...?mode=ro` URI and `PRAGMA query_only`, from a pool of its own with a
+larger cache/mmap profile (`SQLITE_READ_PRAGMAS`). Under WAL, long analysis
+scans on it run alongside survey writes without sharing transaction state.
+While the context's write connection has a transaction open, reads use that
+connection instead, so they see the transaction's own uncommitted writes.
 
 Note on Error Handling:
 This module's primary responsibility is to provide and manage the database
@@ -17,7 +34,92 @@ executing queries) are delegated to the repository layer
 
 import sqlite3
 import os
+import urllib.parse
+from contextlib import contextmanager
 from flask import current_app, g
+from .db_pool import ConnectionPool, apply_pragmas
+from .cache import bump_table_versions
+
+def get_pool(app=None):
+    """
+    Retrieves (creating it on first use) the connection pool for the application.
+
+    The pool is stored in `app.extensions` so that each application instance
+    (e.g., one per test module) owns its own set of connections.
+
+    Args:
+        app (Flask, optional): The Flask application. Defaults to `current_app`.
+
+    Returns:
+        ConnectionPool | None: The application's connection pool, or None if pooling is disabled.
+    """
+    app = app or current_app._get_current_object()
+    if not app.config.get('DB_POOL_ENABLED', False):
+        return None
+    pool = app.extensions.get('sqlite_pool')
+    if pool is None:
+        pool = ConnectionPool(
+            app.config['DATABASE_PATH'],
+            max_size=app.config.get('DB_POOL_SIZE', 5),
+            timeout=app.config.get('DB_POOL_TIMEOUT', 5.0),
+            pragmas=app.config.get('SQLITE_PRAGMAS')
+        )
+        app.extensions['sqlite_pool'] = pool
+    return pool
+
+def read_only_uri(db_path):
+    """
+    Returns the SQLite URI opening `db_path` read-only (`file:/abs/path?mode=ro`).
+
+    Args:
+        db_path (str): The path of the database file.
+
+    Returns:
+        str: The URI, with the path percent-encoded.
+    """
+    return f"file:{urllib.parse.quote(os.path.abspath(db_path))}?mode=ro"
+
+def get_read_pool(app=None):
+    """
+    Retrieves (creating it on first use) the pool of read-only connections for the application.
+
+    Args:
+        app (Flask, optional): The Flask application. Defaults to `current_app`.
+
+    Returns:
+        ConnectionPool | None: The application's read-only connection pool, or None if pooling is disabled.
+    """
+    app = app or current_app._get_current_object()
+    if not app.config.get('DB_POOL_ENABLED', False):
+        return None
+    pool = app.extensions.get('sqlite_read_pool')
+    if pool is None:
+        pool = ConnectionPool(
+            read_only_uri(app.config['DATABASE_PATH']),
+            max_size=app.config.get('DB_READ_POOL_SIZE') or app.config.get('DB_POOL_SIZE', 5),
+            timeout=app.config.get('DB_POOL_TIMEOUT', 5.0),
+            pragmas=app.config.get('SQLITE_READ_PRAGMAS'),
+            uri=True
+        )
+        app.extensions['sqlite_read_pool'] = pool
+    return pool
+
+def dispose_pool(app=None):
+    """
+    Closes all idle pooled connections and forgets the application's pools (read-write and read-only).
+
+    This must be called before the database file is removed or replaced
+    (e.g., by the `init-db` command), otherwise pooled connections would
+    keep pointing at the old file.
+
+    Args:
+        app (Flask, optional): The Flask application. Defaults to `current_app`.
+    """
+    app = app or current_app._get_current_object()
+    for name in ('sqlite_pool', 'sqlite_read_pool'):
+        pool = app.extensions.pop(name, None)
+        if pool is not None:
+            pool.close()
 
 def get_db():
     """
@@ -25,12 +127,17 @@ def get_db():
 
     The database connection is stored in Flask's `g` object (application context
     global) to ensure that:
-    1. A new connection is created only once per request.
+    1. A connection is obtained only once per request.
     2. The same connection is reused if `get_db()` is called multiple times
        within the same request.
 
+    If pooling is enabled the connection is borrowed from the application's
+    `ConnectionPool`; otherwise a new connection is opened.
+
     The connection is configured to return rows as `sqlite3.Row` objects,
-    allowing column access by name.
+    allowing column access by name, and the `SQLITE_PRAGMAS` profile from
+    the configuration (journal mode, synchronous level, cache size, etc.)
+    is applied once when the connection is opened.
 
     Returns:
         sqlite3.Connection: The active database connection object.
@@ -42,7 +149,13 @@ def get_db():
     # Check if the database connection already exists in the current application context.
     if 'db' not in g:
         db_path = current_app.config['DATABASE_PATH']
+        pool = get_pool()
         try:
+            if pool is not None:
+                # Borrow an already configured connection from the pool.
+                g.db = pool.acquire()
+                g.db_pool = pool
+                return g.db
             # Attempt to establish a new SQLite database connection.
             g.db = sqlite3.connect(
                 db_path,
@@ -50,6 +163,8 @@ def get_db():
             )
             # Configure the connection to return rows as dict-like objects.
             g.db.row_factory = sqlite3.Row
+            # Apply the configured PRAGMA profile (WAL, synchronous, cache size, ...).
+            apply_pragmas(g.db, current_app.config.get('SQLITE_PRAGMAS'))
         except sqlite3.OperationalError as e:
             # Log a critical error if the database connection fails.
             current_app.logger.critical(f"Failed to connect to database at {db_path}: {e}")
@@ -58,9 +173,58 @@ def get_db():
         
     return g.db
 
+def get_read_db():
+    """
+    Retrieves the application context's connection for read-only queries.
+
+    This is a read-only connection (`mode=ro` URI plus `PRAGMA query_only`)
+    borrowed from the read pool, or opened directly when pooling is disabled,
+    and configured with the `SQLITE_READ_PRAGMAS` profile. Like `get_db()`, it
+    is stored in `g` and reused for the rest of the application context.
+
+    The write connection from `get_db()` is returned instead when
+    `DB_READ_CONNECTIONS_ENABLED` is off, or when the write connection has a
+    transaction open (inside `transaction()`, or after an uncommitted write),
+    so that reads always see the context's own writes.
+
+    Returns:
+        sqlite3.Connection: The connection to run read-only queries on.
+
+    Raises:
+        ConnectionError: If the database file cannot be opened read-only.
+    """
+    if not current_app.config.get('DB_READ_CONNECTIONS_ENABLED', False):
+        return get_db()
+    db = g.get('db')
+    if db is not None and (db.in_transaction or g.get('db_transaction_depths')):
+        return db # Read-your-writes: uncommitted changes are only visible on the write connection.
+    if 'read_db' not in g:
+        db_path = current_app.config['DATABASE_PATH']
+        pool = get_read_pool()
+        try:
+            if pool is not None:
+                g.read_db = pool.acquire()
+                g.read_db_pool = pool
+                return g.read_db
+            g.read_db = sqlite3.connect(
+                read_only_uri(db_path),
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                uri=True
+            )
+            g.read_db.row_factory = sqlite3.Row
+            apply_pragmas(g.read_db, current_app.config.get('SQLITE_READ_PRAGMAS'))
+        except sqlite3.OperationalError as e:
+            current_app.logger.critical(f"Failed to open read-only connection to database at {db_path}: {e}")
+            raise ConnectionError(f"Could not connect to the database: {e}") from e
+
+    return g.read_db
+
 def close_db(e=None):
     """
-    Closes the database connection at the end of the request or application context.
+    Releases the database connections at the end of the request or application context.
+
+    Pooled connections (read-write and read-only) are returned to their pool
+    (rolling back any uncommitted work); unpooled connections are closed.
 
     This function is registered with Flask's `teardown_appcontext` to be
     automatically called when the application context is torn down, ensuring
@@ -72,12 +236,118 @@ def close_db(e=None):
     """
     # Retrieve the database connection from the application context, if it exists.
     db = g.pop('db', None)
+    pool = g.pop('db_pool', None)
+    # Writes still uncommitted at this point are rolled back, so their tables keep their cached results.
+    g.pop('db_written_tables', None)
 
-    # If a database connection was established, close it.
+    # If a database connection was established, return it to its pool or close it.
     if db is not None:
-        db.close()
+        if pool is not None:
+            pool.release(db)
+        else:
+            db.close()
+
+    # The same for the read-only connection, if one was used.
+    read_db = g.pop('read_db', None)
+    read_pool = g.pop('read_db_pool', None)
+    if read_db is not None:
+        if read_pool is not None:
+            read_pool.release(read_db)
+        else:
+            read_db.close()
         # current_app.logger.debug("Database connection closed.") # Optional: for verbose logging
 
+@contextmanager
+def transaction(db=None, immediate=False):
+    """
+    A unit of work: commits everything written inside the block exactly once.
+
+    Repository write methods (`_execute_insert`, `_execute_update_delete`)
+    never commit; they run on the application context's connection and are
+    therefore enlisted in whichever `transaction()` is open. The outermost
+    block commits when it exits normally and rolls back if it raises. Nested
+    blocks use a SAVEPOINT, so a failing inner block only undoes its own
+    writes (if the exception is caught) and never commits early. The cached
+    results of the tables recorded with `mark_tables_written()` are invalidated
+    right after the outermost commit.
+
+    Can also be used as a decorator, e.g. around a view function or batch job,
+    so that the whole request does a single commit (and a single fsync).
+
+    Pass `immediate=True` when the unit of work reads data it then writes
+    based on (e.g., a MAX(id) watermark): the outermost block then starts
+    with `BEGIN IMMEDIATE`, taking the write lock before the first read, so
+    no other writer can commit in between (which under WAL would otherwise
+    fail the first write with SQLITE_BUSY_SNAPSHOT).
+
+    Args:
+        db (sqlite3.Connection, optional): The connection to use. Defaults to `get_db()`.
+        immediate (bool, optional): If True, the outermost block begins with `BEGIN IMMEDIATE`.
+                                    Ignored by nested blocks, which run inside the outer one. Defaults to False.
+
+    Yields:
+        sqlite3.Connection: The connection the unit of work runs on.
+
+    Raises:
+        Exception: Any exception raised inside the block is re-raised after the rollback.
+    """
+    db = db if db is not None else get_db()
+    depths = g.setdefault('db_transaction_depths', {})
+    depth = depths.get(id(db), 0)
+    savepoint = f"uow_{depth}"
+
+    if depth == 0:
+        if not db.in_transaction:
+            db.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    else:
+        db.execute(f"SAVEPOINT {savepoint}")
+    depths[id(db)] = depth + 1
+    committed = False
+    try:
+        yield db
+    except BaseException:
+        if depth == 0:
+            db.rollback()
+        else:
+            db.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            db.execute(f"RELEASE SAVEPOINT {savepoint}")
+        raise
+    else:
+        if depth == 0:
+            if db.in_transaction:
+                db.commit()
+            committed = True
+        else:
+            db.execute(f"RELEASE SAVEPOINT {savepoint}")
+    finally:
+        if depth == 0:
+            depths.pop(id(db), None)
+            written = g.get('db_written_tables', {}).pop(id(db), None)
+            if committed and written:
+                bump_table_versions(*sorted(written)) # Only committed writes invalidate cached results.
+        else:
+            depths[id(db)] = depth
+
+def mark_tables_written(*tables, db=None):
+    """
+    Records that the current unit of work wrote to `tables`.
+
+    While `db` has a transaction open, the tables are remembered and the
+    cached results derived from them are invalidated once the outermost
+    `transaction()` commits; they are forgotten if it rolls back or if the
+    connection is released with the work still uncommitted. Outside a
+    transaction the cached results are invalidated immediately.
+
+    Args:
+        *tables (str): The tables written to.
+        db (sqlite3.Connection, optional): The connection the writes ran on. Defaults to `get_db()`.
+    """
+    db = db if db is not None else get_db()
+    if db.in_transaction or g.get('db_transaction_depths', {}).get(id(db)):
+        g.setdefault('db_written_tables', {}).setdefault(id(db), set()).update(tables)
+    else:
+        bump_table_versions(*tables)
+
 def init_app(app):
     """
     Registers database-related functions with the Flask application.
@@ -89,5 +359,5 @@ def init_app(app):
         app (Flask): The Flask application instance.
     """
     # Register `close_db` to be called automatically when the application
-    # context ends, ensuring database connections are always closed.
+    # context ends, ensuring database connections are always released.
     app.teardown_appcontext(close_db)
@@ -0,0 +1,241 @@
+"""
+SQLite connection pooling for the Flask application.
+
+This module defines the `ConnectionPool` class, a bounded pool of reusable
+SQLite connections. Opening a connection, configuring it and parsing the
+schema on its first query is a measurable share of a short request, so
+`app/db_connection.py` borrows connections from a pool at the start of an
+application context and returns them on teardown instead of opening and
+closing a fresh connection every time.
+
+Each pool belongs to a single process. Connections are created lazily up to
+`max_size`, configured once when they are opened, health-checked when they
+are borrowed, and rolled back when they are returned so that no uncommitted
+work leaks from one application context into the next.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+
+
+def apply_pragmas(conn, pragmas):
+    """
+    Applies a PRAGMA profile to a freshly opened connection.
+
+    PRAGMAs are applied in the order given, so `busy_timeout` should come
+    before `journal_mode` when switching a busy database to WAL.
+
+    Args:
+        conn (sqlite3.Connection): The connection to configure.
+        pragmas (dict): PRAGMA name/value pairs (e.g., `{'journal_mode': 'WAL'}`).
+    """
+    for name, value in (pragmas or {}).items():
+        conn.execute(f"PRAGMA {name} = {value}").fetchall()
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of SQLite connections for one database file.
+
+    Connections are opened with `check_same_thread=False` so that a connection
+    returned by one worker thread can be borrowed by another. SQLite
+    connections are never used by two threads at once: a borrowed connection
+    belongs to exactly one application context until it is released.
+    """
+    def __init__(self, database, max_size=5, timeout=5.0, detect_types=sqlite3.PARSE_DECLTYPES,
+                 pragmas=None, uri=False):
+        """
+        Initializes the ConnectionPool instance.
+
+        Args:
+            database (str): The path (or URI, if `uri` is True) of the SQLite database.
+            max_size (int, optional): The maximum number of connections the pool will open. Defaults to 5.
+            timeout (float, optional): Seconds to wait for a free connection when the pool is exhausted. Defaults to 5.0.
+            detect_types (int, optional): The `detect_types` flags passed to `sqlite3.connect`.
+            pragmas (dict, optional): PRAGMA name/value pairs applied once to every new connection.
+            uri (bool, optional): Whether `database` should be interpreted as a SQLite URI. Defaults to False.
+        """
+        if max_size < 1:
+            raise ValueError("Connection pool max_size must be at least 1.")
+        self.database = database
+        self.max_size = max_size
+        self.timeout = timeout
+        self.detect_types = detect_types
+        self.pragmas = dict(pragmas or {})
+        self.uri = uri
+
+        self._idle = queue.LifoQueue(maxsize=max_size) # LIFO keeps the warmest connections in use.
+        self._lock = threading.Lock()
+        self._opened = 0 # Number of live connections owned by this pool (idle + borrowed).
+        self._pid = os.getpid()
+        self._closed = False
+
+    def _connect(self):
+        """
+        Opens and configures a new SQLite connection.
+
+        Configuration (row factory and PRAGMAs) is done exactly once per
+        connection, here, rather than every time the connection is borrowed.
+
+        Returns:
+            sqlite3.Connection: The newly opened connection.
+        """
+        conn = sqlite3.connect(
+            self.database,
+            detect_types=self.detect_types,
+            check_same_thread=False,
+            uri=self.uri
+        )
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn, self.pragmas)
+        return conn
+
+    def _is_healthy(self, conn):
+        """
+        Checks that a pooled connection is still usable.
+
+        Args:
+            conn (sqlite3.Connection): The connection to check.
+
+        Returns:
+            bool: True if a trivial statement can be executed on the connection, False otherwise.
+        """
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn):
+        """
+        Closes a connection and releases its slot in the pool.
+
+        Args:
+            conn (sqlite3.Connection): The connection to discard.
+        """
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._opened -= 1
+
+    def _check_pid(self):
+        """
+        Resets the pool if the process has forked since the pool was created.
+
+        SQLite connections must not be shared across a fork, so a child process
+        drops the inherited idle connections (without closing them, as they
+        still belong to the parent) and starts with an empty pool.
+        """
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._idle = queue.LifoQueue(maxsize=self.max_size)
+                    self._opened = 0
+                    self._pid = os.getpid()
+
+    def acquire(self):
+        """
+        Borrows a connection from the pool.
+
+        An idle connection is reused if one passes the health check. Otherwise
+        a new connection is opened, as long as the pool is below `max_size`.
+        When the pool is exhausted, the call blocks for up to `timeout` seconds
+        waiting for a connection to be released.
+
+        Returns:
+            sqlite3.Connection: A ready-to-use connection.
+
+        Raises:
+            ConnectionError: If the pool is closed or no connection becomes available within `timeout`.
+            sqlite3.Error: If a new connection cannot be opened.
+        """
+        if self._closed:
+            raise ConnectionError("Connection pool has been closed.")
+        self._check_pid()
+
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = None
+
+            if conn is None:
+                with self._lock:
+                    can_open = self._opened < self.max_size
+                    if can_open:
+                        self._opened += 1
+                if can_open:
+                    try:
+                        return self._connect()
+                    except sqlite3.Error:
+                        with self._lock:
+                            self._opened -= 1
+                        raise
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise ConnectionError(
+                        f"Timed out after {self.timeout}s waiting for a database connection "
+                        f"(pool size {self.max_size})."
+                    )
+
+            if self._is_healthy(conn):
+                return conn
+            # Drop the broken connection and try again with a fresh one.
+            self._discard(conn)
+
+    def release(self, conn):
+        """
+        Returns a borrowed connection to the pool.
+
+        Any open transaction is rolled back first, matching the behaviour of
+        closing a connection with uncommitted work. Connections that cannot be
+        rolled back, or that come back after the pool was closed, are discarded.
+
+        Args:
+            conn (sqlite3.Connection): The connection to return.
+        """
+        if self._pid != os.getpid():
+            return # Connection belongs to the parent process; leave it alone.
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        if self._closed:
+            self._discard(conn)
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            self._discard(conn)
+
+    def close(self):
+        """
+        Closes every idle connection and stops the pool from handing out new ones.
+
+        Connections that are currently borrowed are closed when they are released.
+        """
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    @property
+    def size(self):
+        """int: The number of live connections owned by the pool (idle and borrowed)."""
+        return self._opened
+
+    @property
+    def idle(self):
+        """int: The number of connections currently waiting in the pool."""
+        return self._idle.qsize()
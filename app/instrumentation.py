@@ -0,0 +1,268 @@
+"""
+Per-request query instrumentation.
+
+This module records every statement the repositories run: its normalized SQL
+(literals replaced by `?`, whitespace collapsed), its duration and the number
+of rows it returned or changed. Records are kept in a `QueryCollector` on
+`flask.g`, so each request (or CLI application context) gets its own
+collector and concurrent requests never share one.
+
+Statements slower than `SLOW_QUERY_THRESHOLD_MS` are logged as warnings with
+the request's route. When `QUERY_STATS_HEADERS` is set (outside production),
+every response carries the request's statement count and total database time
+in the `X-DB-Query-Count` and `X-DB-Time-Ms` headers.
+
+Repositories record statements through `BaseRepository`; code that talks to
+the connection directly should write with `timed_execute()` instead of
+`db.execute()`, and time its SELECTs with `record_query()` once the rows have
+been fetched.
+`capture_queries()` collects the statements of a single block, which the
+test suite uses to enforce query budgets and catch N+1 query patterns.
+"""
+
+import contextlib
+import functools
+import re
+import time
+from collections import Counter, namedtuple
+from flask import current_app, g, has_app_context, has_request_context, request
+
+# One executed statement: normalized SQL, duration in seconds, and rows returned/changed (None if unknown).
+QueryRecord = namedtuple('QueryRecord', ['sql', 'duration', 'rows'])
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """
+    Returns the shape of a statement: literals replaced by `?` and whitespace collapsed.
+
+    Placeholder lists such as `IN (?, ?, ?)` are collapsed to `(?, ...)`, so
+    statements that differ only in their literal values or list lengths have
+    the same shape.
+
+    Args:
+        sql (str): The statement as executed.
+
+    Returns:
+        str: The normalized statement.
+    """
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _WHITESPACE.sub(' ', sql).strip()
+    return _PLACEHOLDER_LIST.sub('(?, ...)', sql)
+
+
+class QueryCollector:
+    """
+    Collects the statements executed within one request (or application context).
+
+    The totals cover every statement; individual records are kept up to
+    `max_records` to bound memory in long-running application contexts.
+    With `keep_statements`, the distinct statements are also kept verbatim
+    (not normalized), e.g. for the test suite to run them through
+    `EXPLAIN QUERY PLAN`.
+    """
+    def __init__(self, max_records=1000, keep_statements=False):
+        """
+        Initializes the QueryCollector instance.
+
+        Args:
+            max_records (int, optional): The maximum number of `QueryRecord`s kept. Defaults to 1000.
+            keep_statements (bool, optional): If True, keeps the set of distinct statements as executed
+                                              in `statements`. Defaults to False.
+        """
+        self.max_records = max_records
+        self.records = []
+        self.count = 0
+        self.total_time = 0.0
+        self.statements = set() if keep_statements else None
+
+    def add(self, sql, duration, rows=None):
+        """
+        Records one executed statement.
+
+        Args:
+            sql (str): The statement as executed; it is stored normalized.
+            duration (float): The time spent executing (and fetching), in seconds.
+            rows (int, optional): The rows returned or changed, if known.
+        """
+        self.count += 1
+        self.total_time += duration
+        if self.statements is not None:
+            self.statements.add(sql)
+        if len(self.records) < self.max_records:
+            self.records.append(QueryRecord(normalize_sql(sql), duration, rows))
+
+    def merge(self, other):
+        """
+        Adds another collector's statements to this one (e.g., those of a nested `capture_queries()` block).
+
+        Args:
+            other (QueryCollector): The collector to merge in.
+        """
+        self.count += other.count
+        self.total_time += other.total_time
+        if self.statements is not None and other.statements:
+            self.statements.update(other.statements)
+        self.records.extend(other.records[:max(0, self.max_records - len(self.records))])
+
+    def repeated_shapes(self, max_repeats=1):
+        """
+        Returns the statement shapes executed more than `max_repeats` times, most repeated first.
+
+        Many executions of one shape within a single call or request usually
+        mean a query is issued per item (an N+1 pattern) instead of once per set.
+
+        Args:
+            max_repeats (int, optional): How many executions of one shape are acceptable. Defaults to 1.
+
+        Returns:
+            list[tuple[str, int]]: (normalized SQL, executions) pairs.
+        """
+        return [(sql, n) for sql, n in Counter(record.sql for record in self.records).most_common() if n > max_repeats]
+
+    def report(self):
+        """
+        Returns a readable listing of the recorded statements, one per line, for assertion messages.
+        """
+        return '\n'.join(f"  {i:>3}. {record.sql}" for i, record in enumerate(self.records, 1))
+
+
+def get_query_collector():
+    """
+    Returns the current context's `QueryCollector`, or None if instrumentation is off or there is no app context.
+    """
+    if not has_app_context() or not current_app.config.get('QUERY_STATS_ENABLED', False):
+        return None
+    collector = g.get('query_collector')
+    if collector is None:
+        collector = g.query_collector = QueryCollector(current_app.config.get('QUERY_STATS_MAX_RECORDS', 1000))
+    return collector
+
+
+@contextlib.contextmanager
+def capture_queries(keep_statements=False):
+    """
+    Collects the statements executed inside the block in a collector of its own.
+
+    The block's statements are still added to the enclosing request's
+    collector afterwards, so response headers and totals are unaffected.
+    Requires `QUERY_STATS_ENABLED` and an application context.
+
+    Args:
+        keep_statements (bool, optional): If True, the collector also keeps the distinct statements
+                                          as executed (see `QueryCollector`). Nested blocks inherit
+                                          this from the enclosing collector. Defaults to False.
+
+    Yields:
+        QueryCollector: The collector for the block.
+
+    Raises:
+        RuntimeError: If query instrumentation is disabled or there is no application context.
+    """
+    outer = get_query_collector()
+    if outer is None:
+        raise RuntimeError("Query instrumentation requires QUERY_STATS_ENABLED and an application context.")
+    collector = g.query_collector = QueryCollector(outer.max_records, keep_statements or outer.statements is not None)
+    try:
+        yield collector
+    finally:
+        g.query_collector = outer
+        outer.merge(collector)
+
+
+def current_route():
+    """
+    Returns the matched URL rule of the current request, its path if unmatched, or None outside a request.
+    """
+    if not has_request_context():
+        return None
+    return request.url_rule.rule if request.url_rule is not None else request.path
+
+
+def record_query(sql, started=None, rows=None, duration=None):
+    """
+    Records a statement that has just finished.
+
+    The duration is either measured from `started` (a `time.perf_counter()`
+    value taken just before executing it) or given directly as `duration`,
+    for statements whose time is accumulated over several steps (e.g., a
+    cursor fetched in batches). Logs the statement as a slow query if it took
+    longer than `SLOW_QUERY_THRESHOLD_MS`.
+
+    Args:
+        sql (str): The statement as executed.
+        started (float, optional): The `time.perf_counter()` value taken just before executing it.
+        rows (int, optional): The rows returned or changed, if known.
+        duration (float, optional): The time spent executing and fetching, in seconds. Overrides `started`.
+
+    Raises:
+        ValueError: If neither `started` nor `duration` is given.
+    """
+    if started is None and duration is None:
+        raise ValueError("record_query() needs either `started` or `duration`.")
+    collector = get_query_collector()
+    if collector is None:
+        return
+    if duration is None:
+        duration = time.perf_counter() - started
+    collector.add(sql, duration, rows)
+    threshold_ms = current_app.config.get('SLOW_QUERY_THRESHOLD_MS')
+    if threshold_ms is not None and duration * 1000 >= threshold_ms:
+        current_app.logger.warning(
+            f"Slow query ({duration * 1000:.1f} ms, {rows if rows is not None else '?'} rows) "
+            f"on route {current_route() or '-'}: {normalize_sql(sql)}"
+        )
+
+
+def timed_execute(db, sql, params=(), many=False):
+    """
+    Executes a write on `db` (with `execute`, or `executemany` if `many`) and records it.
+
+    For INSERT/UPDATE/DELETE statements only: the row count recorded is the
+    cursor's `rowcount` (rows changed), and the statement's work is done when
+    `execute` returns. A SELECT does most of its work while its rows are
+    fetched, so time it with `record_query()` after the fetch instead, e.g.:
+
+        started = time.perf_counter()
+        row = db.execute(sql, params).fetchone()
+        record_query(sql, started, 1 if row else 0)
+
+    Args:
+        db (sqlite3.Connection): The connection to execute on.
+        sql (str): The statement.
+        params (tuple | Iterable[tuple], optional): Its parameters (a sequence of them if `many`).
+        many (bool, optional): If True, uses `executemany`. Defaults to False.
+
+    Returns:
+        sqlite3.Cursor: The cursor returned by the connection.
+    """
+    started = time.perf_counter()
+    cursor = db.executemany(sql, params) if many else db.execute(sql, params)
+    rowcount = cursor.rowcount
+    record_query(sql, started, rowcount if isinstance(rowcount, int) and rowcount >= 0 else None)
+    return cursor
+
+
+def init_app(app):
+    """
+    Registers the hook adding the query count and database time headers to responses.
+
+    The headers are only added while `QUERY_STATS_HEADERS` (and `QUERY_STATS_ENABLED`) are set.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    @app.after_request
+    def add_query_stats_headers(response):
+        if not (current_app.config.get('QUERY_STATS_ENABLED', False) and current_app.config.get('QUERY_STATS_HEADERS', False)):
+            return response
+        collector = g.get('query_collector')
+        response.headers['X-DB-Query-Count'] = str(collector.count if collector else 0)
+        response.headers['X-DB-Time-Ms'] = f"{collector.total_time * 1000 if collector else 0.0:.2f}"
+        return response
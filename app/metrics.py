@@ -0,0 +1,354 @@
+"""
+In-process metrics: counters and fixed-bucket latency histograms.
+
+This module provides a small, thread-safe metrics registry rendered in the
+Prometheus text exposition format (served at `/api/admin/metrics`). When
+`METRICS_ENABLED` is set, `init_app` creates the application's registry and
+records:
+
+- `http_requests_total`: requests by blueprint, route, method and status;
+  requests whose view raised an unhandled exception are counted as 500s.
+- `http_request_duration_seconds`: request latency by blueprint, route and method.
+- `repository_method_duration_seconds`: latency of every public repository
+  method, by repository class and method (see `instrument_repository_methods`).
+- `result_cache_hits_total` / `result_cache_misses_total`: result cache
+  lookups by cached function (see `app/cache.py`).
+
+Histograms use fixed buckets, so an observation is one bisection and two
+additions under a lock; p50/p95/p99 are derived from the buckets, either by
+Prometheus (`histogram_quantile`) or in-process with `Histogram.quantile`.
+Routes are labelled by their URL rule (e.g., `/api/admin/students/<int:id>`),
+never the raw path, to keep the number of series bounded.
+"""
+
+import bisect
+import functools
+import inspect
+import threading
+import time
+from flask import current_app, g, has_app_context, request
+
+# Latency buckets in seconds, from 0.5 ms to 10 s.
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Prometheus text format version served by the metrics endpoint.
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    """Escapes a label value for the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    """Formats label names and values (plus extra name/value pairs) as `{a="1",b="2"}`."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    """Formats a sample value, writing integral values without a decimal part."""
+    if value == float('inf'):
+        return '+Inf'
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """
+    A monotonically increasing counter, with one series per label-value tuple.
+    """
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Initializes the Counter instance.
+
+        Args:
+            name (str): The metric name (e.g., 'http_requests_total').
+            documentation (str): The help text.
+            labelnames (tuple[str], optional): The label names, in the order values are given.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        """
+        Increments the series for `labels` by `amount`.
+
+        Args:
+            labels (tuple, optional): The label values, in `labelnames` order.
+            amount (float, optional): The increment. Defaults to 1.
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        """
+        Returns the current value of the series for `labels` (0 if it has not been incremented).
+        """
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self):
+        """
+        Returns the counter's sample lines in the Prometheus text format.
+        """
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in values]
+
+
+class Histogram:
+    """
+    A histogram with fixed upper bucket bounds, with one series per label-value tuple.
+
+    Each series stores a non-cumulative count per bucket (the last one being
+    `+Inf`) followed by the sum of the observed values.
+    """
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        Initializes the Histogram instance.
+
+        Args:
+            name (str): The metric name (e.g., 'http_request_duration_seconds').
+            documentation (str): The help text.
+            labelnames (tuple[str], optional): The label names, in the order values are given.
+            buckets (tuple[float], optional): The finite upper bucket bounds. Defaults to `DEFAULT_LATENCY_BUCKETS`.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        """
+        Records one observation in the series for `labels`.
+
+        Args:
+            value (float): The observed value (e.g., a duration in seconds).
+            labels (tuple, optional): The label values, in `labelnames` order.
+        """
+        index = bisect.bisect_left(self.buckets, value) # First bucket whose bound is >= value.
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, labels=()):
+        """
+        Returns the number of observations in the series for `labels`.
+        """
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[:-1]) if series else 0
+
+    def quantile(self, q, labels=()):
+        """
+        Estimates the `q`-quantile of the series for `labels` from its buckets.
+
+        Uses linear interpolation within the bucket holding the quantile, as
+        Prometheus' `histogram_quantile` does. Observations above the largest
+        bound are reported as that bound.
+
+        Args:
+            q (float): The quantile, between 0 and 1 (e.g., 0.95 for p95).
+            labels (tuple, optional): The label values, in `labelnames` order.
+
+        Returns:
+            float | None: The estimate, or None if the series has no observations.
+        """
+        with self._lock:
+            series = self._series.get(labels)
+            counts = list(series[:-1]) if series else []
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0
+        for i, bound in enumerate(self.buckets):
+            if counts[i] and cumulative + counts[i] >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (bound - lower) * (rank - cumulative) / counts[i]
+            cumulative += counts[i]
+        return self.buckets[-1]
+
+    def render(self):
+        """
+        Returns the histogram's sample lines (cumulative buckets, sum and count) in the Prometheus text format.
+        """
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        lines = []
+        bounds = (*self.buckets, float('inf'))
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                le = (('le', _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(values[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    A named collection of counters and histograms, rendered together for scraping.
+    """
+    def __init__(self):
+        """
+        Initializes the MetricsRegistry instance.
+        """
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name, *args, **kwargs):
+        """Returns the metric registered as `name`, creating it if needed."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} is already registered as a {metric.type}.")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """
+        Returns the counter registered as `name`, creating it if needed.
+        """
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        Returns the histogram registered as `name`, creating it if needed.
+        """
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def get(self, name):
+        """
+        Returns the metric registered as `name`, or None.
+        """
+        return self._metrics.get(name)
+
+    def render(self):
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition document.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for name, metric in metrics:
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+def get_metrics():
+    """
+    Returns the current application's metrics registry, or None if metrics are disabled
+    or there is no application context.
+    """
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('metrics')
+
+
+def instrument_repository_methods(cls):
+    """
+    Wraps the public methods defined on a repository class to record their latency.
+
+    Observations go to `repository_method_duration_seconds`, labelled with the
+    class of the repository instance and the method name. A method that
+    delegates to an overridden version of itself (`super().get_by_id(...)`)
+    is only recorded once, by the outermost call. Generator functions,
+    static and class methods are left alone.
+
+    Args:
+        cls (type): The repository class.
+
+    Returns:
+        type: The same class, with its public methods wrapped.
+    """
+    for name, func in list(vars(cls).items()):
+        if name.startswith('_') or not inspect.isfunction(func) or inspect.isgeneratorfunction(func) \
+                or getattr(func, '__metrics_instrumented__', False):
+            continue
+        setattr(cls, name, _timed_repository_method(name, func))
+    return cls
+
+
+def _timed_repository_method(name, func):
+    """Returns `func` wrapped to observe its duration as repository method `name`."""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        registry = get_metrics()
+        if registry is None or getattr(type(self), name, None) is not wrapper:
+            return func(self, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            registry.get('repository_method_duration_seconds').observe(
+                time.perf_counter() - started, (type(self).__name__, name))
+    wrapper.__metrics_instrumented__ = True
+    return wrapper
+
+
+def init_app(app):
+    """
+    Creates the application's metrics registry and request hooks if `METRICS_ENABLED` is set.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    if not app.config.get('METRICS_ENABLED', False):
+        return
+    buckets = app.config.get('METRICS_LATENCY_BUCKETS') or DEFAULT_LATENCY_BUCKETS
+    registry = MetricsRegistry()
+    requests_total = registry.counter(
+        'http_requests_total', 'HTTP requests handled.', ('blueprint', 'route', 'method', 'status'))
+    request_duration = registry.histogram(
+        'http_request_duration_seconds', 'HTTP request latency in seconds.', ('blueprint', 'route', 'method'), buckets)
+    registry.histogram(
+        'repository_method_duration_seconds', 'Repository method latency in seconds.', ('repository', 'method'), buckets)
+    registry.counter('result_cache_hits_total', 'Result cache lookups served from the cache.', ('function',))
+    registry.counter('result_cache_misses_total', 'Result cache lookups that computed the result.', ('function',))
+    app.extensions['metrics'] = registry
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_request_started = time.perf_counter()
+
+    @app.after_request
+    def remember_status(response):
+        g.metrics_response_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def observe_request(exc):
+        # Runs even when the view raised and no after_request hook did: those requests are counted as 500s.
+        started = g.pop('metrics_request_started', None)
+        status = g.pop('metrics_response_status', None)
+        if started is None:
+            return
+        if status is None or exc is not None:
+            status = 500
+        # Unmatched requests (404s) share one series rather than one per requested path.
+        route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        blueprint = request.blueprint or ''
+        request_duration.observe(time.perf_counter() - started, (blueprint, route, request.method))
+        requests_total.inc((blueprint, route, request.method, str(status)))
@@ -8,7 +8,7 @@ like reason, associated module, and resolution status.
 """
 
 from datetime import datetime
-from .base_model import BaseModel
+from .base_model import BaseModel, to_bool
 
 class Alert(BaseModel):
     """
@@ -18,6 +18,9 @@ class Alert(BaseModel):
     and `is_active`. Alerts are typically triggered by specific conditions
     (e.g., low attendance, high stress) and can be resolved.
     """
+    __slots__ = ('student_id', 'module_id', 'week_number', 'reason', 'resolved')
+    _converters = {'resolved': to_bool}
+
     def __init__(self, id=None, student_id=None, module_id=None, week_number=None, reason=None, resolved=False, created_at=None, is_active=True, **kwargs):
         """
         Initializes an Alert instance.
@@ -57,49 +60,6 @@ class Alert(BaseModel):
         })
         return data
 
-    @classmethod
-    def from_row(cls, row) -> 'Alert':
-        """
-        Creates an Alert instance from a database row.
-
-        This class method is used to reconstruct an Alert object from data
-        retrieved from the database. It leverages `BaseModel.from_row`
-        for common fields and then populates alert-specific attributes.
-
-        Args:
-            row: The database row, expected to be a dict-like object (e.g., `sqlite3.Row`).
-
-        Returns:
-            Alert: An Alert instance populated with data from the row, or None if the row is None.
-        """
-        if row is None:
-            return None
-        
-        # Use BaseModel's from_row to parse common fields.
-        base_instance = BaseModel.from_row(row)
-        if not base_instance:
-            return None
-
-        row_dict = dict(row) # Convert row to dict for easier access to specific fields.
-        
-        # Extract alert-specific fields.
-        student_id = row_dict.get('student_id')
-        module_id = row_dict.get('module_id')
-        week_number = row_dict.get('week_number')
-        reason = row_dict.get('reason')
-        resolved = bool(row_dict.get('resolved'))
-
-        return cls(
-            id=base_instance.id,
-            student_id=student_id,
-            module_id=module_id,
-            week_number=week_number,
-            reason=reason,
-            resolved=resolved,
-            is_active=base_instance.is_active,
-            created_at=base_instance.created_at
-        )
-
     def __repr__(self) -> str:
         """
         Returns a string representation of the Alert object, useful for debugging.
@@ -18,6 +18,9 @@ class AttendanceRecord(BaseModel):
     and `is_active`. Includes attributes to track attendance details and
     optionally related student/module names for display purposes.
     """
+    __slots__ = ('student_id', 'module_id', 'week_number', 'attended_sessions', 'total_sessions',
+                 'attendance_rate', 'student_name', 'module_title')
+
     def __init__(self, id=None, student_id=None, module_id=None, week_number=None, attended_sessions=None, total_sessions=None, attendance_rate=None, student_name=None, module_title=None, created_at=None, is_active=True, **kwargs):
         """
         Initializes an AttendanceRecord instance.
@@ -66,56 +69,6 @@ class AttendanceRecord(BaseModel):
         })
         return data
 
-    @classmethod
-    def from_row(cls, row) -> 'AttendanceRecord':
-        """
-        Creates an AttendanceRecord instance from a database row.
-
-        This class method is used to reconstruct an AttendanceRecord object from data
-        retrieved from the database. It leverages `BaseModel.from_row`
-        for common fields and then populates record-specific attributes.
-
-        Args:
-            row: The database row, expected to be a dict-like object (e.g., `sqlite3.Row`).
-
-        Returns:
-            AttendanceRecord: An AttendanceRecord instance populated with data from the row,
-                              or None if the row is None.
-        """
-        if row is None:
-            return None
-        
-        # Use BaseModel's from_row to parse common fields.
-        base_instance = BaseModel.from_row(row)
-        if not base_instance:
-            return None
-
-        row_dict = dict(row) # Convert row to dict for easier access to specific fields.
-        
-        # Extract record-specific fields.
-        student_id = row_dict.get('student_id')
-        module_id = row_dict.get('module_id')
-        week_number = row_dict.get('week_number')
-        attended_sessions = row_dict.get('attended_sessions')
-        total_sessions = row_dict.get('total_sessions')
-        attendance_rate = row_dict.get('attendance_rate')
-        student_name = row_dict.get('student_name')
-        module_title = row_dict.get('module_title')
-
-        return cls(
-            id=base_instance.id,
-            student_id=student_id,
-            module_id=module_id,
-            week_number=week_number,
-            attended_sessions=attended_sessions,
-            total_sessions=total_sessions,
-            attendance_rate=attendance_rate,
-            student_name=student_name,
-            module_title=module_title,
-            is_active=base_instance.is_active,
-            created_at=base_instance.created_at
-        )
-
     def __repr__(self) -> str:
         """
         Returns a string representation of the AttendanceRecord object, useful for debugging.
@@ -10,15 +10,164 @@ to instantiate a model from a database row, handling common data parsing.
 from datetime import datetime, timezone
 from flask import current_app # Imported here for logging within from_row, if app context is available
 
+
+def warn_invalid_value(field_name, value, record_id, kind='datetime'):
+    """
+    Logs (or prints, outside an application context) a warning about an unparseable column value.
+    """
+    message = (f"Invalid {kind} format for '{field_name}': '{value}' "
+               f"for record ID {record_id}. Setting to None.")
+    if current_app:
+        current_app.logger.warning(message)
+    else:
+        print(f"WARNING: {message}")
+
+
+def parse_datetime(value, field_name, record_id):
+    """
+    Converts an ISO 8601 column value to a `datetime`.
+
+    Args:
+        value: The raw column value (usually a string, or None).
+        field_name (str): The column name, used in the warning for invalid values.
+        record_id (int): The record's ID, used in the warning for invalid values.
+
+    Returns:
+        datetime | None: The parsed value, `value` itself if it is not a string, or None if it is invalid.
+    """
+    if not isinstance(value, str):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        warn_invalid_value(field_name, value, record_id)
+        return None
+
+
+def to_bool(value, field_name, record_id):
+    """
+    Converts a SQLite integer flag to a `bool`.
+    """
+    return bool(value)
+
+
+# Marks a lazily parsed temporal field whose raw value has not been parsed yet.
+_UNPARSED = object()
+
+
+class LazyTemporal:
+    """
+    A data descriptor for a date/time field that is parsed on first access.
+
+    The raw database value (usually an ISO 8601 string) is stored as-is in
+    the `_<name>_raw` slot and only parsed, with `parse(value, name, id)`,
+    the first time the attribute is read; the result is cached in the
+    `_<name>` slot. `serialize()` returns the raw string untouched, so
+    listings that only re-serialize a model never parse its timestamps.
+    Owning classes must include `LazyTemporal.slots_for(<name>, ...)` in
+    their `__slots__`.
+    """
+    __slots__ = ('name', 'raw_attr', 'parsed_attr', 'parse', 'default')
+
+    def __init__(self, parse, default=None):
+        """
+        Initializes the descriptor.
+
+        Args:
+            parse (callable): `parse(value, field_name, record_id)` converting a raw string.
+            default (callable, optional): Zero-argument factory for the value when the raw value is None
+                                          (or unparseable). Defaults to None (the field stays None).
+        """
+        self.parse = parse
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.raw_attr, self.parsed_attr = self.slots_for(name)
+
+    @staticmethod
+    def slots_for(*names):
+        """
+        Returns the storage slot names needed by the lazily parsed fields `names`.
+        """
+        return tuple(slot for name in names for slot in (f"_{name}_raw", f"_{name}"))
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = getattr(instance, self.parsed_attr, _UNPARSED)
+        if value is _UNPARSED:
+            value = getattr(instance, self.raw_attr, None)
+            if isinstance(value, str):
+                value = self.parse(value, self.name, instance.id)
+            if value is None and self.default is not None:
+                value = self.default()
+            setattr(instance, self.parsed_attr, value)
+        return value
+
+    def __set__(self, instance, value):
+        setattr(instance, self.raw_attr, value)
+        setattr(instance, self.parsed_attr, _UNPARSED)
+
+    def serialize(self, instance):
+        """
+        Returns the field as an ISO 8601 string for JSON, without parsing a raw string value.
+        """
+        raw = getattr(instance, self.raw_attr, None)
+        if isinstance(raw, str):
+            return raw
+        value = self.__get__(instance)
+        return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
 class BaseModel:
     """
     A base model class providing common fields and methods for all other models.
 
+    Models are slotted (`__slots__`) to keep large result sets compact in
+    memory. A subclass declares its own fields in `__slots__`, a converter in
+    `_converters` for fields that need converting from their database
+    representation, and a `LazyTemporal` descriptor for date/time fields;
+    `from_row` then hydrates it in a single pass over the row.
+
     Attributes:
         id (int): The unique identifier for the record.
         is_active (bool): Indicates whether the record is active (True) or logically deleted (False).
-        created_at (datetime): The UTC timestamp when the record was created.
+        created_at (datetime): The UTC timestamp when the record was created, parsed on first access.
     """
+    __slots__ = ('id', 'is_active') + LazyTemporal.slots_for('created_at')
+
+    created_at = LazyTemporal(parse_datetime, default=lambda: datetime.now(timezone.utc))
+
+    # Column name -> converter(value, field_name, record_id) for subclass fields needing conversion.
+    _converters = {}
+    # (column name, converter or None, LazyTemporal or None) for every field hydrated from a row
+    # besides `id` and `is_active`, derived from `__slots__` and the class's descriptors.
+    _row_fields = ()
+
+    @classmethod
+    def _collect_row_fields(cls):
+        """
+        Returns the `_row_fields` of `cls`, walking every class from `BaseModel` down to it.
+        """
+        fields = []
+        for klass in reversed(cls.__mro__):
+            if not issubclass(klass, BaseModel):
+                continue
+            for name in klass.__dict__.get('__slots__', ()):
+                if not name.startswith('_') and name not in ('id', 'is_active'):
+                    fields.append((name, cls._converters.get(name), None))
+            for name, attribute in klass.__dict__.items():
+                if isinstance(attribute, LazyTemporal):
+                    fields.append((name, None, attribute))
+        return tuple(fields)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._row_fields = cls._collect_row_fields()
+
     def __init__(self, id=None, is_active=True, created_at=None):
         """
         Initializes a new instance of the BaseModel.
@@ -26,7 +175,7 @@ class BaseModel:
         Args:
             id (int, optional): The unique identifier for the record. Defaults to None (for new records).
             is_active (bool, optional): The active status of the record. Defaults to True.
-            created_at (datetime, optional): The creation timestamp. Defaults to the current UTC time if None.
+            created_at (datetime | str, optional): The creation timestamp. Defaults to the current UTC time if None.
         """
         self.id = id
         self.is_active = is_active
@@ -46,8 +195,8 @@ class BaseModel:
         data = {
             'id': self.id,
             'is_active': self.is_active,
-            # Convert datetime object to ISO 8601 string for JSON serialization.
-            'created_at': self.created_at.isoformat() if isinstance(self.created_at, datetime) else self.created_at
+            # ISO 8601 string for JSON serialization; a raw database string is returned without parsing.
+            'created_at': BaseModel.created_at.serialize(self)
         }
         return data
 
@@ -56,47 +205,83 @@ class BaseModel:
         """
         Creates a BaseModel instance (or a subclass instance) from a database row.
 
-        This class method is intended to be called by subclasses' `from_row`
-        implementations to handle the parsing of common fields.
+        The row is converted to a dictionary once and the instance's slots are
+        filled directly, without going through `__init__` or an intermediate
+        instance. Fields come from `_row_fields`; columns missing from the row
+        are set to None (or to what their converter returns for None).
+        Date/time columns are stored raw and parsed on first access.
 
         Args:
             row: The database row, expected to be a dict-like object (e.g., `sqlite3.Row`).
 
         Returns:
             BaseModel: A BaseModel instance (or an instance of the calling subclass)
-                       populated with common fields, or None if the input row is None.
+                       populated from the row, or None if the input row is None.
         """
         if row is None:
             return None
 
-        # Convert sqlite3.Row to a standard dictionary for consistent access.
+        # Convert sqlite3.Row to a standard dictionary, once, for consistent access.
         row_dict = dict(row)
+        get = row_dict.get
+
+        instance = cls.__new__(cls)
+        record_id = get('id')
+        instance.id = record_id
+        instance.is_active = bool(get('is_active', True))  # Default to True if not present.
+
+        for name, convert, lazy in cls._row_fields:
+            value = get(name)
+            if lazy is not None:
+                setattr(instance, lazy.raw_attr, value)
+                setattr(instance, lazy.parsed_attr, _UNPARSED)
+            else:
+                setattr(instance, name, convert(value, name, record_id) if convert is not None else value)
+        return instance
+
+    @classmethod
+    def compile_row_mapper(cls, columns):
+        """
+        Compiles a function that hydrates the model from rows with the given columns.
+
+        The generated function reads every field by position (`row[i]`) and
+        sets the slots directly, so it does the same work as `from_row`
+        without building a dictionary or looking up column names per row. It
+        is only valid for rows whose columns are exactly `columns`, in order;
+        callers cache it per query shape (see `BaseRepository._row_mapper`).
+
+        Args:
+            columns (tuple[str]): The column names of the rows, in order (e.g., from `cursor.description`).
+
+        Returns:
+            callable: A function taking one row and returning a model instance.
+        """
+        position = {name: i for i, name in enumerate(columns)} # Later duplicates win, as with dict(row).
+        namespace = {'new': cls.__new__, 'cls': cls, 'UNPARSED': _UNPARSED}
+
+        def column(name, default):
+            return f"row[{position[name]}]" if name in position else default
+
+        is_active = f"bool(row[{position['is_active']}])" if 'is_active' in position else "True"
+        lines = [
+            "def map_row(row):",
+            "    instance = new(cls)",
+            f"    record_id = instance.id = {column('id', 'None')}",
+            f"    instance.is_active = {is_active}",
+        ]
+        for name, convert, lazy in cls._row_fields:
+            value = column(name, 'None')
+            if lazy is not None:
+                lines.append(f"    instance.{lazy.raw_attr} = {value}")
+                lines.append(f"    instance.{lazy.parsed_attr} = UNPARSED")
+                continue
+            if convert is not None:
+                namespace[f"convert_{name}"] = convert
+                value = f"convert_{name}({value}, {name!r}, record_id)"
+            lines.append(f"    instance.{name} = {value}")
+        lines.append("    return instance")
+        exec("\n".join(lines), namespace)
+        return namespace['map_row']
+
 
-        # Extract common fields from the row dictionary.
-        record_id = row_dict.get('id')
-        active_status = bool(row_dict.get('is_active', True))  # Default to True if not present.
-
-        created_at_parsed = None
-        created_at_str = row_dict.get('created_at')
-        if created_at_str:
-            try:
-                # Attempt to parse the ISO 8601 formatted datetime string.
-                created_at_parsed = datetime.fromisoformat(created_at_str)
-            except ValueError:
-                # Log a warning if the datetime string format is invalid.
-                # Use current_app.logger if available, otherwise fall back to print.
-                if current_app:
-                    current_app.logger.warning(
-                        f"Invalid datetime format for 'created_at': '{created_at_str}' "
-                        f"for record ID {record_id}. Setting to None."
-                    )
-                else:
-                    print(
-                        f"WARNING: Invalid datetime format for 'created_at': '{created_at_str}' "
-                        f"for record ID {record_id}. Setting to None."
-                    )
-
-        # Create an instance of the specific model class (cls refers to the subclass).
-        # Subclasses will typically call this super method and then handle their
-        # specific fields.
-        return cls(id=record_id, is_active=active_status, created_at=created_at_parsed)
+BaseModel._row_fields = BaseModel._collect_row_fields()
@@ -8,8 +8,27 @@ along with the enrolment date.
 """
 
 from datetime import datetime, date, timezone
-from .base_model import BaseModel
-from flask import current_app  # Imported here for logging within from_row, if app context is available
+from .base_model import BaseModel, LazyTemporal, warn_invalid_value
+
+
+def _parse_enrol_date(value, field_name, record_id):
+    """
+    Converts an `enrol_date` string to a `date`.
+
+    Accepts full ISO 8601 datetimes as well as date-only strings. Invalid
+    values are logged and return None, so the field falls back to today's date.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        # Fallback for date-only string if fromisoformat fails on full datetime string.
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            warn_invalid_value(field_name, value, record_id, kind='date')
+            return None
 
 
 class Enrolment(BaseModel):
@@ -20,6 +39,10 @@ class Enrolment(BaseModel):
     and `is_active`. It establishes a many-to-many relationship between
     students and modules.
     """
+    __slots__ = ('student_id', 'module_id', 'student_name', 'module_title') + LazyTemporal.slots_for('enrol_date')
+
+    # Parsed on first access; defaults to the current UTC date when missing or invalid.
+    enrol_date = LazyTemporal(_parse_enrol_date, default=lambda: datetime.now(timezone.utc).date())
 
     def __init__(self, id=None, student_id=None, module_id=None, enrol_date=None, student_name=None, module_title=None,
                  created_at=None, is_active=True, **kwargs):
@@ -40,16 +63,8 @@ class Enrolment(BaseModel):
         super().__init__(id=id, created_at=created_at, is_active=is_active, **kwargs)
         self.student_id = student_id
         self.module_id = module_id
-        # Ensure enrol_date is a date object, defaulting to current UTC date.
-        if isinstance(enrol_date, str):
-            try:
-                self.enrol_date = datetime.fromisoformat(enrol_date).date()
-            except ValueError:
-                self.enrol_date = date.fromisoformat(enrol_date)  # Fallback for date-only string
-        elif enrol_date is None:
-            self.enrol_date = datetime.now(timezone.utc).date()
-        else:
-            self.enrol_date = enrol_date
+        # A date string is kept as-is and parsed to a date object on first access.
+        self.enrol_date = enrol_date
 
         self.student_name = student_name
         self.module_title = module_title
@@ -62,84 +77,16 @@ class Enrolment(BaseModel):
             dict: A dictionary containing the enrolment's attributes suitable for JSON serialization.
         """
         data = super().to_dict()  # Get common fields from BaseModel.
-        # Convert date object to ISO 8601 string for JSON serialization.
-        enrol_date_str = self.enrol_date.isoformat() if isinstance(self.enrol_date,
-                                                                   (datetime, date)) else self.enrol_date
-
         data.update({
             'student_id': self.student_id,
             'module_id': self.module_id,
-            'enrol_date': enrol_date_str,
+            # ISO 8601 string for JSON serialization; a raw database string is returned without parsing.
+            'enrol_date': Enrolment.enrol_date.serialize(self),
             'student_name': self.student_name,
             'module_title': self.module_title
         })
         return data
 
-    @classmethod
-    def from_row(cls, row) -> 'Enrolment':
-        """
-        Creates an Enrolment instance from a database row.
-
-        This class method is used to reconstruct an Enrolment object from data
-        retrieved from the database. It leverages `BaseModel.from_row`
-        for common fields and then populates enrolment-specific attributes.
-
-        Args:
-            row: The database row, expected to be a dict-like object (e.g., `sqlite3.Row`).
-
-        Returns:
-            Enrolment: An Enrolment instance populated with data from the row,
-                       or None if the row is None.
-        """
-        if row is None:
-            return None
-
-        # Use BaseModel's from_row to parse common fields.
-        base_instance = BaseModel.from_row(row)
-        if not base_instance:
-            return None
-
-        row_dict = dict(row)  # Convert row to dict for easier access to specific fields.
-
-        # Extract enrolment-specific fields.
-        student_id = row_dict.get('student_id')
-        module_id = row_dict.get('module_id')
-
-        enrol_date_obj = None
-        enrol_date_str = row_dict.get('enrol_date')
-        if enrol_date_str:
-            try:
-                enrol_date_obj = datetime.fromisoformat(enrol_date_str).date()
-            except ValueError:
-                # Fallback for date-only string if fromisoformat fails on full datetime string.
-                try:
-                    enrol_date_obj = date.fromisoformat(enrol_date_str)
-                except ValueError:
-                    if current_app:
-                        current_app.logger.warning(
-                            f"Invalid date format for 'enrol_date': '{enrol_date_str}' "
-                            f"for enrolment ID {row_dict.get('id')}. Setting to None."
-                        )
-                    else:
-                        print(
-                            f"WARNING: Invalid date format for 'enrol_date': '{enrol_date_str}' "
-                            f"for enrolment ID {row_dict.get('id')}. Setting to None."
-                        )
-
-        student_name = row_dict.get('student_name')
-        module_title = row_dict.get('module_title')
-
-        return cls(
-            id=base_instance.id,
-            student_id=student_id,
-            module_id=module_id,
-            enrol_date=enrol_date_obj,
-            student_name=student_name,
-            module_title=module_title,
-            is_active=base_instance.is_active,
-            created_at=base_instance.created_at
-        )
-
     def __repr__(self) -> str:
         """
         Returns a string representation of the Enrolment object, useful for debugging.
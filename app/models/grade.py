@@ -18,6 +18,8 @@ class Grade(BaseModel):
     Inherits from `BaseModel` for common fields such as `id`, `created_at`,
     and `is_active`. Grades are linked to a specific student, module, and assessment.
     """
+    __slots__ = ('student_id', 'module_id', 'assessment_name', 'grade', 'student_name', 'module_title')
+
 
     def __init__(self, id=None, student_id=None, module_id=None, assessment_name=None, grade=None, student_name=None,
                  module_title=None, created_at=None, is_active=True, **kwargs):
@@ -62,47 +64,6 @@ class Grade(BaseModel):
         })
         return data
 
-    @classmethod
-    def from_row(cls, row) -> 'Grade':
-        """
-        Creates a Grade instance from a database row.
-
-        This class method is used to reconstruct a Grade object from data
-        retrieved from the database. It leverages `BaseModel.from_row`
-        for common fields and then populates grade-specific attributes.
-
-        Args:
-            row: The database row, expected to be a dict-like object (e.g., `sqlite3.Row`).
-
-        Returns:
-            Grade: A Grade instance populated with data from the row, or None if the row is None.
-        """
-        if row is None:
-            return None
-
-        # Use BaseModel's from_row to parse common fields.
-        base_instance = BaseModel.from_row(row)
-        if not base_instance:
-            return None
-
-        row_dict = dict(row)  # Convert row to dict for easier access to specific fields.
-
-        # Extract grade-specific fields.
-        student_id = row_dict.get('student_id')
-        module_id = row_dict.get('module_id')
-        assessment_name = row_dict.get('assessment_name')
-        grade = row_dict.get('grade')
-
-        return cls(
-            id=base_instance.id,
-            student_id=student_id,
-            module_id=module_id,
-            assessment_name=assessment_name,
-            grade=grade,
-            is_active=base_instance.is_active,
-            created_at=base_instance.created_at
-        )
-
     def __repr__(self) -> str:
         """
         Returns a string representation of the Grade object, useful for debugging.
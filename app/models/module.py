@@ -18,6 +18,8 @@ class Module(BaseModel):
     and `is_active`. Modules are fundamental entities for student enrolments
     and academic tracking.
     """
+    __slots__ = ('module_code', 'module_title', 'credit', 'academic_year')
+
     def __init__(self, id=None, module_code=None, module_title=None, credit=None, academic_year=None, created_at=None, is_active=True, **kwargs):
         """
         Initializes a Module instance.
@@ -54,47 +56,6 @@ class Module(BaseModel):
         })
         return data
 
-    @classmethod
-    def from_row(cls, row) -> 'Module':
-        """
-        Creates a Module instance from a database row.
-
-        This class method is used to reconstruct a Module object from data
-        retrieved from the database. It leverages `BaseModel.from_row`
-        for common fields and then populates module-specific attributes.
-
-        Args:
-            row: The database row, expected to be a dict-like object (e.g., `sqlite3.Row`).
-
-        Returns:
-            Module: A Module instance populated with data from the row, or None if the row is None.
-        """
-        if row is None:
-            return None
-
-        # Use BaseModel's from_row to parse common fields.
-        base_instance = BaseModel.from_row(row)
-        if not base_instance:
-            return None
-
-        row_dict = dict(row) # Convert row to dict for easier access to specific fields.
-
-        # Extract module-specific fields.
-        module_code = row_dict.get('module_code')
-        module_title = row_dict.get('module_title')
-        credit = row_dict.get('credit')
-        academic_year = row_dict.get('academic_year')
-
-        return cls(
-            id=base_instance.id,
-            module_code=module_code,
-            module_title=module_title,
-            credit=credit,
-            academic_year=academic_year,
-            is_active=base_instance.is_active,
-            created_at=base_instance.created_at
-        )
-
     def __repr__(self) -> str:
         """
         Returns a string representation of the Module object, useful for debugging.
@@ -18,6 +18,9 @@ class StressEvent(BaseModel):
     and `is_active`. These events are typically triggered by survey responses
     or other system detections.
     """
+    __slots__ = ('student_id', 'module_id', 'survey_response_id', 'week_number', 'stress_level',
+                 'cause_category', 'description', 'source')
+
     def __init__(self, id=None, student_id=None, module_id=None, survey_response_id=None, week_number=None, stress_level=None, cause_category=None, description=None, source=None, created_at=None, is_active=True, **kwargs):
         """
         Initializes a StressEvent instance.
@@ -66,56 +69,6 @@ class StressEvent(BaseModel):
         })
         return data
 
-    @classmethod
-    def from_row(cls, row) -> 'StressEvent':
-        """
-        Creates a StressEvent instance from a database row.
-
-        This class method is used to reconstruct a StressEvent object from data
-        retrieved from the database. It leverages `BaseModel.from_row`
-        for common fields and then populates event-specific attributes.
-
-        Args:
-            row: The database row, expected to be a dict-like object (e.g., `sqlite3.Row`).
-
-        Returns:
-            StressEvent: A StressEvent instance populated with data from the row,
-                         or None if the row is None.
-        """
-        if row is None:
-            return None
-
-        # Use BaseModel's from_row to parse common fields.
-        base_instance = BaseModel.from_row(row)
-        if not base_instance:
-            return None
-
-        row_dict = dict(row) # Convert row to dict for easier access to specific fields.
-
-        # Extract stress event-specific fields.
-        student_id = row_dict.get('student_id')
-        module_id = row_dict.get('module_id')
-        survey_response_id = row_dict.get('survey_response_id')
-        week_number = row_dict.get('week_number')
-        stress_level = row_dict.get('stress_level')
-        cause_category = row_dict.get('cause_category')
-        description = row_dict.get('description')
-        source = row_dict.get('source')
-
-        return cls(
-            id=base_instance.id,
-            student_id=student_id,
-            module_id=module_id,
-            survey_response_id=survey_response_id,
-            week_number=week_number,
-            stress_level=stress_level,
-            cause_category=cause_category,
-            description=description,
-            source=source,
-            is_active=base_instance.is_active,
-            created_at=base_instance.created_at
-        )
-
     def __repr__(self) -> str:
         """
         Returns a string representation of the StressEvent object, useful for debugging.
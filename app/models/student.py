@@ -18,6 +18,8 @@ class Student(BaseModel):
     and `is_active`. Students are core entities, linked to various academic
     and wellbeing records.
     """
+    __slots__ = ('student_number', 'full_name', 'email', 'course_name', 'year_of_study')
+
     def __init__(self, id=None, student_number=None, full_name=None, email=None, course_name=None, year_of_study=None, created_at=None, is_active=True, **kwargs):
         """
         Initializes a Student instance.
@@ -57,49 +59,6 @@ class Student(BaseModel):
         })
         return data
 
-    @classmethod
-    def from_row(cls, row) -> 'Student':
-        """
-        Creates a Student instance from a database row.
-
-        This class method is used to reconstruct a Student object from data
-        retrieved from the database. It leverages `BaseModel.from_row`
-        for common fields and then populates student-specific attributes.
-
-        Args:
-            row: The database row, expected to be a dict-like object (e.g., `sqlite3.Row`).
-
-        Returns:
-            Student: A Student instance populated with data from the row, or None if the row is None.
-        """
-        if row is None:
-            return None
-        
-        # Use BaseModel's from_row to parse common fields.
-        base_instance = BaseModel.from_row(row)
-        if not base_instance:
-            return None
-
-        row_dict = dict(row) # Convert row to dict for easier access to specific fields.
-
-        # Extract student-specific fields.
-        student_number = row_dict.get('student_number')
-        full_name = row_dict.get('full_name')
-        email = row_dict.get('email')
-        course_name = row_dict.get('course_name')
-        year_of_study = row_dict.get('year_of_study')
-
-        return cls(
-            id=base_instance.id,
-            student_number=student_number,
-            full_name=full_name,
-            email=email,
-            course_name=course_name,
-            year_of_study=year_of_study,
-            is_active=base_instance.is_active,
-            created_at=base_instance.created_at
-        )
-
     def __repr__(self) -> str:
         """
         Returns a string representation of the Student object, useful for debugging.
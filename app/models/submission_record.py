@@ -7,9 +7,7 @@ for common fields and includes attributes for linking students and modules,
 assessment details, due dates, and submission status (submitted, late).
 """
 
-from datetime import datetime, date
-from .base_model import BaseModel
-from flask import current_app # Imported here for logging within from_row, if app context is available
+from .base_model import BaseModel, LazyTemporal, parse_datetime, to_bool
 
 class SubmissionRecord(BaseModel):
     """
@@ -19,6 +17,14 @@ class SubmissionRecord(BaseModel):
     and `is_active`. It tracks whether an assessment was submitted, when,
     and if it was late.
     """
+    __slots__ = ('student_id', 'module_id', 'assessment_name', 'is_submitted', 'is_late', 'student_name',
+                 'module_title') + LazyTemporal.slots_for('due_date', 'submitted_date')
+    _converters = {'is_submitted': to_bool, 'is_late': to_bool}
+
+    # Parsed from their ISO 8601 strings on first access.
+    due_date = LazyTemporal(parse_datetime)
+    submitted_date = LazyTemporal(parse_datetime)
+
     def __init__(self, id=None, student_id=None, module_id=None, assessment_name=None, due_date=None, submitted_date=None, is_submitted=False, is_late=False, student_name=None, module_title=None, created_at=None, is_active=True, **kwargs):
         """
         Initializes a SubmissionRecord instance.
@@ -43,30 +49,15 @@ class SubmissionRecord(BaseModel):
         self.module_id = module_id
         self.assessment_name = assessment_name
 
-        # Safely parse date strings to datetime objects if provided.
-        self.due_date = self._parse_date_field(due_date, 'due_date')
-        self.submitted_date = self._parse_date_field(submitted_date, 'submitted_date')
+        # Date strings are kept as-is and parsed to datetime objects on first access.
+        self.due_date = due_date
+        self.submitted_date = submitted_date
 
         self.is_submitted = is_submitted
         self.is_late = is_late
         self.student_name = student_name
         self.module_title = module_title
 
-    def _parse_date_field(self, date_value, field_name: str):
-        """Helper to parse date/datetime strings safely."""
-        if isinstance(date_value, str):
-            try:
-                return datetime.fromisoformat(date_value)
-            except (ValueError, TypeError):
-                if current_app:
-                    current_app.logger.warning(
-                        f"Invalid datetime format for '{field_name}': '{date_value}'. Setting to None."
-                    )
-                else:
-                    print(f"WARNING: Invalid datetime format for '{field_name}': '{date_value}'. Setting to None.")
-                return None
-        return date_value
-
     def to_dict(self) -> dict:
         """
         Converts the SubmissionRecord object to a dictionary representation, including common base model fields.
@@ -79,9 +70,9 @@ class SubmissionRecord(BaseModel):
             'student_id': self.student_id,
             'module_id': self.module_id,
             'assessment_name': self.assessment_name,
-            # Convert datetime objects to ISO 8601 strings for JSON serialization.
-            'due_date': self.due_date.isoformat() if self.due_date else None,
-            'submitted_date': self.submitted_date.isoformat() if self.submitted_date else None,
+            # ISO 8601 strings for JSON serialization; raw database strings are returned without parsing.
+            'due_date': SubmissionRecord.due_date.serialize(self),
+            'submitted_date': SubmissionRecord.submitted_date.serialize(self),
             'is_submitted': self.is_submitted,
             'is_late': self.is_late,
             'student_name': self.student_name,
@@ -89,81 +80,6 @@ class SubmissionRecord(BaseModel):
         })
         return data
 
-
-    @classmethod
-    def from_row(cls, row) -> 'SubmissionRecord':
-        """
-        Creates a SubmissionRecord instance from a database row.
-
-        This class method is used to reconstruct a SubmissionRecord object from data
-        retrieved from the database. It leverages `BaseModel.from_row`
-        for common fields and then populates record-specific attributes.
-
-        Args:
-            row: The database row, expected to be a dict-like object (e.g., `sqlite3.Row`).
-
-        Returns:
-            SubmissionRecord: A SubmissionRecord instance populated with data from the row,
-                              or None if the row is None.
-        """
-        if row is None:
-            return None
-
-        # Use BaseModel's from_row to parse common fields.
-        base_instance = BaseModel.from_row(row)
-        if not base_instance:
-            return None
-
-        row_dict = dict(row)  # Convert row to dict for easier access to specific fields.
-
-        # Helper to parse date strings safely within from_row.
-        def _parse_date_from_row(date_str_value, field_name):
-            if not isinstance(date_str_value, str):
-                return date_str_value
-            try:
-                return datetime.fromisoformat(date_str_value)
-            except (ValueError, TypeError):
-                if current_app:
-                    current_app.logger.warning(
-                        f"Invalid datetime format for '{field_name}': '{date_str_value}' "
-                        f"for record ID {row_dict.get('id')}. Setting to None."
-                    )
-                else:
-                    print(
-                        f"WARNING: Invalid datetime format for '{field_name}': '{date_str_value}' "
-                        f"for record ID {row_dict.get('id')}. Setting to None."
-                    )
-                return None
-
-        # Extract record-specific fields.
-        student_id = row_dict.get('student_id')
-        module_id = row_dict.get('module_id')
-        assessment_name = row_dict.get('assessment_name')
-
-        due_date = _parse_date_from_row(row_dict.get('due_date'), 'due_date')
-        submitted_date = _parse_date_from_row(row_dict.get('submitted_date'), 'submitted_date')
-
-        is_submitted = bool(row_dict.get('is_submitted'))
-        is_late = bool(row_dict.get('is_late'))
-        student_name = row_dict.get('student_name')
-        module_title = row_dict.get('module_title')
-
-        return cls(
-            id=base_instance.id,
-            student_id=student_id,
-            module_id=module_id,
-            assessment_name=assessment_name,
-            due_date=due_date,
-            submitted_date=submitted_date,
-            is_submitted=is_submitted,
-            is_late=is_late,
-            student_name=student_name,
-            module_title=module_title,
-            is_active=base_instance.is_active,
-            created_at=base_instance.created_at
-        )
-
-
     def __repr__(self) -> str:
         """
         Returns a string representation of the SubmissionRecord object, useful for debugging.
@@ -18,6 +18,8 @@ class SurveyResponse(BaseModel):
     and `is_active`. Survey responses are crucial for monitoring student
     wellbeing and identifying potential issues.
     """
+    __slots__ = ('student_id', 'module_id', 'week_number', 'stress_level', 'hours_slept', 'mood_comment')
+
     def __init__(self, id=None, student_id=None, module_id=None, week_number=None, stress_level=None, hours_slept=None, mood_comment=None, created_at=None, is_active=True, **kwargs):
         """
         Initializes a SurveyResponse instance.
@@ -60,52 +62,6 @@ class SurveyResponse(BaseModel):
         })
         return data
 
-    @classmethod
-    def from_row(cls, row) -> 'SurveyResponse':
-        """
-        Creates a SurveyResponse instance from a database row.
-
-        This class method is used to reconstruct a SurveyResponse object from data
-        retrieved from the database. It leverages `BaseModel.from_row`
-        for common fields and then populates response-specific attributes.
-
-        Args:
-            row: The database row, expected to be a dict-like object (e.g., `sqlite3.Row`).
-
-        Returns:
-            SurveyResponse: A SurveyResponse instance populated with data from the row,
-                            or None if the row is None.
-        """
-        if row is None:
-            return None
-
-        # Use BaseModel's from_row to parse common fields.
-        base_instance = BaseModel.from_row(row)
-        if not base_instance:
-            return None
-
-        row_dict = dict(row) # Convert row to dict for easier access to specific fields.
-
-        # Extract response-specific fields.
-        student_id = row_dict.get('student_id')
-        module_id = row_dict.get('module_id')
-        week_number = row_dict.get('week_number')
-        stress_level = row_dict.get('stress_level')
-        hours_slept = row_dict.get('hours_slept')
-        mood_comment = row_dict.get('mood_comment')
-
-        return cls(
-            id=base_instance.id,
-            student_id=student_id,
-            module_id=module_id,
-            week_number=week_number,
-            stress_level=stress_level,
-            hours_slept=hours_slept,
-            mood_comment=mood_comment,
-            is_active=base_instance.is_active,
-            created_at=base_instance.created_at
-        )
-
     def __repr__(self) -> str:
         """
         Returns a string representation of the SurveyResponse object, useful for debugging.
@@ -7,8 +7,9 @@ to a student record. It inherits from `BaseModel` for common fields and
 provides methods for password management.
 """
 
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 from datetime import datetime
+from app.utils.passwords import hash_password
 from .base_model import BaseModel
 
 class User(BaseModel):
@@ -19,6 +20,8 @@ class User(BaseModel):
     and `is_active`. Includes specific attributes for user authentication
     and role management.
     """
+    __slots__ = ('username', 'password_hash', 'role', 'student_id')
+
     def __init__(self, id=None, username=None, password_hash=None, role='user', student_id=None, created_at=None, is_active=True, **kwargs):
         """
         Initializes a User instance.
@@ -42,12 +45,12 @@ class User(BaseModel):
     def set_password(self, password: str):
         """
         Hashes the provided plain-text password using Werkzeug's security functions
-        and sets it as the user's `password_hash`.
+        (with the configured `PASSWORD_HASH_METHOD`) and sets it as the user's `password_hash`.
 
         Args:
             password (str): The plain-text password to hash.
         """
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
         """
@@ -78,47 +81,6 @@ class User(BaseModel):
         })
         return data
 
-    @classmethod
-    def from_row(cls, row) -> 'User':
-        """
-        Creates a User instance from a database row.
-
-        This class method is used to reconstruct a User object from data
-        retrieved from the database. It leverages `BaseModel.from_row`
-        for common fields and then populates user-specific attributes.
-
-        Args:
-            row: The database row, expected to be a dict-like object (e.g., `sqlite3.Row`).
-
-        Returns:
-            User: A User instance populated with data from the row, or None if the row is None.
-        """
-        if row is None:
-            return None
-
-        # Use BaseModel's from_row to parse common fields.
-        base_instance = BaseModel.from_row(row)
-        if not base_instance: # Should not happen if row is not None, but as a safeguard.
-            return None
-
-        row_dict = dict(row) # Convert row to dict for easier access to specific fields.
-
-        # Extract user-specific fields.
-        username = row_dict.get('username')
-        password_hash = row_dict.get('password_hash')
-        role = row_dict.get('role')
-        student_id = row_dict.get('student_id')
-
-        return cls(
-            id=base_instance.id,
-            username=username,
-            password_hash=password_hash,
-            role=role,
-            student_id=student_id,
-            is_active=base_instance.is_active,
-            created_at=base_instance.created_at
-        )
-
     def __repr__(self) -> str:
         """
         Returns a string representation of the User object, useful for debugging.
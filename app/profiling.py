@@ -0,0 +1,161 @@
+"""
+Sampling request profiler.
+
+When `PROFILING_ENABLED` is set, a fraction (`PROFILE_SAMPLE_RATE`) of
+requests, plus any request from an admin that carries the `PROFILE_HEADER`
+header, is run under `cProfile`. Each profile is written as a `.pstats` file
+to a per-route subdirectory of `PROFILE_DIR` (e.g.
+`profiles/GET_api_analysis_stress_trends/20250101T120000-1234-7.pstats`), and
+only the newest `PROFILE_MAX_FILES_PER_ROUTE` files of each route are kept.
+
+Only one request is profiled at a time per process (the interpreter supports
+one active profiler), so concurrent requests selected for profiling while
+another one runs are served unprofiled. `profile_report` (and the
+`manage.py profile-report` command) merges the files into the top
+cumulative hot spots.
+"""
+
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import random
+import re
+import threading
+from datetime import datetime, timezone
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+# Held while a request is being profiled; only one profiler can be active at a time.
+_profiler_lock = threading.Lock()
+# Distinguishes profiles written by one process within the same second.
+_sequence = itertools.count(1)
+
+
+def route_slug(method, route):
+    """
+    Returns the directory name used for a route's profiles (e.g., 'GET_api_analysis_students_int_id').
+
+    Args:
+        method (str): The HTTP method.
+        route (str): The URL rule (e.g., '/api/analysis/students/<int:id>').
+
+    Returns:
+        str: A filesystem-safe name.
+    """
+    return f"{method}_{re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'}"
+
+
+def _requested_by_admin():
+    """Returns True if the current request carries a valid JWT with the admin role."""
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return False
+    return get_jwt().get('role') == 'admin'
+
+
+def _should_profile():
+    """Returns True if the current request is sampled or explicitly asks (as an admin) to be profiled."""
+    header = current_app.config.get('PROFILE_HEADER')
+    if header and request.headers.get(header) and _requested_by_admin():
+        return True
+    rate = current_app.config.get('PROFILE_SAMPLE_RATE', 0.0)
+    return rate > 0 and random.random() < rate
+
+
+def _rotate(directory, keep):
+    """Deletes all but the newest `keep` `.pstats` files in `directory`."""
+    files = sorted((entry for entry in os.scandir(directory) if entry.name.endswith('.pstats')),
+                   key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in files[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass # Another process may have rotated it already.
+
+
+def write_profile(profiler, method, route):
+    """
+    Writes a finished profile to its route's directory and rotates old ones.
+
+    Args:
+        profiler (cProfile.Profile): The disabled profiler.
+        method (str): The request's HTTP method.
+        route (str): The request's URL rule.
+
+    Returns:
+        str: The path of the written `.pstats` file.
+    """
+    directory = os.path.join(current_app.config['PROFILE_DIR'], route_slug(method, route))
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+    path = os.path.join(directory, f"{stamp}-{os.getpid()}-{next(_sequence)}.pstats")
+    profiler.dump_stats(path)
+    _rotate(directory, current_app.config.get('PROFILE_MAX_FILES_PER_ROUTE', 50))
+    return path
+
+
+def profile_report(directory, route=None, limit=20, sort='cumulative'):
+    """
+    Merges `.pstats` files and returns the top functions as text.
+
+    Args:
+        directory (str): The profile directory (`PROFILE_DIR`).
+        route (str, optional): Only merge this route's profiles: a directory name such as
+                               'GET_api_analysis_stress_trends', or a substring of one. Defaults to all routes.
+        limit (int, optional): The number of functions listed. Defaults to 20.
+        sort (str, optional): A `pstats` sort key. Defaults to 'cumulative'.
+
+    Returns:
+        tuple[int, str]: The number of profiles merged and the report (empty if there were none).
+    """
+    paths = []
+    if os.path.isdir(directory):
+        for route_dir in sorted(os.scandir(directory), key=lambda entry: entry.name):
+            if route_dir.is_dir() and (route is None or route in route_dir.name):
+                paths.extend(entry.path for entry in os.scandir(route_dir.path) if entry.name.endswith('.pstats'))
+    if not paths:
+        return 0, ''
+    output = io.StringIO()
+    stats = pstats.Stats(*paths, stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return len(paths), output.getvalue()
+
+
+def init_app(app):
+    """
+    Registers the request profiling hooks if `PROFILING_ENABLED` is set.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    if not app.config.get('PROFILING_ENABLED', False):
+        return
+
+    @app.before_request
+    def start_profiler():
+        if not _should_profile() or not _profiler_lock.acquire(blocking=False):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError: # Another profiling tool (e.g., a debugger) is active.
+            _profiler_lock.release()
+            return
+        g.request_profiler = profiler
+
+    @app.teardown_request
+    def stop_profiler(exc):
+        # Runs after the response (including a streamed body) is complete, even if the view raised.
+        profiler = g.pop('request_profiler', None)
+        if profiler is None:
+            return
+        profiler.disable()
+        _profiler_lock.release()
+        route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        try:
+            write_profile(profiler, request.method, route)
+        except OSError as e:
+            current_app.logger.error(f"Could not write request profile for {route}: {e}")
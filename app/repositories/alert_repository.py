@@ -7,11 +7,24 @@ for interacting with the 'alerts' table in the database. It extends
 retrieving specific alerts, marking them as resolved, and creating new ones.
 """
 
+from collections.abc import Iterator
 import sqlite3
 from app.db_connection import get_db
 from app.models.alert import Alert
 from .base_repository import BaseRepository
 
+# Active alerts with their student and module details, as listed by get_all_alerts and iter_all_alerts_json.
+_ACTIVE_ALERTS_QUERY = """
+    SELECT a.id, a.student_id, a.module_id, a.week_number, a.reason, a.created_at, a.resolved, a.is_active,
+           s.full_name AS student_name, m.module_title AS module_title
+    FROM alerts a
+    JOIN students s ON a.student_id = s.id
+    LEFT JOIN modules m ON a.module_id = m.id
+    WHERE a.is_active = 1
+"""
+# Newest first, matching the key of idx_alerts_created_id so the full listing streams without a sort.
+_ACTIVE_ALERTS_ORDER = " ORDER BY COALESCE(a.created_at, '') DESC, a.id DESC"
+
 class AlertRepository(BaseRepository):
     """
     Repository for alert-related database operations.
@@ -28,26 +41,49 @@ class AlertRepository(BaseRepository):
         """
         super().__init__('alerts', Alert)
 
-    def get_all_alerts(self) -> list[dict]:
+    def get_all_alerts(self, stream: bool = False, page_size: int | None = None, cursor: str | None = None) -> list[dict] | Iterator[dict] | dict:
         """
         Retrieves all active alerts from the database, including associated
         student and module information for richer context.
 
+        Args:
+            stream (bool, optional): If True, returns a lazy iterator that fetches rows in batches
+                                     instead of building the whole list in memory. Defaults to False.
+            page_size (int, optional): If given (or if `cursor` is given), returns a single keyset-paginated page.
+            cursor (str, optional): The `next_cursor` of the previous page.
+
         Returns:
-            list[dict]: A list of dictionaries, where each dictionary represents
-                        an alert with joined student and module details.
-        """
-        query = """
-            SELECT a.id, a.student_id, a.module_id, a.week_number, a.reason, a.created_at, a.resolved, a.is_active,
-                   s.full_name AS student_name, m.module_title AS module_title
-            FROM alerts a
-            JOIN students s ON a.student_id = s.id
-            LEFT JOIN modules m ON a.module_id = m.id
-            WHERE a.is_active = 1
-            ORDER BY a.created_at DESC
+            list[dict] | Iterator[dict] | dict: A list (or, if `stream` is True, an iterator)
+                of dictionaries, where each dictionary represents an alert with joined student and module details.
+                When paginating, a dict with 'items' and 'next_cursor'.
+        """
+        query = _ACTIVE_ALERTS_QUERY
+        if page_size is not None or cursor is not None:
+            # Newest first; alerts without a timestamp sort last, as with ORDER BY created_at DESC.
+            return self._paginate(query, page_size=page_size, cursor=cursor, as_dicts=True,
+                                  order_by=("COALESCE(created_at, '')", 'id'), descending=True,
+                                  cursor_of=lambda row: (row['created_at'] or '', row['id']))
+        query += _ACTIVE_ALERTS_ORDER
+        # iter_query handles exceptions and yields results as dictionaries due to as_dicts=True.
+        rows = self.iter_query(query, as_dicts=True)
+        return rows if stream else list(rows)
+
+    def iter_all_alerts_json(self, batch_size: int | None = None) -> Iterator[bytes]:
+        """
+        Streams all active alerts, newest first, as chunks of one JSON array.
+
+        Rows go straight from the cursor to the encoder (see
+        `BaseRepository.iter_query_json`); the decoded array equals
+        `get_all_alerts()`. Intended for read-only listing endpoints, via
+        `app.utils.json_stream.json_array_response`.
+
+        Args:
+            batch_size (int, optional): Rows encoded per chunk. Defaults to the `DB_FETCH_BATCH_SIZE` setting.
+
+        Returns:
+            Iterator[bytes]: The encoded chunks of the JSON array.
         """
-        # _execute_query handles exceptions and returns results as dictionaries due to fetch_all_dicts=True.
-        return self._execute_query(query, fetch_all_dicts=True)
+        return self.iter_query_json(_ACTIVE_ALERTS_QUERY + _ACTIVE_ALERTS_ORDER, batch_size=batch_size)
 
     def get_recent_alerts_per_student(self) -> list[dict]:
         """
@@ -5,6 +5,17 @@ This module defines the `AnalysisRepository` class, which provides methods
 for performing various analytical queries on student data. It extends
 `BaseRepository` but primarily focuses on custom SQL queries to extract
 insights related to student wellbeing, academic performance, and engagement.
+
+Results are cached per method and arguments (see `app/cache.py`) and
+invalidated whenever one of the tables a method reads is written through a
+repository.
+
+Stress and attendance averages are read from the `student_week_stats`
+summary table (see `utils/schema.py`), which holds trigger-maintained sums
+and counts per (student, module, week), rather than recomputed from the raw
+`survey_responses` and `attendance_records` rows on every call. Methods
+reading it list `student_week_stats` among their cached tables as well, so a
+rebuild of the table (`flask rebuild-stats`) invalidates their results.
 """
 
 import sqlite3
@@ -18,6 +29,8 @@ from app.models.alert import Alert
 from app.models.submission_record import SubmissionRecord
 from datetime import datetime
 from .base_repository import BaseRepository
+from app.cache import cached_result
+from flask import current_app # Import current_app for configuration lookups
 
 
 class AnalysisRepository(BaseRepository):
@@ -40,11 +53,13 @@ class AnalysisRepository(BaseRepository):
         """
         super().__init__('analysis', None)
 
+    @cached_result('survey_responses', 'student_week_stats')
     def get_stress_trend_for_student(self, student_id: int) -> dict:
         """
         Retrieves the stress level trend for a specific student over academic weeks.
 
-        Aggregates average stress levels from survey responses per week.
+        Aggregates average stress levels from survey responses per week, using the
+        per-week sums and counts in `student_week_stats`.
 
         Args:
             student_id (int): The unique identifier of the student.
@@ -55,10 +70,10 @@ class AnalysisRepository(BaseRepository):
                   - 'data': List of average stress levels for each corresponding week.
         """
         query = """
-                SELECT week_number, AVG(stress_level) as average_stress_level \
-                FROM survey_responses
+                SELECT week_number, SUM(stress_sum) * 1.0 / SUM(stress_count) as average_stress_level \
+                FROM student_week_stats
                 WHERE student_id = ? \
-                  AND is_active = 1
+                  AND stress_count > 0
                 GROUP BY week_number
                 ORDER BY week_number \
                 """
@@ -69,11 +84,13 @@ class AnalysisRepository(BaseRepository):
             'data': [round(row['average_stress_level'], 2) for row in records]
         }
 
+    @cached_result('attendance_records', 'student_week_stats')
     def get_attendance_trend_for_student(self, student_id: int) -> dict:
         """
         Retrieves the attendance rate trend for a specific student over academic weeks.
 
-        Aggregates average attendance rates from attendance records per week.
+        Aggregates average attendance rates from attendance records per week, using the
+        per-week sums and counts in `student_week_stats`.
 
         Args:
             student_id (int): The unique identifier of the student.
@@ -84,10 +101,10 @@ class AnalysisRepository(BaseRepository):
                   - 'data': List of average attendance rates (as percentages) for each corresponding week.
         """
         query = """
-                SELECT week_number, AVG(attendance_rate) as average_attendance_rate \
-                FROM attendance_records
+                SELECT week_number, SUM(attendance_sum) / SUM(attendance_count) as average_attendance_rate \
+                FROM student_week_stats
                 WHERE student_id = ? \
-                  AND is_active = 1
+                  AND attendance_count > 0
                 GROUP BY week_number
                 ORDER BY week_number \
                 """
@@ -99,6 +116,7 @@ class AnalysisRepository(BaseRepository):
                      for row in records]
         }
 
+    @cached_result('attendance_records', 'student_week_stats')
     def get_average_attendance_for_student(self, student_id: int) -> float:
         """
         Calculates the overall average attendance rate for a specific student across all modules.
@@ -111,61 +129,75 @@ class AnalysisRepository(BaseRepository):
                    Returns 0 if no attendance records are found.
         """
         query = """
-                SELECT AVG(attendance_rate) AS overall_average_attendance
-                FROM attendance_records
+                SELECT SUM(attendance_sum) / SUM(attendance_count) AS overall_average_attendance
+                FROM student_week_stats
                 WHERE student_id = ? \
-                  AND is_active = 1 \
+                  AND attendance_count > 0 \
                 """
         result = self._execute_query(query, (student_id,), fetch_one=True)
         return round(result * 100, 2) if result is not None else 0
 
-    def get_grade_distribution(self) -> dict:
+    @cached_result('students', 'grades')
+    def get_grade_distribution(self, grade_bands: list[tuple[str, float]] | None = None) -> dict:
         """
         Calculates the distribution of average grades across all active students.
 
-        Students are categorized into predefined grade bands (Fail, Pass, Merit, etc.).
+        Students are categorized into grade bands (Fail, Pass, Merit, etc.). The
+        banding is done in SQL with a CASE-bucketed GROUP BY, so only one row per
+        non-empty band is returned to Python.
+
+        Args:
+            grade_bands (list[tuple[str, float]] | None, optional): Ordered `(label, lower_bound)` pairs,
+                where each band covers averages from its lower bound up to the next band's lower bound
+                and the first band also covers anything below. Defaults to the `GRADE_BANDS` configuration value.
 
         Returns:
             dict: A dictionary containing two lists:
                   - 'labels': List of grade band names (e.g., "Fail (<40)", "Pass (40-49)").
                   - 'data': List of the count of students falling into each grade band.
         """
-        grade_bands = {
-            'Fail (<40)': 0, 'Pass (40-49)': 0, 'Merit (50-59)': 0,
-            'Distinction (60-69)': 0, 'Excellent (70+)': 0
-        }
+        if grade_bands is None:
+            grade_bands = current_app.config['GRADE_BANDS']
+        labels = [label for label, _ in grade_bands]
+        upper_bounds = [lower_bound for _, lower_bound in grade_bands[1:]]
+
+        # Band i covers averages below the (i + 1)-th band's lower bound; the last band takes the rest.
+        band_case = " ".join(f"WHEN average_grade < ? THEN {i}" for i in range(len(upper_bounds)))
+        band_expression = f"CASE {band_case} ELSE {len(labels) - 1} END" if upper_bounds else "0"
+        query = f"""
+            SELECT {band_expression} AS band, COUNT(*) AS student_count
+            FROM (
+                SELECT g.student_id, AVG(g.grade) AS average_grade
+                FROM grades g
+                JOIN students s ON s.id = g.student_id
+                WHERE s.is_active = 1 AND g.is_active = 1
+                GROUP BY g.student_id
+            )
+            WHERE average_grade IS NOT NULL
+            GROUP BY band
+        """
+        counts = [0] * len(labels)
+        for row in self._execute_query(query, tuple(upper_bounds), fetch_all_dicts=True):
+            counts[row['band']] = row['student_count']
 
-        query = """
-                SELECT s.id, AVG(g.grade) AS average_grade
-                FROM students s
-                         JOIN grades g ON s.id = g.student_id
-                WHERE s.is_active = 1 \
-                  AND g.is_active = 1
-                GROUP BY s.id \
-                """
-        avg_grades = self._execute_query(query, fetch_all_dicts=True)
-
-        for row in avg_grades:
-            avg_grade = row['average_grade']
-            if avg_grade is None: continue  # Skip students with no grades.
-            if avg_grade < 40:
-                grade_bands['Fail (<40)'] += 1
-            elif 40 <= avg_grade < 50:
-                grade_bands['Pass (40-49)'] += 1
-            elif 50 <= avg_grade < 60:
-                grade_bands['Merit (50-59)'] += 1
-            elif 60 <= avg_grade < 70:
-                grade_bands['Distinction (60-69)'] += 1
-            else:
-                grade_bands['Excellent (70+)'] += 1
-
-        return {'labels': list(grade_bands.keys()), 'data': list(grade_bands.values())}
-
-    def get_stress_grade_correlation(self) -> dict:
+        return {'labels': labels, 'data': counts}
+
+    @cached_result('students', 'survey_responses', 'grades', 'student_week_stats')
+    def get_stress_grade_correlation(self, course_name: str | None = None, module_id: int | None = None,
+                                     limit: int | None = None) -> dict:
         """
         Retrieves data for correlating average stress levels with average grades for each student.
 
         This data can be used to plot scatter charts to visualize potential relationships.
+        Survey responses and grades are aggregated per student separately and the
+        per-student aggregates are then joined, so the work is linear in each
+        student's record count rather than the product of the two.
+
+        Args:
+            course_name (str | None, optional): Restrict to students on this course (cohort). Defaults to None (all).
+            module_id (int | None, optional): Restrict both surveys and grades to this module. Defaults to None (all).
+            limit (int | None, optional): Maximum number of data points to return, ordered by student ID.
+                                          Defaults to the `ANALYSIS_MAX_SCATTER_POINTS` configuration value.
 
         Returns:
             dict: A dictionary containing:
@@ -173,17 +205,37 @@ class AnalysisRepository(BaseRepository):
                   - 'data': List of dictionaries, each representing a data point with 'x' (average stress),
                             'y' (average grade), and 'name' (student full name).
         """
-        query = """
-                SELECT s.full_name, AVG(sr.stress_level) AS average_stress, AVG(g.grade) AS average_grade
-                FROM students s
-                         LEFT JOIN survey_responses sr ON s.id = sr.student_id AND sr.is_active = 1
-                         LEFT JOIN grades g ON s.id = g.student_id AND g.is_active = 1
-                WHERE s.is_active = 1
-                GROUP BY s.id, s.full_name
-                HAVING average_stress IS NOT NULL \
-                   AND average_grade IS NOT NULL \
-                """
-        correlation_data = self._execute_query(query, fetch_all_dicts=True)
+        if limit is None:
+            limit = current_app.config.get('ANALYSIS_MAX_SCATTER_POINTS', 5000)
+
+        module_filter = " AND module_id = ?" if module_id is not None else ""
+        module_params = (module_id,) if module_id is not None else ()
+        query = f"""
+            WITH stress AS (
+                SELECT student_id, SUM(stress_sum) * 1.0 / SUM(stress_count) AS average_stress
+                FROM student_week_stats
+                WHERE stress_count > 0{module_filter}
+                GROUP BY student_id
+            ),
+            grade_averages AS (
+                SELECT student_id, AVG(grade) AS average_grade
+                FROM grades
+                WHERE is_active = 1{module_filter}
+                GROUP BY student_id
+            )
+            SELECT s.id, s.full_name, st.average_stress, g.average_grade
+            FROM students s
+            JOIN stress st ON st.student_id = s.id
+            JOIN grade_averages g ON g.student_id = s.id
+            WHERE s.is_active = 1
+        """
+        params = module_params + module_params
+        if course_name is not None:
+            query += " AND s.course_name = ?"
+            params += (course_name,)
+        query += " ORDER BY s.id LIMIT ?"
+        params += (limit,)
+        correlation_data = self._execute_query(query, params, fetch_all_dicts=True)
 
         labels = [row['full_name'] for row in correlation_data]
         data = [{'x': row['average_stress'], 'y': row['average_grade'], 'name': row['full_name']} for row in
@@ -191,30 +243,35 @@ class AnalysisRepository(BaseRepository):
 
         return {'labels': labels, 'data': data}
 
+    @cached_result('students', 'modules', 'alerts', 'users')
     def get_dashboard_summary(self) -> dict:
         """
         Retrieves a summary of key metrics for the application dashboard.
 
         Includes counts for total active students, modules, pending alerts, and active users.
+        All four counts are computed by one statement of scalar subqueries, so the
+        dashboard costs a single round-trip.
 
         Returns:
             dict: A dictionary containing the summarized metrics.
         """
-        total_students = self._execute_query("SELECT COUNT(id) AS count FROM students WHERE is_active = 1",
-                                             fetch_one=True)
-        total_modules = self._execute_query("SELECT COUNT(id) AS count FROM modules WHERE is_active = 1",
-                                            fetch_one=True)
-        pending_alerts_count = self._execute_query(
-            "SELECT COUNT(id) AS count FROM alerts WHERE is_active = 1 AND resolved = 0", fetch_one=True)
-        total_users = self._execute_query("SELECT COUNT(id) AS count FROM users WHERE is_active = 1", fetch_one=True)
+        query = """
+            SELECT
+                (SELECT COUNT(id) FROM students WHERE is_active = 1) AS total_students,
+                (SELECT COUNT(id) FROM modules WHERE is_active = 1) AS total_modules,
+                (SELECT COUNT(id) FROM alerts WHERE is_active = 1 AND resolved = 0) AS pending_alerts_count,
+                (SELECT COUNT(id) FROM users WHERE is_active = 1) AS total_users
+        """
+        summary = self._execute_query(query, fetch_one=True, fetch_all_dicts=True) or {}
 
         return {
-            'total_students': total_students if total_students is not None else 0,
-            'total_modules': total_modules if total_modules is not None else 0,
-            'pending_alerts_count': pending_alerts_count if pending_alerts_count is not None else 0,
-            'total_users': total_users if total_users is not None else 0
+            'total_students': summary.get('total_students') or 0,
+            'total_modules': summary.get('total_modules') or 0,
+            'pending_alerts_count': summary.get('pending_alerts_count') or 0,
+            'total_users': summary.get('total_users') or 0
         }
 
+    @cached_result('attendance_records', 'student_week_stats')
     def get_overall_attendance_rate(self) -> float:
         """
         Calculates the overall average attendance rate across all active students and modules.
@@ -224,118 +281,132 @@ class AnalysisRepository(BaseRepository):
                    Returns 0 if no attendance records are found.
         """
         result = self._execute_query(
-            "SELECT AVG(attendance_rate) AS avg_rate FROM attendance_records WHERE is_active = 1", fetch_one=True)
+            "SELECT SUM(attendance_sum) / SUM(attendance_count) AS avg_rate FROM student_week_stats", fetch_one=True)
         return round(result * 100, 2) if result is not None else 0
 
+    @cached_result('submission_records')
     def get_submission_status_distribution(self) -> dict:
         """
         Calculates the distribution of assessment submission statuses (on time, late, not submitted).
 
+        Uses conditional aggregation so that all statuses are counted in a single
+        scan of `submission_records`.
+
         Returns:
             dict: A dictionary containing:
                   - 'labels': List of submission status categories.
                   - 'data': List of counts for each submission status.
         """
-        total_submissions = self._execute_query("SELECT COUNT(id) AS count FROM submission_records WHERE is_active = 1",
-                                                fetch_one=True)
-        if total_submissions == 0:
-            return {'labels': ['Submitted On Time', 'Submitted Late', 'Not Submitted'], 'data': [0, 0, 0]}
-
-        submitted_count = self._execute_query(
-            "SELECT COUNT(id) AS count FROM submission_records WHERE is_active = 1 AND is_submitted = 1 AND is_late = 0",
-            fetch_one=True)
-        late_count = self._execute_query(
-            "SELECT COUNT(id) AS count FROM submission_records WHERE is_active = 1 AND is_submitted = 1 AND is_late = 1",
-            fetch_one=True)
-        not_submitted_count = self._execute_query(
-            "SELECT COUNT(id) AS count FROM submission_records WHERE is_active = 1 AND is_submitted = 0",
-            fetch_one=True)
+        query = """
+            SELECT
+                SUM(CASE WHEN is_submitted = 1 AND is_late = 0 THEN 1 ELSE 0 END) AS on_time_count,
+                SUM(CASE WHEN is_submitted = 1 AND is_late = 1 THEN 1 ELSE 0 END) AS late_count,
+                SUM(CASE WHEN is_submitted = 0 THEN 1 ELSE 0 END) AS not_submitted_count
+            FROM submission_records
+            WHERE is_active = 1
+        """
+        counts = self._execute_query(query, fetch_one=True, fetch_all_dicts=True) or {}
 
         return {
             'labels': ['Submitted On Time', 'Submitted Late', 'Not Submitted'],
-            'data': [submitted_count if submitted_count is not None else 0,
-                     late_count if late_count is not None else 0,
-                     not_submitted_count if not_submitted_count is not None else 0]
+            'data': [counts.get('on_time_count') or 0,
+                     counts.get('late_count') or 0,
+                     counts.get('not_submitted_count') or 0]
         }
 
+    @cached_result('students', 'attendance_records', 'grades', 'survey_responses', 'student_week_stats')
     def get_high_risk_students(self, attendance_threshold: int = 70, grade_threshold: int = 40,
                                stress_threshold: int = 4) -> list[dict]:
         """
         Identifies high-risk students based on configurable thresholds for attendance, grades, and stress levels.
 
+        A single CTE-based query aggregates attendance, grades and stress once per
+        fact table, joins the per-student averages onto the students table in one
+        pass and evaluates the risk conditions in SQL.
+
         Args:
             attendance_threshold (int, optional): The attendance percentage below which a student is considered at risk. Defaults to 70.
             grade_threshold (int, optional): The average grade below which a student is considered at risk. Defaults to 40.
-            stress_threshold (int, optional): The average stress level (1-5) above which a student is considered at risk. Defaults to 4.
+            stress_threshold (int, optional): The average stress level (1-5) at or above which a student is considered at risk. Defaults to 4.
 
         Returns:
-            list[dict]: A list of dictionaries, each representing a high-risk student
-                        and a concatenated string of reasons for their risk status.
-        """
-        high_risk_students = {}
-
-        # Query for students with low attendance.
-        query_low_attendance = f"""
-            SELECT s.id, s.full_name, AVG(ar.attendance_rate) * 100 AS avg_attendance
-            FROM students s
-            JOIN attendance_records ar ON s.id = ar.student_id
-            WHERE s.is_active = 1 AND ar.is_active = 1
-            GROUP BY s.id, s.full_name
-            HAVING avg_attendance < ?
-        """
-        for row in self._execute_query(query_low_attendance, (attendance_threshold,), fetch_all_dicts=True):
-            high_risk_students[row['id']] = {'id': row['id'], 'name': row['full_name'],
-                                             'reason': f"Low attendance (<{attendance_threshold}%)"}
-
-        # Query for students with low grades.
-        query_low_grades = f"""
-            SELECT s.id, s.full_name, AVG(g.grade) AS avg_grade
-            FROM students s
-            JOIN grades g ON s.id = g.student_id
-            WHERE s.is_active = 1 AND g.is_active = 1
-            GROUP BY s.id, s.full_name
-            HAVING avg_grade < ?
+            list[dict]: A list of dictionaries, one per high-risk student, ordered by student ID, each containing:
+                        - 'id' and 'name': The student's ID and full name.
+                        - 'avg_attendance', 'avg_grade', 'avg_stress': The student's averages (None if no records).
+                        - 'flags': A dict of booleans ('low_attendance', 'low_grade', 'high_stress')
+                          indicating which thresholds were breached.
         """
-        for row in self._execute_query(query_low_grades, (grade_threshold,), fetch_all_dicts=True):
-            if row['id'] not in high_risk_students:
-                high_risk_students[row['id']] = {'id': row['id'], 'name': row['full_name'],
-                                                 'reason': f"Low average grade (<{grade_threshold})"}
-            else:
-                high_risk_students[row['id']]['reason'] += f", Low average grade (<{grade_threshold})"
-
-        # Query for students with high stress levels.
-        query_high_stress = f"""
-            SELECT s.id, s.full_name, AVG(sr.stress_level) AS avg_stress
-            FROM students s
-            JOIN survey_responses sr ON s.id = sr.student_id
-            WHERE s.is_active = 1 AND sr.is_active = 1
-            GROUP BY s.id, s.full_name
-            HAVING avg_stress >= ?
+        query = """
+            WITH attendance AS (
+                SELECT student_id, SUM(attendance_sum) / SUM(attendance_count) * 100 AS avg_attendance
+                FROM student_week_stats
+                WHERE attendance_count > 0
+                GROUP BY student_id
+            ),
+            grade_averages AS (
+                SELECT student_id, AVG(grade) AS avg_grade
+                FROM grades
+                WHERE is_active = 1
+                GROUP BY student_id
+            ),
+            stress AS (
+                SELECT student_id, SUM(stress_sum) * 1.0 / SUM(stress_count) AS avg_stress
+                FROM student_week_stats
+                WHERE stress_count > 0
+                GROUP BY student_id
+            ),
+            flagged AS (
+                SELECT s.id, s.full_name, a.avg_attendance, g.avg_grade, st.avg_stress,
+                       COALESCE(a.avg_attendance < ?, 0) AS low_attendance,
+                       COALESCE(g.avg_grade < ?, 0) AS low_grade,
+                       COALESCE(st.avg_stress >= ?, 0) AS high_stress
+                FROM students s
+                LEFT JOIN attendance a ON a.student_id = s.id
+                LEFT JOIN grade_averages g ON g.student_id = s.id
+                LEFT JOIN stress st ON st.student_id = s.id
+                WHERE s.is_active = 1
+            )
+            SELECT * FROM flagged
+            WHERE low_attendance = 1 OR low_grade = 1 OR high_stress = 1
+            ORDER BY id
         """
-        for row in self._execute_query(query_high_stress, (stress_threshold,), fetch_all_dicts=True):
-            if row['id'] not in high_risk_students:
-                high_risk_students[row['id']] = {'id': row['id'], 'name': row['full_name'],
-                                                 'reason': f"High average stress (>{stress_threshold - 1})"}
-            else:
-                high_risk_students[row['id']]['reason'] += f", High average stress (>{stress_threshold - 1})"
-
-        return list(high_risk_students.values())
-
+        rows = self._execute_query(query, (attendance_threshold, grade_threshold, stress_threshold),
+                                   fetch_all_dicts=True)
+
+        return [
+            {
+                'id': row['id'],
+                'name': row['full_name'],
+                'avg_attendance': round(row['avg_attendance'], 2) if row['avg_attendance'] is not None else None,
+                'avg_grade': round(row['avg_grade'], 2) if row['avg_grade'] is not None else None,
+                'avg_stress': round(row['avg_stress'], 2) if row['avg_stress'] is not None else None,
+                'flags': {
+                    'low_attendance': bool(row['low_attendance']),
+                    'low_grade': bool(row['low_grade']),
+                    'high_stress': bool(row['high_stress']),
+                },
+            }
+            for row in rows
+        ]
+
+    @cached_result('modules', 'survey_responses', 'student_week_stats')
     def get_stress_level_by_module(self) -> dict:
         """
         Calculates the average stress level for each active module.
 
+        Reads the per-week stress sums and counts from `student_week_stats`.
+
         Returns:
             dict: A dictionary containing two lists:
                   - 'labels': List of module titles.
                   - 'data': List of average stress levels for each corresponding module.
         """
         query = """
-                SELECT m.module_title, AVG(sr.stress_level) AS average_stress
+                SELECT m.module_title, SUM(st.stress_sum) * 1.0 / SUM(st.stress_count) AS average_stress
                 FROM modules m
-                         JOIN survey_responses sr ON m.id = sr.module_id
+                         JOIN student_week_stats st ON m.id = st.module_id
                 WHERE m.is_active = 1 \
-                  AND sr.is_active = 1
+                  AND st.stress_count > 0
                 GROUP BY m.module_title
                 ORDER BY average_stress DESC \
                 """
@@ -8,6 +8,7 @@ including calculating attendance rates and retrieving records with joined
 student and module information.
 """
 
+from collections.abc import Iterator
 import sqlite3
 from app.db_connection import get_db
 from app.models.attendance_record import AttendanceRecord
@@ -29,14 +30,21 @@ class AttendanceRecordRepository(BaseRepository):
         """
         super().__init__('attendance_records', AttendanceRecord)
 
-    def get_all_attendance_records(self) -> list[dict]:
+    def get_all_attendance_records(self, stream: bool = False, page_size: int | None = None, cursor: str | None = None) -> list[dict] | Iterator[dict] | dict:
         """
         Retrieves all active attendance records from the database, including
         associated student and module information for richer context.
 
+        Args:
+            stream (bool, optional): If True, returns a lazy iterator that fetches rows in batches
+                                     instead of building the whole list in memory. Defaults to False.
+            page_size (int, optional): If given (or if `cursor` is given), returns a single keyset-paginated page.
+            cursor (str, optional): The `next_cursor` of the previous page.
+
         Returns:
-            list[dict]: A list of dictionaries, where each dictionary represents
-                        an attendance record with joined student and module details.
+            list[dict] | Iterator[dict] | dict: A list (or, if `stream` is True, an iterator)
+                of dictionaries, where each dictionary represents an attendance record with joined student and module details.
+                When paginating, a dict with 'items' and 'next_cursor'.
         """
         query = """
             SELECT ar.id, ar.student_id, ar.module_id, ar.week_number, ar.attended_sessions, ar.total_sessions, ar.attendance_rate, ar.is_active,
@@ -46,8 +54,11 @@ class AttendanceRecordRepository(BaseRepository):
             JOIN modules m ON ar.module_id = m.id
             WHERE ar.is_active = 1
         """
-        # _execute_query handles exceptions and returns results as dictionaries due to fetch_all_dicts=True.
-        return self._execute_query(query, fetch_all_dicts=True)
+        if page_size is not None or cursor is not None:
+            return self._paginate(query, page_size=page_size, cursor=cursor, as_dicts=True)
+        # iter_query handles exceptions and yields results as dictionaries due to as_dicts=True.
+        rows = self.iter_query(query, as_dicts=True)
+        return rows if stream else list(rows)
 
     def get_attendance_record_by_id(self, record_id: int) -> AttendanceRecord | None:
         """
@@ -5,11 +5,70 @@ This module defines the `BaseRepository` class, which provides a standardized
 interface for interacting with a specific database table. It encapsulates
 common CRUD (Create, Read, Update, Delete) operations and includes robust
 error handling and transaction management using SQLite.
+
+Listing methods support keyset pagination (see `BaseRepository._paginate`):
+each page continues from the sort key of the previous page's last row, so
+deep pages cost the same as the first one, unlike OFFSET pagination.
+
+SELECTs (`_execute_query`, `iter_query`, `iter_query_json`, `_paginate`) run
+on the read-only connection from `get_read_db()`, and writes on the read-write
+connection from `get_db()`; reads made while a write transaction is open use
+the write connection, so they see its uncommitted changes. A write joins the
+caller's open `transaction()` and is committed by it, or is committed on its
+own when no unit of work is open.
+
+Every statement executed here is timed and recorded, with its row count, in
+the request's query collector (see `app/instrumentation.py`), and the latency
+of every public repository method is observed in the metrics registry (see
+`app/metrics.py`).
 """
 
+import base64
+import binascii
+import contextlib
+import json
 import sqlite3
-from app.db_connection import get_db
-from flask import current_app # Import current_app for logging
+import time
+from app.db_connection import get_db, get_read_db, mark_tables_written, transaction
+from app.instrumentation import record_query
+from app.metrics import instrument_repository_methods
+from app.utils.json_stream import iter_json_array
+from flask import current_app, g # Import current_app for logging
+
+# Compiled row mappers, keyed by (model class or None for dicts, column names).
+_ROW_MAPPERS = {}
+# Upper bound on cached query shapes; the cache is simply reset when it is reached.
+_ROW_MAPPER_CACHE_SIZE = 512
+
+
+def _compile_dict_mapper(columns):
+    """
+    Compiles a function that converts a row with the given columns to a dictionary by position.
+
+    Args:
+        columns (tuple[str]): The column names of the rows, in order.
+
+    Returns:
+        callable: A function taking one row and returning a dictionary.
+    """
+    # A dict display keeps the last of any duplicate column names, as dict(row) does.
+    items = ", ".join(f"{name!r}: row[{i}]" for i, name in enumerate(columns))
+    namespace = {}
+    exec(f"def map_row(row):\n    return {{{items}}}", namespace)
+    return namespace['map_row']
+
+def _write_scope(db):
+    """
+    Returns the unit of work a single repository write runs in.
+
+    Inside an open `transaction()` on `db` the write simply joins it (no
+    SAVEPOINT per statement); otherwise a new `transaction()` commits just
+    this write, or rolls it back if it fails.
+    """
+    if g.get('db_transaction_depths', {}).get(id(db)):
+        return contextlib.nullcontext(db)
+    return transaction(db)
+
 
 class BaseRepository:
     """
@@ -31,6 +90,13 @@ class BaseRepository:
         self.table_name = table_name
         self.model_class = model_class
 
+    def __init_subclass__(cls, **kwargs):
+        """
+        Wraps the public methods of every repository class to record their latency (see `app/metrics.py`).
+        """
+        super().__init_subclass__(**kwargs)
+        instrument_repository_methods(cls)
+
     def _execute_query(self, query, params=(), fetch_one=False, fetch_all_dicts=False):
         """
         Executes a SELECT query and returns the results, optionally mapping them to model instances.
@@ -51,34 +117,306 @@ class BaseRepository:
             Exception: If a `sqlite3.Error` occurs during query execution,
                        it's caught, logged, and re-raised as a generic Exception.
         """
-        db = get_db()
+        db = get_read_db()
         try:
+            started = time.perf_counter()
             cursor = db.execute(query, params)
             if fetch_one:
                 row = cursor.fetchone()
+                record_query(query, started, 1 if row else 0)
                 if row:
                     # If only one column is selected and not explicitly asking for dict, return the scalar value.
                     if len(row) == 1 and not fetch_all_dicts:
                         return row[0]
                     # Return as dict or model instance based on flags and model_class availability.
-                    return dict(row) if fetch_all_dicts or self.model_class is None else self.model_class.from_row(row)
+                    return self._row_mapper(cursor, fetch_all_dicts)(row)
                 return None # No row found.
             else:
                 rows = cursor.fetchall()
-                # Return as list of dicts or list of model instances.
-                return [dict(row) for row in rows] if fetch_all_dicts or self.model_class is None else [self.model_class.from_row(row) for row in rows]
+                record_query(query, started, len(rows))
+                # Return as list of dicts or list of model instances, using the mapper compiled for this query shape.
+                map_row = self._row_mapper(cursor, fetch_all_dicts)
+                return [map_row(row) for row in rows]
         except sqlite3.Error as e:
             # Log the specific database error with full traceback.
             current_app.logger.error(f"Database error in {self.table_name} repository (query): {e}", exc_info=True)
             # Re-raise as a generic exception for higher layers to handle.
             raise Exception(f"Database operation failed for {self.table_name}.")
 
+    def _map_row(self, row, as_dict=False):
+        """
+        Maps a database row to a dictionary or a model instance.
+
+        Args:
+            row (sqlite3.Row): The row to map.
+            as_dict (bool, optional): If True, returns a dictionary even if `model_class` is set. Defaults to False.
+
+        Returns:
+            Any: A dictionary, or a `model_class` instance.
+        """
+        return dict(row) if as_dict or self.model_class is None else self.model_class.from_row(row)
+
+    def _row_mapper(self, cursor, as_dict=False):
+        """
+        Returns the compiled row mapper for a cursor's query shape.
+
+        Mappers are compiled once per (target model, column names) pair and
+        cached across repositories and requests, so hydrating a result set
+        costs one positional extraction per row instead of a dictionary build
+        and a name lookup per column.
+
+        Args:
+            cursor (sqlite3.Cursor): The cursor whose rows will be mapped.
+            as_dict (bool, optional): If True, maps to dictionaries even if `model_class` is set. Defaults to False.
+
+        Returns:
+            callable: A function taking one row and returning a dictionary or a model instance.
+        """
+        description = cursor.description
+        if not isinstance(description, tuple):
+            # Not a real SQLite cursor (e.g., a test double): map by name.
+            return lambda row: self._map_row(row, as_dict)
+        model_class = None if as_dict else self.model_class
+        key = (model_class, tuple(column[0] for column in description))
+        mapper = _ROW_MAPPERS.get(key)
+        if mapper is None:
+            if model_class is None:
+                mapper = _compile_dict_mapper(key[1])
+            elif hasattr(model_class, 'compile_row_mapper'):
+                mapper = model_class.compile_row_mapper(key[1])
+            else:
+                mapper = model_class.from_row
+            if len(_ROW_MAPPERS) >= _ROW_MAPPER_CACHE_SIZE:
+                _ROW_MAPPERS.clear()
+            _ROW_MAPPERS[key] = mapper
+        return mapper
+
+    def iter_query(self, query, params=(), as_dicts=False, batch_size=None):
+        """
+        Executes a SELECT query and yields its results lazily, one mapped row at a time.
+
+        Rows are fetched from SQLite with `fetchmany` in batches of `batch_size`,
+        so only one batch is held in memory at a time, however large the result
+        set. The query runs when iteration starts, and the generator must be
+        consumed within the application context that owns the connection.
+
+        Args:
+            query (str): The SQL SELECT query string to execute.
+            params (tuple, optional): A tuple of parameters to bind to the query. Defaults to an empty tuple.
+            as_dicts (bool, optional): If True, yields dictionaries even if `model_class` is set. Defaults to False.
+            batch_size (int, optional): Rows fetched per round-trip. Defaults to the `DB_FETCH_BATCH_SIZE` setting.
+
+        Yields:
+            Any: Model instances, or dictionaries if `as_dicts` is True or `model_class` is None.
+
+        Raises:
+            Exception: If a `sqlite3.Error` occurs while executing the query or fetching rows,
+                       it's caught, logged, and re-raised as a generic Exception.
+        """
+        batch_size = batch_size or current_app.config.get('DB_FETCH_BATCH_SIZE', 500)
+        db = get_read_db()
+        try:
+            started = time.perf_counter()
+            cursor = db.execute(query, params)
+        except sqlite3.Error as e:
+            current_app.logger.error(f"Database error in {self.table_name} repository (query): {e}", exc_info=True)
+            raise Exception(f"Database operation failed for {self.table_name}.")
+        # Only the time spent in SQLite is recorded, not the time the caller spends between batches.
+        elapsed, n_rows = time.perf_counter() - started, 0
+        try:
+            map_row = self._row_mapper(cursor, as_dicts)
+            while True:
+                try:
+                    fetch_started = time.perf_counter()
+                    rows = cursor.fetchmany(batch_size)
+                    elapsed += time.perf_counter() - fetch_started
+                except sqlite3.Error as e:
+                    current_app.logger.error(f"Database error in {self.table_name} repository (fetch): {e}", exc_info=True)
+                    raise Exception(f"Database operation failed for {self.table_name}.")
+                if not rows:
+                    break
+                n_rows += len(rows)
+                for row in rows:
+                    yield map_row(row)
+        finally:
+            cursor.close() # Release the statement even if the caller stops iterating early.
+            record_query(query, rows=n_rows, duration=elapsed)
+
+    def iter_query_json(self, query, params=(), batch_size=None):
+        """
+        Executes a SELECT query and yields its results as chunks of one JSON array.
+
+        This is the zero-hydration path for read-only listings: rows are read
+        from the cursor as plain tuples (no `sqlite3.Row`, dictionary or model
+        per row) and each `fetchmany` batch is encoded in a single call (see
+        `app.utils.json_stream`). Each row becomes an object keyed by column
+        name, so the decoded output matches `iter_query(..., as_dicts=True)`.
+        Pass the generator to `json_array_response` to stream it to the client.
+
+        Args:
+            query (str): The SQL SELECT query string to execute.
+            params (tuple, optional): A tuple of parameters to bind to the query. Defaults to an empty tuple.
+            batch_size (int, optional): Rows fetched and encoded per chunk. Defaults to the `DB_FETCH_BATCH_SIZE` setting.
+
+        Yields:
+            bytes: Chunks of the JSON array, starting with `[` and ending with `]`.
+
+        Raises:
+            Exception: If a `sqlite3.Error` occurs while executing the query or fetching rows,
+                       it's caught, logged, and re-raised as a generic Exception.
+        """
+        batch_size = batch_size or current_app.config.get('DB_FETCH_BATCH_SIZE', 500)
+        cursor = get_read_db().cursor()
+        cursor.row_factory = None # Plain tuples: the column names are applied once per batch while encoding.
+        try:
+            started = time.perf_counter()
+            cursor.execute(query, params)
+        except sqlite3.Error as e:
+            cursor.close()
+            current_app.logger.error(f"Database error in {self.table_name} repository (query): {e}", exc_info=True)
+            raise Exception(f"Database operation failed for {self.table_name}.")
+        # SQLite time and rows so far; encoding and sending the chunks are not counted.
+        stats = [time.perf_counter() - started, 0]
+
+        def batches():
+            while True:
+                try:
+                    fetch_started = time.perf_counter()
+                    rows = cursor.fetchmany(batch_size)
+                    stats[0] += time.perf_counter() - fetch_started
+                except sqlite3.Error as e:
+                    current_app.logger.error(f"Database error in {self.table_name} repository (fetch): {e}", exc_info=True)
+                    raise Exception(f"Database operation failed for {self.table_name}.")
+                if not rows:
+                    return
+                stats[1] += len(rows)
+                yield rows
+
+        try:
+            yield from iter_json_array(tuple(column[0] for column in cursor.description), batches())
+        finally:
+            cursor.close() # Release the statement even if the client disconnects mid-stream.
+            record_query(query, rows=stats[1], duration=stats[0])
+
+    @staticmethod
+    def encode_cursor(values):
+        """
+        Encodes the sort key of a page's last row as an opaque continuation token.
+
+        Args:
+            values (tuple): The sort key values (e.g., `(id,)` or `(created_at, id)`).
+
+        Returns:
+            str: A URL-safe token to pass back as `cursor` to fetch the next page.
+        """
+        payload = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(token, key_size):
+        """
+        Decodes a continuation token produced by `encode_cursor`.
+
+        Args:
+            token (str): The continuation token.
+            key_size (int): The number of sort key values the token must contain.
+
+        Returns:
+            list: The sort key values.
+
+        Raises:
+            ValueError: If the token is malformed or does not match the listing's sort key.
+        """
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        except (ValueError, TypeError, AttributeError, binascii.Error):
+            raise ValueError("Invalid pagination cursor.")
+        if not isinstance(values, list) or len(values) != key_size:
+            raise ValueError("Invalid pagination cursor.")
+        return values
+
+    def _paginate(self, query, params=(), page_size=None, cursor=None, order_by=('id',), descending=False,
+                  cursor_of=None, as_dicts=False):
+        """
+        Returns one page of a listing query using keyset (cursor) pagination.
+
+        `query` is wrapped as a subquery (which SQLite flattens, so the base
+        tables' indexes are still used), filtered to rows after the cursor with
+        a row-value comparison on the `order_by` columns, ordered by them and
+        limited to `page_size` rows. One extra row is fetched to tell whether
+        there is a next page.
+
+        Args:
+            query (str): The SQL SELECT query for the whole listing, without ORDER BY or LIMIT.
+            params (tuple, optional): Parameters to bind to `query`. Defaults to an empty tuple.
+            page_size (int, optional): Rows per page. Defaults to `DB_PAGE_SIZE` and is capped at `DB_MAX_PAGE_SIZE`.
+            cursor (str, optional): The `next_cursor` of the previous page, or None for the first page.
+            order_by (tuple[str], optional): Expressions over `query`'s output columns forming a unique
+                                             sort key; the last one should be `id`. Defaults to `('id',)`.
+            descending (bool, optional): If True, pages run from the largest key down. Defaults to False.
+            cursor_of (callable, optional): Maps a raw row to its sort key values. Defaults to reading
+                                            the `order_by` columns from the row.
+            as_dicts (bool, optional): If True, returns dictionaries even if `model_class` is set. Defaults to False.
+
+        Returns:
+            dict: 'items' (the page's model instances or dictionaries) and 'next_cursor'
+                  (a token for the next page, or None on the last page).
+
+        Raises:
+            ValueError: If `page_size` is not positive or `cursor` is invalid.
+            Exception: If a `sqlite3.Error` occurs, it's caught, logged, and re-raised as a generic Exception.
+        """
+        max_page_size = current_app.config.get('DB_MAX_PAGE_SIZE', 500)
+        page_size = page_size if page_size is not None else current_app.config.get('DB_PAGE_SIZE', 50)
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1.")
+        page_size = min(page_size, max_page_size)
+        cursor_of = cursor_of or (lambda row: tuple(row[column] for column in order_by))
+
+        key = ', '.join(order_by)
+        direction = 'DESC' if descending else 'ASC'
+        page_query = f"SELECT * FROM ({query}) AS page"
+        page_params = tuple(params)
+        if cursor is not None:
+            values = self.decode_cursor(cursor, len(order_by))
+            placeholders = ', '.join('?' for _ in order_by)
+            comparison = '<' if descending else '>'
+            page_query += f" WHERE ({key}) {comparison} ({placeholders})"
+            page_params += tuple(values)
+            if len(order_by) > 1:
+                # The redundant bound on the leading column lets SQLite seek into the index
+                # (row-value comparisons over expressions are otherwise only used as a filter).
+                page_query += f" AND {order_by[0]} {comparison}= ?"
+                page_params += (values[0],)
+        page_query += f" ORDER BY {', '.join(f'{column} {direction}' for column in order_by)} LIMIT ?"
+        page_params += (page_size + 1,)
+
+        db = get_read_db()
+        try:
+            started = time.perf_counter()
+            cursor = db.execute(page_query, page_params)
+            rows = cursor.fetchall()
+            record_query(page_query, started, len(rows))
+        except sqlite3.Error as e:
+            current_app.logger.error(f"Database error in {self.table_name} repository (page): {e}", exc_info=True)
+            raise Exception(f"Database operation failed for {self.table_name}.")
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        return {
+            'items': list(map(self._row_mapper(cursor, as_dicts), rows)),
+            'next_cursor': self.encode_cursor(cursor_of(rows[-1])) if has_more else None,
+        }
+
     def _execute_insert(self, query, params=()):
         """
         Executes an INSERT query and returns the ID of the newly inserted row.
 
-        This method ensures that the transaction is committed on success
-        and rolled back on failure.
+        Inside an open `transaction()` the write joins that unit of work, and
+        the caller's outermost block commits it (or rolls it back) together
+        with its other writes. Outside one, the write is committed on its own
+        before this method returns.
 
         Args:
             query (str): The SQL INSERT query string to execute.
@@ -88,12 +426,18 @@ class BaseRepository:
             int: The `lastrowid` (ID of the newly inserted row) if the insertion is successful.
 
         Raises:
-            Exception: If a `sqlite3.Error` occurs during insertion,
-                       the transaction is rolled back, the error is logged, and re-raised.
+            Exception: If a `sqlite3.Error` occurs during insertion. The error is logged and re-raised
+                       as a generic Exception; the failed statement has no effect, and a write committed
+                       on its own is rolled back, while the caller's `transaction()` rolls back its unit
+                       of work if the exception propagates out of it.
         """
         db = get_db()
         try:
-            cursor = db.execute(query, params)
+            with _write_scope(db):
+                started = time.perf_counter()
+                cursor = db.execute(query, params)
+                record_query(query, started, cursor.rowcount)
+                mark_tables_written(self.table_name, db=db) # Invalidates cached results derived from it once committed.
             return cursor.lastrowid
         except sqlite3.Error as e:
             current_app.logger.error(f"Database error in {self.table_name} repository (insert): {e}", exc_info=True)
@@ -103,8 +447,10 @@ class BaseRepository:
         """
         Executes an UPDATE or DELETE query.
 
-        This method ensures that the transaction is committed on success
-        and rolled back on failure.
+        Inside an open `transaction()` the write joins that unit of work, and
+        the caller's outermost block commits it (or rolls it back) together
+        with its other writes. Outside one, the write is committed on its own
+        before this method returns.
 
         Args:
             query (str): The SQL UPDATE or DELETE query string to execute.
@@ -114,32 +460,78 @@ class BaseRepository:
             bool: True if the operation was successful and affected at least one row, False otherwise.
 
         Raises:
-            Exception: If a `sqlite3.Error` occurs during the operation,
-                       the transaction is rolled back, the error is logged, and re-raised.
+            Exception: If a `sqlite3.Error` occurs during the operation. The error is logged and re-raised
+                       as a generic Exception; the failed statement has no effect, and a write committed
+                       on its own is rolled back, while the caller's `transaction()` rolls back its unit
+                       of work if the exception propagates out of it.
         """
         db = get_db()
         try:
-            cursor = db.execute(query, params)
+            with _write_scope(db):
+                started = time.perf_counter()
+                cursor = db.execute(query, params)
+                record_query(query, started, cursor.rowcount)
+                if cursor.rowcount > 0:
+                    mark_tables_written(self.table_name, db=db) # Invalidates cached results derived from it once committed.
             return cursor.rowcount > 0 # Indicates if any row was affected by the operation.
         except sqlite3.Error as e:
             current_app.logger.error(f"Database error in {self.table_name} repository (update/delete): {e}", exc_info=True)
             raise Exception(f"Failed to update/delete from {self.table_name}.")
 
-    def get_all(self, include_inactive=False):
+    def get_all(self, include_inactive=False, stream=False, page_size=None, cursor=None):
         """
         Retrieves all records from the managed table.
 
         Args:
             include_inactive (bool, optional): If True, includes records marked as inactive. Defaults to False.
+            stream (bool, optional): If True, returns a lazy iterator (see `iter_all`) instead of a list. Defaults to False.
+            page_size (int, optional): If given (or if `cursor` is given), returns a single page ordered by id.
+            cursor (str, optional): The `next_cursor` of the previous page.
 
         Returns:
-            list: A list of model instances (or dictionaries if `model_class` is None)
-                  representing all active records, or all records if `include_inactive` is True.
+            list | Iterator | dict: Model instances (or dictionaries if `model_class` is None)
+                                    representing all active records, or all records if `include_inactive` is True.
+                                    When paginating, a dict with 'items' and 'next_cursor' (see `_paginate`).
+        """
+        if page_size is not None or cursor is not None:
+            query = f"SELECT * FROM {self.table_name}"
+            if not include_inactive:
+                query += " WHERE is_active = 1"
+            return self._paginate(query, page_size=page_size, cursor=cursor)
+        records = self.iter_all(include_inactive)
+        return records if stream else list(records)
+
+    def iter_all(self, include_inactive=False, batch_size=None):
+        """
+        Lazily iterates over all records in the managed table.
+
+        Args:
+            include_inactive (bool, optional): If True, includes records marked as inactive. Defaults to False.
+            batch_size (int, optional): Rows fetched per round-trip. Defaults to the `DB_FETCH_BATCH_SIZE` setting.
+
+        Yields:
+            Any: Model instances (or dictionaries if `model_class` is None), one per record.
+        """
+        query = f"SELECT * FROM {self.table_name}"
+        if not include_inactive:
+            query += " WHERE is_active = 1"
+        return self.iter_query(query, batch_size=batch_size)
+
+    def iter_all_json(self, include_inactive=False, batch_size=None):
+        """
+        Streams all records in the managed table as chunks of one JSON array, without hydrating models.
+
+        Args:
+            include_inactive (bool, optional): If True, includes records marked as inactive. Defaults to False.
+            batch_size (int, optional): Rows encoded per chunk. Defaults to the `DB_FETCH_BATCH_SIZE` setting.
+
+        Yields:
+            bytes: Chunks of the JSON array (see `iter_query_json`).
         """
         query = f"SELECT * FROM {self.table_name}"
         if not include_inactive:
             query += " WHERE is_active = 1"
-        return self._execute_query(query)
+        return self.iter_query_json(query, batch_size=batch_size)
 
     def get_by_id(self, item_id, include_inactive=False):
         """
@@ -187,3 +579,7 @@ class BaseRepository:
         """
         query = f"DELETE FROM {self.table_name} WHERE id = ?"
         return self._execute_update_delete(query, (item_id,))
+
+
+# Subclasses are instrumented by __init_subclass__; the base class's own methods are wrapped here.
+instrument_repository_methods(BaseRepository)
@@ -7,6 +7,7 @@ for interacting with the 'enrolments' table in the database. It extends
 retrieving records with joined student and module information.
 """
 
+from collections.abc import Iterator
 import sqlite3
 from app.db_connection import get_db
 from app.models.enrolment import Enrolment
@@ -29,14 +30,21 @@ class EnrolmentRepository(BaseRepository):
         """
         super().__init__('enrolments', Enrolment)
 
-    def get_all_enrolments(self) -> list[dict]:
+    def get_all_enrolments(self, stream: bool = False, page_size: int | None = None, cursor: str | None = None) -> list[dict] | Iterator[dict] | dict:
         """
         Retrieves all active enrolments from the database, including associated
         student and module information for richer context.
 
+        Args:
+            stream (bool, optional): If True, returns a lazy iterator that fetches rows in batches
+                                     instead of building the whole list in memory. Defaults to False.
+            page_size (int, optional): If given (or if `cursor` is given), returns a single keyset-paginated page.
+            cursor (str, optional): The `next_cursor` of the previous page.
+
         Returns:
-            list[dict]: A list of dictionaries, where each dictionary represents
-                        an enrolment with joined student and module details.
+            list[dict] | Iterator[dict] | dict: A list (or, if `stream` is True, an iterator)
+                of dictionaries, where each dictionary represents an enrolment with joined student and module details.
+                When paginating, a dict with 'items' and 'next_cursor'.
         """
         query = """
             SELECT e.id, e.student_id, e.module_id, e.enrol_date, e.is_active,
@@ -46,8 +54,11 @@ class EnrolmentRepository(BaseRepository):
             JOIN modules m ON e.module_id = m.id
             WHERE e.is_active = 1
         """
-        # _execute_query handles exceptions and returns results as dictionaries due to fetch_all_dicts=True.
-        return self._execute_query(query, fetch_all_dicts=True)
+        if page_size is not None or cursor is not None:
+            return self._paginate(query, page_size=page_size, cursor=cursor, as_dicts=True)
+        # iter_query handles exceptions and yields results as dictionaries due to as_dicts=True.
+        rows = self.iter_query(query, as_dicts=True)
+        return rows if stream else list(rows)
 
     def get_enrolment_by_id(self, enrolment_id: int) -> Enrolment | None:
         """
@@ -7,6 +7,7 @@ for interacting with the 'modules' table in the database. It extends
 retrieving, creating, updating, and logically deleting module records.
 """
 
+from collections.abc import Iterator
 import sqlite3
 from app.db_connection import get_db
 from app.models.module import Module
@@ -28,14 +29,22 @@ class ModuleRepository(BaseRepository):
         """
         super().__init__('modules', Module)
 
-    def get_all_modules(self) -> list[Module]:
+    def get_all_modules(self, stream: bool = False, page_size: int | None = None, cursor: str | None = None) -> list[Module] | Iterator[Module] | dict:
         """
         Retrieves all active modules from the database.
 
+        Args:
+            stream (bool, optional): If True, returns a lazy iterator that fetches rows in batches
+                                     instead of building the whole list in memory. Defaults to False.
+            page_size (int, optional): If given (or if `cursor` is given), returns a single keyset-paginated page.
+            cursor (str, optional): The `next_cursor` of the previous page.
+
         Returns:
-            list[Module]: A list of `Module` objects representing all active modules.
+            list[Module] | Iterator[Module] | dict: A list (or, if `stream` is True, an iterator)
+                of `Module` objects representing all active modules.
+                When paginating, a dict with 'items' and 'next_cursor'.
         """
-        return super().get_all()
+        return super().get_all(stream=stream, page_size=page_size, cursor=cursor)
 
     def get_module_by_id(self, module_id: int) -> Module | None:
         """
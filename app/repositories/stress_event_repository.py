@@ -7,6 +7,7 @@ for interacting with the 'stress_events' table in the database. It extends
 retrieving, creating, updating, and logically deleting event records.
 """
 
+from collections.abc import Iterator
 import sqlite3
 from app.db_connection import get_db
 from app.models.stress_event import StressEvent
@@ -29,14 +30,22 @@ class StressEventRepository(BaseRepository):
         """
         super().__init__('stress_events', StressEvent)
 
-    def get_all_stress_events(self) -> list[StressEvent]:
+    def get_all_stress_events(self, stream: bool = False, page_size: int | None = None, cursor: str | None = None) -> list[StressEvent] | Iterator[StressEvent] | dict:
         """
         Retrieves all active stress events from the database.
 
+        Args:
+            stream (bool, optional): If True, returns a lazy iterator that fetches rows in batches
+                                     instead of building the whole list in memory. Defaults to False.
+            page_size (int, optional): If given (or if `cursor` is given), returns a single keyset-paginated page.
+            cursor (str, optional): The `next_cursor` of the previous page.
+
         Returns:
-            list[StressEvent]: A list of `StressEvent` objects representing all active events.
+            list[StressEvent] | Iterator[StressEvent] | dict: A list (or, if `stream` is True, an iterator)
+                of `StressEvent` objects representing all active events.
+                When paginating, a dict with 'items' and 'next_cursor'.
         """
-        return super().get_all()
+        return super().get_all(stream=stream, page_size=page_size, cursor=cursor)
 
     def get_stress_event_by_id(self, event_id: int) -> StressEvent | None:
         """
@@ -7,8 +7,11 @@ for interacting with the 'students' table in the database. It extends
 retrieving student details and their associated enrolments.
 """
 
+from collections.abc import Iterator
 import sqlite3
-from app.db_connection import get_db
+import time
+from app.db_connection import get_read_db
+from app.instrumentation import record_query
 from app.models.student import Student
 from .base_repository import BaseRepository
 from flask import current_app # Import current_app for logging
@@ -29,17 +32,23 @@ class StudentRepository(BaseRepository):
         """
         super().__init__('students', Student)
 
-    def get_all_students(self, include_inactive: bool = False) -> list[Student]:
+    def get_all_students(self, include_inactive: bool = False, stream: bool = False, page_size: int | None = None, cursor: str | None = None) -> list[Student] | Iterator[Student] | dict:
         """
         Retrieves all active students from the database.
 
         Args:
             include_inactive (bool, optional): If True, includes students marked as inactive. Defaults to False.
+            stream (bool, optional): If True, returns a lazy iterator that fetches rows in batches
+                                     instead of building the whole list in memory. Defaults to False.
+            page_size (int, optional): If given (or if `cursor` is given), returns a single keyset-paginated page.
+            cursor (str, optional): The `next_cursor` of the previous page.
 
         Returns:
-            list[Student]: A list of `Student` objects representing all active (or all) students.
+            list[Student] | Iterator[Student] | dict: A list (or, if `stream` is True, an iterator)
+                of `Student` objects representing all active (or all) students.
+                When paginating, a dict with 'items' and 'next_cursor'.
         """
-        return super().get_all(include_inactive)
+        return super().get_all(include_inactive, stream=stream, page_size=page_size, cursor=cursor)
 
     def get_student_by_id(self, student_id: int, include_inactive: bool = False) -> Student | None:
         """
@@ -85,13 +94,15 @@ class StudentRepository(BaseRepository):
             JOIN modules m ON e.module_id = m.id
             WHERE e.student_id = ? AND e.is_active = 1
         """
-        # This method directly uses get_db() and db.execute(), so it needs its own try-except.
+        # This method directly uses get_read_db() and db.execute(), so it needs its own try-except.
         # The _execute_query method in BaseRepository would also work here.
         try:
-            db = get_db()
-            cursor = db.execute(query, (student_id,))
+            db = get_read_db()
+            started = time.perf_counter()
+            rows = db.execute(query, (student_id,)).fetchall()
+            record_query(query, started, len(rows))
             enrolments = []
-            for row in cursor.fetchall():
+            for row in rows:
                 enrolments.append({
                     'id': row['id'],
                     'module_id': row['module_id'],
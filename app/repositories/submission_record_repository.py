@@ -7,6 +7,7 @@ for interacting with the 'submission_records' table in the database. It extends
 retrieving records with joined student and module information.
 """
 
+from collections.abc import Iterator
 import sqlite3
 from app.db_connection import get_db
 from app.models.submission_record import SubmissionRecord
@@ -28,14 +29,21 @@ class SubmissionRecordRepository(BaseRepository):
         """
         super().__init__('submission_records', SubmissionRecord)
 
-    def get_all_submission_records(self) -> list[dict]:
+    def get_all_submission_records(self, stream: bool = False, page_size: int | None = None, cursor: str | None = None) -> list[dict] | Iterator[dict] | dict:
         """
         Retrieves all active submission records from the database, including
         associated student and module information for richer context.
 
+        Args:
+            stream (bool, optional): If True, returns a lazy iterator that fetches rows in batches
+                                     instead of building the whole list in memory. Defaults to False.
+            page_size (int, optional): If given (or if `cursor` is given), returns a single keyset-paginated page.
+            cursor (str, optional): The `next_cursor` of the previous page.
+
         Returns:
-            list[dict]: A list of dictionaries, where each dictionary represents
-                        a submission record with joined student and module details.
+            list[dict] | Iterator[dict] | dict: A list (or, if `stream` is True, an iterator)
+                of dictionaries, where each dictionary represents a submission record with joined student and module details.
+                When paginating, a dict with 'items' and 'next_cursor'.
         """
         query = """
             SELECT sr.id, sr.student_id, sr.module_id, sr.assessment_name, sr.due_date, sr.submitted_date, sr.is_submitted, sr.is_late, sr.is_active,
@@ -45,8 +53,11 @@ class SubmissionRecordRepository(BaseRepository):
             JOIN modules m ON sr.module_id = m.id
             WHERE sr.is_active = 1
         """
-        # _execute_query handles exceptions and returns results as dictionaries due to fetch_all_dicts=True.
-        return self._execute_query(query, fetch_all_dicts=True)
+        if page_size is not None or cursor is not None:
+            return self._paginate(query, page_size=page_size, cursor=cursor, as_dicts=True)
+        # iter_query handles exceptions and yields results as dictionaries due to as_dicts=True.
+        rows = self.iter_query(query, as_dicts=True)
+        return rows if stream else list(rows)
 
     def get_submission_record_by_id(self, record_id: int) -> SubmissionRecord | None:
         """
@@ -8,13 +8,16 @@ logic to automatically check for and create stress events and alerts based
 on the submitted survey data.
 """
 
+from collections.abc import Iterator
 import sqlite3
-from app.db_connection import get_db
+import time
+from app.db_connection import get_db, mark_tables_written, transaction
 from app.models.survey_response import SurveyResponse
 from app.models.stress_event import StressEvent # Imported for type hinting/context
 from app.models.alert import Alert # Imported for type hinting/context
 from datetime import datetime, timezone
 from .base_repository import BaseRepository
+from app.instrumentation import record_query, timed_execute
 from flask import current_app # Import current_app for logging
 
 class SurveyResponseRepository(BaseRepository):
@@ -34,14 +37,21 @@ class SurveyResponseRepository(BaseRepository):
         """
         super().__init__('survey_responses', SurveyResponse)
 
-    def get_all_survey_responses(self) -> list[dict]:
+    def get_all_survey_responses(self, stream: bool = False, page_size: int | None = None, cursor: str | None = None) -> list[dict] | Iterator[dict] | dict:
         """
         Retrieves all active survey responses from the database, including
         associated student and module information for richer context.
 
+        Args:
+            stream (bool, optional): If True, returns a lazy iterator that fetches rows in batches
+                                     instead of building the whole list in memory. Defaults to False.
+            page_size (int, optional): If given (or if `cursor` is given), returns a single keyset-paginated page.
+            cursor (str, optional): The `next_cursor` of the previous page.
+
         Returns:
-            list[dict]: A list of dictionaries, where each dictionary represents
-                        a survey response with joined student and module details.
+            list[dict] | Iterator[dict] | dict: A list (or, if `stream` is True, an iterator)
+                of dictionaries, where each dictionary represents a survey response with joined student and module details.
+                When paginating, a dict with 'items' and 'next_cursor'.
         """
         query = """
             SELECT 
@@ -54,8 +64,11 @@ class SurveyResponseRepository(BaseRepository):
             LEFT JOIN modules m ON sr.module_id = m.id
             WHERE sr.is_active = 1
         """
-        # _execute_query handles exceptions and returns results as dictionaries due to fetch_all_dicts=True.
-        return self._execute_query(query, fetch_all_dicts=True)
+        if page_size is not None or cursor is not None:
+            return self._paginate(query, page_size=page_size, cursor=cursor, as_dicts=True)
+        # iter_query handles exceptions and yields results as dictionaries due to as_dicts=True.
+        rows = self.iter_query(query, as_dicts=True)
+        return rows if stream else list(rows)
 
     def get_survey_response_by_id(self, response_id: int) -> SurveyResponse | None:
         """
@@ -74,7 +87,8 @@ class SurveyResponseRepository(BaseRepository):
         Creates a new survey response in the database.
 
         After creation, it automatically triggers a check for stress events and alerts
-        based on the new response's stress level.
+        based on the new response's stress level. The response and anything created
+        for it are committed together, as one unit of work.
 
         Args:
             student_id (int): The ID of the student submitting the response.
@@ -92,13 +106,122 @@ class SurveyResponseRepository(BaseRepository):
             INSERT INTO survey_responses (student_id, module_id, week_number, stress_level, hours_slept, mood_comment, created_at, is_active) 
             VALUES (?, ?, ?, ?, ?, ?, ?, 1)
         """
-        response_id = self._execute_insert(query, (student_id, module_id, week_number, stress_level, hours_slept, mood_comment, created_at))
-        new_survey = self.get_survey_response_by_id(response_id)
-        if new_survey:
-            # Trigger the check for stress events and alerts.
-            self._check_for_stress_events_and_alerts(new_survey)
+        with transaction():
+            response_id = self._execute_insert(query, (student_id, module_id, week_number, stress_level, hours_slept, mood_comment, created_at))
+            new_survey = self.get_survey_response_by_id(response_id)
+            if new_survey:
+                # Trigger the check for stress events and alerts.
+                self._check_for_stress_events_and_alerts(new_survey)
         return new_survey
 
+    def create_survey_responses_bulk(self, responses: list[dict], threshold: int = 4) -> dict:
+        """
+        Creates many survey responses at once (e.g., a weekly survey wave) in a single transaction.
+
+        Rows are inserted with `executemany`, then stress events and alerts for
+        the whole batch are detected with two set-based `INSERT ... SELECT`
+        statements instead of the per-row checks done by
+        `_check_for_stress_events_and_alerts`:
+        1. Every new response with a stress level at or above `threshold` gets a `StressEvent`.
+        2. Every new high-stress response whose student also reported high stress
+           in the same module the previous week (self-join on `week_number - 1`,
+           matching responses already stored or in the same batch) raises one
+           `Alert` per student and week, unless an active alert already exists.
+
+        Args:
+            responses (list[dict]): The responses to create. Each dictionary must contain
+                                    'student_id', 'week_number' and 'stress_level', and may
+                                    contain 'module_id', 'hours_slept' and 'mood_comment'.
+            threshold (int, optional): The stress level threshold (1-5) to trigger events/alerts. Defaults to 4.
+
+        Returns:
+            dict: The number of 'survey_responses', 'stress_events' and 'alerts' created.
+
+        Raises:
+            Exception: If a database error occurs; the whole batch is rolled back.
+        """
+        created_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (r['student_id'], r.get('module_id'), r['week_number'], r['stress_level'],
+             r.get('hours_slept'), r.get('mood_comment'), created_at)
+            for r in responses
+        ]
+        counts = {'survey_responses': 0, 'stress_events': 0, 'alerts': 0}
+        if not rows:
+            return counts
+
+        db = get_db()
+        try:
+            # One commit for the whole wave. The write lock is taken before the watermark is read, so no
+            # other writer can commit in between: the INSERT cannot hit SQLITE_BUSY_SNAPSHOT, and the ids
+            # above the watermark are all ours.
+            with transaction(db, immediate=True):
+                # AUTOINCREMENT ids only grow, so the batch is exactly the rows above the current maximum.
+                watermark_query = "SELECT COALESCE(MAX(id), 0) FROM survey_responses"
+                started = time.perf_counter()
+                watermark = db.execute(watermark_query).fetchone()[0]
+                record_query(watermark_query, started, 1)
+                cursor = timed_execute(db, """
+                    INSERT INTO survey_responses (student_id, module_id, week_number, stress_level, hours_slept, mood_comment, created_at, is_active)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+                """, rows, many=True)
+                counts['survey_responses'] = cursor.rowcount
+
+                # 1. Stress events for every high-stress response in the batch.
+                cursor = timed_execute(db, """
+                    INSERT INTO stress_events (student_id, module_id, survey_response_id, week_number, stress_level, cause_category, description, source, created_at, is_active)
+                    SELECT sr.student_id, sr.module_id, sr.id, sr.week_number, sr.stress_level, 'system_detected',
+                           'High stress reported (level ' || sr.stress_level || ') in week ' || sr.week_number || '.',
+                           'survey_response_system', ?, 1
+                    FROM survey_responses sr
+                    WHERE sr.id > ? AND sr.is_active = 1 AND sr.stress_level >= ?
+                      AND NOT EXISTS (SELECT 1 FROM stress_events se WHERE se.survey_response_id = sr.id)
+                """, (created_at, watermark, threshold))
+                counts['stress_events'] = cursor.rowcount
+
+                # 2. Alerts for consecutive high-stress weeks, at most one per student and week.
+                # The batch is materialized first so the previous-week lookup is driven by the new rows only;
+                # the unary + keeps the planner on the (student_id, module_id, week_number) index for `prev`.
+                cursor = timed_execute(db, """
+                    INSERT INTO alerts (student_id, module_id, week_number, reason, created_at, resolved, is_active)
+                    WITH batch AS MATERIALIZED (
+                        SELECT id, student_id, module_id, week_number FROM survey_responses
+                        WHERE id > ? AND is_active = 1 AND stress_level >= ?
+                    ),
+                    consecutive AS (
+                        SELECT b.student_id, b.module_id, b.week_number,
+                               ROW_NUMBER() OVER (PARTITION BY b.student_id, b.week_number ORDER BY b.id) AS rn
+                        FROM batch b
+                        JOIN survey_responses prev
+                          ON prev.student_id = b.student_id
+                         AND prev.module_id = b.module_id
+                         AND prev.week_number = b.week_number - 1
+                        WHERE prev.is_active = 1 AND +prev.stress_level >= ?
+                    )
+                    SELECT student_id, module_id, week_number,
+                           'Stress level >= ' || ? || ' for two consecutive weeks (' || (week_number - 1) || ' and ' || week_number ||
+                           ') for student ' || student_id || ' in module ' || module_id || '.',
+                           ?, 0, 1
+                    FROM consecutive
+                    WHERE rn = 1
+                      AND NOT EXISTS (
+                          SELECT 1 FROM alerts a
+                          WHERE a.student_id = consecutive.student_id AND a.week_number = consecutive.week_number AND a.is_active = 1
+                      )
+                """, (watermark, threshold, threshold, threshold, created_at))
+                counts['alerts'] = cursor.rowcount
+                mark_tables_written('survey_responses', 'stress_events', 'alerts', db=db)
+        except sqlite3.Error as e:
+            # The unit of work has rolled back, so nothing from a partially ingested batch is kept.
+            current_app.logger.error(f"Database error in create_survey_responses_bulk: {e}", exc_info=True)
+            raise Exception("Failed to bulk insert survey responses.")
+
+        current_app.logger.info(
+            f"Bulk ingested {counts['survey_responses']} survey responses "
+            f"({counts['stress_events']} stress events, {counts['alerts']} alerts)."
+        )
+        return counts
+
     def update_survey_response(self, response_id: int, student_id: int, module_id: int | None, week_number: int, stress_level: int, hours_slept: float, mood_comment: str | None) -> SurveyResponse:
         """
         Updates an existing survey response in the database.
@@ -159,52 +282,64 @@ class SurveyResponseRepository(BaseRepository):
         """
         db = get_db()
         try:
-            # 1. Check for StressEvent: If stress level is high, record a stress event.
-            if survey_response.stress_level >= threshold:
-                # Check if an event for this survey response already exists to prevent duplicates.
-                cursor = db.execute("SELECT id FROM stress_events WHERE survey_response_id = ?", (survey_response.id,))
-                existing_event = cursor.fetchone()
-                if not existing_event:
-                    stress_event_created_at = datetime.now(timezone.utc).isoformat()
-                    db.execute(
-                        "INSERT INTO stress_events (student_id, module_id, survey_response_id, week_number, stress_level, cause_category, description, source, created_at, is_active) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1)",
-                        (survey_response.student_id, survey_response.module_id, survey_response.id, survey_response.week_number, survey_response.stress_level, "system_detected", f"High stress reported (level {survey_response.stress_level}) in week {survey_response.week_number}.", "survey_response_system", stress_event_created_at)
-                    )
-                    db.commit()
-                    current_app.logger.info(f"Stress event created for student {survey_response.student_id} (level {survey_response.stress_level}).")
-
-            # 2. Check for Alerts: Identify consecutive high stress levels.
-            # Retrieve the survey response from the previous week for the same student and module.
-            cursor = db.execute("""
-                SELECT week_number, stress_level FROM survey_responses
-                WHERE student_id = ? AND module_id = ? AND week_number = ? AND is_active = 1
-            """, (survey_response.student_id, survey_response.module_id, survey_response.week_number - 1))
-            previous_week_survey_row = cursor.fetchone()
-
-            # If both current and previous week's stress levels are above the threshold, create an alert.
-            if previous_week_survey_row and \
-               previous_week_survey_row['stress_level'] >= threshold and \
-               survey_response.stress_level >= threshold:
-
-                # Check if an alert for this specific week already exists to prevent duplicates.
-                cursor = db.execute("SELECT id FROM alerts WHERE student_id = ? AND week_number = ? AND is_active = 1", (survey_response.student_id, survey_response.week_number))
-                existing_alert = cursor.fetchone()
-
-                if not existing_alert:
-                    alert_created_at = datetime.now(timezone.utc).isoformat()
-                    alert_reason = (
-                        f"Stress level >= {threshold} for two consecutive weeks "
-                        f"({survey_response.week_number - 1} and {survey_response.week_number}) "
-                        f"for student {survey_response.student_id} in module {survey_response.module_id}."
-                    )
-                    db.execute(
-                        "INSERT INTO alerts (student_id, module_id, week_number, reason, created_at, resolved, is_active) VALUES (?, ?, ?, ?, ?, 0, 1)",
-                        (survey_response.student_id, survey_response.module_id, survey_response.week_number, alert_reason, alert_created_at)
-                    )
-                    db.commit()
-                    current_app.logger.warning(f"Alert created for student {survey_response.student_id}: Consecutive high stress detected.")
+            # The response and anything created for it are written as one unit of work:
+            # a single commit here, or part of the caller's transaction if one is open.
+            with transaction(db):
+                # 1. Check for StressEvent: If stress level is high, record a stress event.
+                if survey_response.stress_level >= threshold:
+                    # Check if an event for this survey response already exists to prevent duplicates.
+                    event_query = "SELECT id FROM stress_events WHERE survey_response_id = ?"
+                    started = time.perf_counter()
+                    existing_event = db.execute(event_query, (survey_response.id,)).fetchone()
+                    record_query(event_query, started, 1 if existing_event else 0)
+                    if not existing_event:
+                        stress_event_created_at = datetime.now(timezone.utc).isoformat()
+                        timed_execute(db,
+                            "INSERT INTO stress_events (student_id, module_id, survey_response_id, week_number, stress_level, cause_category, description, source, created_at, is_active) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1)",
+                            (survey_response.student_id, survey_response.module_id, survey_response.id, survey_response.week_number, survey_response.stress_level, "system_detected", f"High stress reported (level {survey_response.stress_level}) in week {survey_response.week_number}.", "survey_response_system", stress_event_created_at)
+                        )
+                        mark_tables_written('stress_events', db=db)
+                        current_app.logger.info(f"Stress event created for student {survey_response.student_id} (level {survey_response.stress_level}).")
+
+                # 2. Check for Alerts: Identify consecutive high stress levels.
+                # Retrieve the survey response from the previous week for the same student and module.
+                previous_week_query = """
+                    SELECT week_number, stress_level FROM survey_responses
+                    WHERE student_id = ? AND module_id = ? AND week_number = ? AND is_active = 1
+                """
+                started = time.perf_counter()
+                previous_week_survey_row = db.execute(
+                    previous_week_query,
+                    (survey_response.student_id, survey_response.module_id, survey_response.week_number - 1)
+                ).fetchone()
+                record_query(previous_week_query, started, 1 if previous_week_survey_row else 0)
+
+                # If both current and previous week's stress levels are above the threshold, create an alert.
+                if previous_week_survey_row and \
+                   previous_week_survey_row['stress_level'] >= threshold and \
+                   survey_response.stress_level >= threshold:
+
+                    # Check if an alert for this specific week already exists to prevent duplicates.
+                    alert_query = "SELECT id FROM alerts WHERE student_id = ? AND week_number = ? AND is_active = 1"
+                    started = time.perf_counter()
+                    existing_alert = db.execute(alert_query, (survey_response.student_id, survey_response.week_number)).fetchone()
+                    record_query(alert_query, started, 1 if existing_alert else 0)
+
+                    if not existing_alert:
+                        alert_created_at = datetime.now(timezone.utc).isoformat()
+                        alert_reason = (
+                            f"Stress level >= {threshold} for two consecutive weeks "
+                            f"({survey_response.week_number - 1} and {survey_response.week_number}) "
+                            f"for student {survey_response.student_id} in module {survey_response.module_id}."
+                        )
+                        timed_execute(db,
+                            "INSERT INTO alerts (student_id, module_id, week_number, reason, created_at, resolved, is_active) VALUES (?, ?, ?, ?, ?, 0, 1)",
+                            (survey_response.student_id, survey_response.module_id, survey_response.week_number, alert_reason, alert_created_at)
+                        )
+                        mark_tables_written('alerts', db=db)
+                        current_app.logger.warning(f"Alert created for student {survey_response.student_id}: Consecutive high stress detected.")
         except sqlite3.Error as e:
-            db.rollback() # Rollback changes if any database error occurs during this process.
+            # The unit of work has already rolled back (or rolled back to its savepoint).
             current_app.logger.error(f"Database error in _check_for_stress_events_and_alerts: {e}", exc_info=True)
             raise Exception("Error checking for stress events and alerts.") # Re-raise for higher-level handling.
 
@@ -8,10 +8,14 @@ retrieving users by username, creating new users, updating their details,
 and resetting passwords.
 """
 
+from collections.abc import Iterator
 import sqlite3
-from app.db_connection import get_db
+from app.db_connection import get_db, mark_tables_written, transaction
 from app.models.user import User
-from datetime import datetime
+from app.utils.passwords import hash_passwords
+from app.instrumentation import timed_execute
+from datetime import datetime, timezone
+from flask import current_app # Import current_app for logging
 from .base_repository import BaseRepository
 
 class UserRepository(BaseRepository):
@@ -30,17 +34,23 @@ class UserRepository(BaseRepository):
         """
         super().__init__('users', User)
 
-    def get_all_users(self, include_inactive: bool = False) -> list[User]:
+    def get_all_users(self, include_inactive: bool = False, stream: bool = False, page_size: int | None = None, cursor: str | None = None) -> list[User] | Iterator[User] | dict:
         """
         Retrieves all active users from the database.
 
         Args:
             include_inactive (bool, optional): If True, includes users marked as inactive. Defaults to False.
+            stream (bool, optional): If True, returns a lazy iterator that fetches rows in batches
+                                     instead of building the whole list in memory. Defaults to False.
+            page_size (int, optional): If given (or if `cursor` is given), returns a single keyset-paginated page.
+            cursor (str, optional): The `next_cursor` of the previous page.
 
         Returns:
-            list[User]: A list of `User` objects representing all active (or all) users.
+            list[User] | Iterator[User] | dict: A list (or, if `stream` is True, an iterator)
+                of `User` objects representing all active (or all) users.
+                When paginating, a dict with 'items' and 'next_cursor'.
         """
-        return super().get_all(include_inactive)
+        return super().get_all(include_inactive, stream=stream, page_size=page_size, cursor=cursor)
 
     def get_user_by_id(self, user_id: int, include_inactive: bool = False) -> User | None:
         """
@@ -93,6 +103,52 @@ class UserRepository(BaseRepository):
         user_id = self._execute_insert(query, (new_user.username, new_user.password_hash, new_user.role, new_user.student_id, new_user.created_at.isoformat(), new_user.is_active))
         return self.get_user_by_id(user_id, include_inactive=True)
 
+    def create_users_bulk(self, users: list[dict], workers: int | None = None) -> int:
+        """
+        Creates many user accounts at once (e.g., a whole student intake) in a single transaction.
+
+        Every user gets a real, individually salted hash of their own password.
+        The passwords are hashed before the transaction starts, in parallel
+        across a process pool (see `app.utils.passwords.hash_passwords`), with
+        the configured `PASSWORD_HASH_METHOD`; the rows are then inserted with
+        one `executemany`.
+
+        Args:
+            users (list[dict]): The users to create. Each dictionary must contain 'username'
+                                and 'password', and may contain 'role' (defaults to 'user')
+                                and 'student_id'.
+            workers (int, optional): Hashing processes. Defaults to the `PASSWORD_HASH_WORKERS` setting.
+
+        Returns:
+            int: The number of users created.
+
+        Raises:
+            Exception: If a database error occurs (e.g., a duplicate username); no user from the batch is kept.
+        """
+        if not users:
+            return 0
+        password_hashes = hash_passwords((u['password'] for u in users), workers=workers)
+        created_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (u['username'], password_hash, u.get('role', 'user'), u.get('student_id'), created_at)
+            for u, password_hash in zip(users, password_hashes)
+        ]
+
+        db = get_db()
+        try:
+            with transaction(db):
+                cursor = timed_execute(
+                    db, "INSERT INTO users (username, password_hash, role, student_id, created_at, is_active) VALUES (?, ?, ?, ?, ?, 1)",
+                    rows, many=True)
+                created = cursor.rowcount
+                mark_tables_written('users', db=db)
+        except sqlite3.Error as e:
+            current_app.logger.error(f"Database error in create_users_bulk: {e}", exc_info=True)
+            raise Exception("Failed to bulk insert users.")
+
+        current_app.logger.info(f"Bulk provisioned {created} users.")
+        return created
+
     def update_user(self, user_id: int, username: str, role: str, is_active: bool) -> User:
         """
         Updates an existing user's information in the database.
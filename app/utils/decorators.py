@@ -5,3 +5,32 @@ This module provides custom decorators that can be applied to Flask view functio
 to enforce specific requirements, such as role-based access control, leveraging
 Flask-JWT-Extended for authentication context.
 """
+
+from functools import wraps
+from flask import jsonify
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+
+def role_required(*roles):
+    """
+    Decorator restricting a view to users whose JWT carries one of the given roles.
+
+    The role is read from the token's `role` claim. Requests without a valid
+    JWT are rejected by Flask-JWT-Extended (401); requests with a valid token
+    but another role receive a 403 JSON response.
+
+    Args:
+        *roles (str): The roles allowed to access the view (e.g., 'admin', 'course_director').
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            verify_jwt_in_request()
+            if get_jwt().get('role') not in roles:
+                return jsonify({"msg": "You do not have permission to access this resource."}), 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
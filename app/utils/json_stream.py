@@ -0,0 +1,77 @@
+"""
+Streaming JSON serialization for read-only listings.
+
+This module encodes query results straight from a SQLite cursor into a JSON
+array, chunk by chunk, without hydrating models or building the whole
+response in memory. Rows are fetched in batches, each batch is encoded in a
+single call and the encoded chunks are yielded as bytes, ready to be handed
+to `json_array_response`. `orjson` is used when it is installed; otherwise
+the standard library `json` module produces the same output.
+"""
+
+import json
+from flask import Response, stream_with_context
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library encoder.
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """
+    Encodes `obj` as compact UTF-8 JSON bytes, with orjson when it is available.
+
+    Args:
+        obj: A JSON-serializable object (rows hold only SQLite scalar types).
+
+    Returns:
+        bytes: The encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def iter_json_array(columns, batches):
+    """
+    Encodes batches of row tuples as the chunks of one JSON array of objects.
+
+    Each batch is encoded with a single `dumps` call; the array brackets and
+    the commas between batches are written around the encoded chunks, so the
+    concatenation of everything yielded is one valid JSON array.
+
+    Args:
+        columns (tuple[str]): The column names, used as object keys, in row order.
+        batches (Iterable[list[tuple]]): Lists of row tuples (e.g., from `cursor.fetchmany`).
+
+    Yields:
+        bytes: Chunks of the JSON array, starting with `[` and ending with `]`.
+    """
+    yield b'['
+    separator = b''
+    for rows in batches:
+        if not rows:
+            continue
+        # Encode the batch as an array and strip its brackets to splice it into the outer array.
+        yield separator + dumps([dict(zip(columns, row)) for row in rows])[1:-1]
+        separator = b','
+    yield b']'
+
+
+def json_array_response(chunks, status=200):
+    """
+    Wraps encoded JSON chunks in a streamed `application/json` response.
+
+    The request context is kept alive while the response streams, so the
+    chunks may come from a generator that still reads from the request's
+    database connection (e.g., `BaseRepository.iter_query_json`).
+
+    Args:
+        chunks (Iterable[bytes]): The encoded JSON chunks.
+        status (int, optional): The HTTP status code. Defaults to 200.
+
+    Returns:
+        Response: The streaming Flask response.
+    """
+    return Response(stream_with_context(chunks), status=status, mimetype='application/json')
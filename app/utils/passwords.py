@@ -0,0 +1,75 @@
+"""
+Password hashing helpers.
+
+This module wraps Werkzeug's `generate_password_hash` so that the hashing
+method (and with it the hashing cost) comes from the `PASSWORD_HASH_METHOD`
+setting, and provides `hash_passwords` for hashing many passwords at once
+across a process pool, as used when provisioning a whole intake of users or
+seeding large demo data sets. Hashes of any method are verified by
+`check_password_hash`, so changing the method only affects new hashes.
+"""
+
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash
+
+# Werkzeug's default (and the production) method: scrypt with n=2**15, r=8, p=1.
+DEFAULT_PASSWORD_HASH_METHOD = 'scrypt'
+
+# Below this many passwords, starting worker processes costs more than it saves.
+PARALLEL_HASH_MIN_PASSWORDS = 16
+
+
+def password_hash_method() -> str:
+    """
+    Returns the configured hashing method, or Werkzeug's default outside an application context.
+    """
+    if has_app_context():
+        return current_app.config.get('PASSWORD_HASH_METHOD') or DEFAULT_PASSWORD_HASH_METHOD
+    return DEFAULT_PASSWORD_HASH_METHOD
+
+
+def hash_password(password: str, method: str | None = None) -> str:
+    """
+    Hashes a plain-text password with a fresh salt.
+
+    Args:
+        password (str): The plain-text password to hash.
+        method (str, optional): A Werkzeug method string (e.g., 'scrypt' or 'pbkdf2:sha256:600000').
+                                Defaults to the `PASSWORD_HASH_METHOD` setting.
+
+    Returns:
+        str: The password hash, in Werkzeug's `method$salt$hash` format.
+    """
+    return generate_password_hash(password, method=method or password_hash_method())
+
+
+def hash_passwords(passwords, method: str | None = None, workers: int | None = None) -> list[str]:
+    """
+    Hashes many plain-text passwords, each with its own salt, in parallel.
+
+    Password hashing is CPU-bound by design, so the work is spread over a
+    pool of `workers` processes. Small batches, or a single worker, are
+    hashed in the calling process instead.
+
+    Args:
+        passwords (Iterable[str]): The plain-text passwords to hash.
+        method (str, optional): A Werkzeug method string. Defaults to the `PASSWORD_HASH_METHOD` setting.
+        workers (int, optional): The number of worker processes. Defaults to the `PASSWORD_HASH_WORKERS`
+                                 setting, or the number of CPUs.
+
+    Returns:
+        list[str]: The password hashes, in the order of `passwords`.
+    """
+    passwords = list(passwords)
+    hash_one = functools.partial(generate_password_hash, method=method or password_hash_method())
+    if workers is None:
+        workers = current_app.config.get('PASSWORD_HASH_WORKERS') if has_app_context() else None
+    workers = min(workers or os.cpu_count() or 1, len(passwords))
+    if workers <= 1 or len(passwords) < PARALLEL_HASH_MIN_PASSWORDS:
+        return [hash_one(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Hand out passwords in a few chunks per worker to keep inter-process overhead low.
+        return list(executor.map(hash_one, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
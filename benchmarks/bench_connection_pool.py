@@ -0,0 +1,74 @@
+"""
+Benchmark: requests/sec with and without SQLite connection pooling.
+
+Builds a seeded throwaway database, registers a small JSON endpoint that
+performs a typical single-row repository lookup, and drives it through the
+Flask test client with pooling disabled and then enabled.
+
+Usage:
+    python benchmarks/bench_connection_pool.py [--requests N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import jsonify
+from app import create_app
+from app.db_connection import dispose_pool
+from app.repositories.student_repository import student_repository
+from utils.seed_data import seed_data
+
+
+def build_app(db_path):
+    """Creates a testing app pointed at `db_path` with a benchmark endpoint."""
+    app = create_app('testing')
+    app.config['DATABASE_PATH'] = db_path
+
+    @app.route('/bench/student/<int:student_id>')
+    def bench_student(student_id):
+        student = student_repository.get_student_by_id(student_id)
+        return jsonify(student.to_dict() if student else {})
+
+    return app
+
+
+def run(app, pooled, n_requests):
+    """Issues `n_requests` requests and returns the achieved requests/sec."""
+    dispose_pool(app)
+    app.config['DB_POOL_ENABLED'] = pooled
+    client = app.test_client()
+    client.get('/bench/student/1') # Warm-up.
+    start = time.perf_counter()
+    for i in range(n_requests):
+        response = client.get(f'/bench/student/{i % 50 + 1}')
+        assert response.status_code == 200
+    return n_requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(os.path.join(tmp, 'bench.sqlite'))
+        with app.app_context():
+            seed_data()
+
+        unpooled = run(app, False, args.requests)
+        pooled = run(app, True, args.requests)
+        dispose_pool(app)
+
+    print(f"requests:  {args.requests}")
+    print(f"unpooled:  {unpooled:,.0f} req/s")
+    print(f"pooled:    {pooled:,.0f} req/s")
+    print(f"speed-up:  {pooled / unpooled:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
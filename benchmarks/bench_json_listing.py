@@ -0,0 +1,115 @@
+"""
+Benchmark: serializing a large alerts listing to a JSON response body.
+
+Builds a seeded throwaway database with N extra alerts and serializes the full
+active-alerts listing four ways, inside a request context:
+
+- dicts:    `get_all_alerts()` (`sqlite3.Row` -> dict per row) then `jsonify`.
+- models:   `Alert` models per row, then `to_dict()` per model, then `jsonify`.
+- stream:   `iter_all_alerts_json()` chunks through `json_array_response`, with orjson.
+- stdlib:   the same stream with orjson disabled (standard library `json`).
+
+Each variant consumes the whole response body, so the time covers the query,
+the encoding and the response plumbing.
+
+Usage:
+    python benchmarks/bench_json_listing.py [--alerts N] [--repeat R]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import jsonify
+from app import create_app
+from app.db_connection import dispose_pool, get_db
+from app.repositories.alert_repository import alert_repository, _ACTIVE_ALERTS_ORDER, _ACTIVE_ALERTS_QUERY
+from app.utils import json_stream
+from utils.seed_data import seed_data
+
+
+def add_alerts(n_alerts, seed=42):
+    """Inserts `n_alerts` synthetic alerts for the seeded students and modules."""
+    rng = random.Random(seed)
+    db = get_db()
+    db.executemany(
+        "INSERT INTO alerts (student_id, module_id, week_number, reason, created_at, resolved, is_active) "
+        "VALUES (?, ?, ?, ?, ?, ?, 1)",
+        [(rng.randint(1, 50), rng.randint(1, 8), rng.randint(1, 10),
+          'High stress level reported for 2 consecutive weeks.',
+          f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00",
+          rng.random() < 0.3)
+         for _ in range(n_alerts)])
+    db.commit()
+
+
+def body_of(response):
+    """Returns the full response body, draining a streamed response."""
+    return b''.join(response.response) if response.is_streamed else response.get_data()
+
+
+def serialize_dicts():
+    return jsonify(alert_repository.get_all_alerts())
+
+
+def serialize_models():
+    query = _ACTIVE_ALERTS_QUERY + _ACTIVE_ALERTS_ORDER
+    return jsonify([alert.to_dict() for alert in alert_repository.iter_query(query)])
+
+
+def serialize_stream():
+    return json_stream.json_array_response(alert_repository.iter_all_alerts_json())
+
+
+def serialize_stdlib():
+    orjson, json_stream.orjson = json_stream.orjson, None
+    try:
+        return body_of(serialize_stream())
+    finally:
+        json_stream.orjson = orjson
+
+
+VARIANTS = {'dicts': serialize_dicts, 'models': serialize_models, 'stream': serialize_stream,
+            'stdlib': serialize_stdlib}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--alerts', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app('testing')
+        app.config['DATABASE_PATH'] = os.path.join(tmp, 'bench.sqlite')
+        with app.app_context():
+            seed_data()
+            add_alerts(args.alerts)
+            n_rows = get_db().execute("SELECT COUNT(*) FROM alerts WHERE is_active = 1").fetchone()[0]
+        for name, serialize in VARIANTS.items():
+            best = float('inf')
+            for _ in range(args.repeat):
+                with app.test_request_context():
+                    start = time.perf_counter()
+                    response = serialize()
+                    size = len(response if isinstance(response, bytes) else body_of(response))
+                    best = min(best, time.perf_counter() - start)
+            results[name] = (best, size)
+        dispose_pool(app)
+
+    print(f"rows: {n_rows:,}")
+    for name, (elapsed, size) in results.items():
+        print(f"{name:>7}: {n_rows / elapsed:>10,.0f} rows/s   {elapsed * 1000:7.1f} ms   {size / 2**20:5.1f} MiB")
+    baseline = results['dicts'][0]
+    for name in ('stream', 'stdlib'):
+        print(f"{name} vs dicts: {baseline / results[name][0]:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: the cost of one metrics observation.
+
+Times `Histogram.observe` and `Counter.inc` on labelled series (as recorded
+for every request and repository method call) in one thread and across
+several contending threads, plus the full repository-method wrapper around a
+no-op method, and checks each against the 5 µs per observation budget.
+
+Usage:
+    python benchmarks/bench_metrics.py [--observations N] [--threads T]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.metrics import MetricsRegistry
+from app.repositories.base_repository import BaseRepository
+
+BUDGET_US = 5.0
+
+
+class NoopRepository(BaseRepository):
+    """A repository whose only public method does nothing, to isolate the wrapper's cost."""
+    def __init__(self):
+        super().__init__('noop', None)
+
+    def noop(self):
+        return None
+
+
+def per_call_us(function, n, threads=1):
+    """Returns the wall-clock microseconds per call of `function` run `n` times in each of `threads` threads."""
+    def work():
+        for _ in range(n):
+            function()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) / (n * threads) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--observations', type=int, default=200_000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    histogram = registry.histogram('op_seconds', 'Op latency.', ('blueprint', 'route', 'method'))
+    counter = registry.counter('ops_total', 'Ops.', ('blueprint', 'route', 'method', 'status'))
+    labels = ('admin', '/api/admin/students/<int:student_id>', 'GET')
+    status_labels = labels + ('200',)
+    repository = NoopRepository()
+
+    app = create_app('testing')
+    with app.app_context():
+        results = {
+            'histogram.observe': per_call_us(lambda: histogram.observe(0.0042, labels), args.observations),
+            f'histogram.observe, {args.threads} threads':
+                per_call_us(lambda: histogram.observe(0.0042, labels), args.observations // args.threads, args.threads),
+            'counter.inc': per_call_us(lambda: counter.inc(status_labels), args.observations),
+            'repository wrapper (net)': per_call_us(repository.noop, args.observations)
+                                        - per_call_us(NoopRepository.noop.__wrapped__.__get__(repository), args.observations),
+        }
+
+    for name, us in results.items():
+        verdict = 'ok' if us < BUDGET_US else 'OVER BUDGET'
+        print(f"{name:>30}: {us:6.2f} µs/observation   {verdict}")
+
+
+if __name__ == '__main__':
+    main()
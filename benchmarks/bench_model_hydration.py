@@ -0,0 +1,146 @@
+"""
+Benchmark: per-row model hydration time and memory for 1M rows.
+
+Compares the current slotted, single-pass `SurveyResponse.from_row` with a
+replica of the previous implementation (a `__dict__`-backed class whose
+`from_row` built an intermediate `BaseModel` and converted the row to a dict
+twice), and with the positional mapper that `BaseRepository` compiles and
+caches per query shape (`SurveyResponse.compile_row_mapper`). Rows come
+from an in-memory SQLite table so that only hydration is measured; the
+`to_dict` pass that listing endpoints run next is timed separately (the
+previous implementation parsed `created_at` on hydration and formatted it
+back with `isoformat()`, the current one keeps the raw string). Each variant runs in its own subprocess so that the reported RSS
+growth is not skewed by the other variant's freed memory.
+
+Usage:
+    python benchmarks/bench_model_hydration.py [--rows N]
+"""
+
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.survey_response import SurveyResponse
+
+
+class LegacyBaseModel:
+    """The previous, `__dict__`-backed BaseModel."""
+    def __init__(self, id=None, is_active=True, created_at=None):
+        self.id = id
+        self.is_active = is_active
+        self.created_at = created_at if created_at is not None else datetime.now(timezone.utc)
+
+    @classmethod
+    def from_row(cls, row):
+        row_dict = dict(row)
+        created_at = row_dict.get('created_at')
+        return cls(id=row_dict.get('id'), is_active=bool(row_dict.get('is_active', True)),
+                   created_at=datetime.fromisoformat(created_at) if created_at else None)
+
+    def to_dict(self):
+        return {'id': self.id, 'is_active': self.is_active, 'created_at': self.created_at.isoformat()}
+
+
+class LegacySurveyResponse(LegacyBaseModel):
+    """The previous SurveyResponse: base hydration, then a second dict conversion."""
+    def __init__(self, id=None, student_id=None, module_id=None, week_number=None, stress_level=None,
+                 hours_slept=None, mood_comment=None, created_at=None, is_active=True):
+        super().__init__(id=id, created_at=created_at, is_active=is_active)
+        self.student_id = student_id
+        self.module_id = module_id
+        self.week_number = week_number
+        self.stress_level = stress_level
+        self.hours_slept = hours_slept
+        self.mood_comment = mood_comment
+
+    @classmethod
+    def from_row(cls, row):
+        base_instance = LegacyBaseModel.from_row(row)
+        row_dict = dict(row)
+        return cls(id=base_instance.id, student_id=row_dict.get('student_id'), module_id=row_dict.get('module_id'),
+                   week_number=row_dict.get('week_number'), stress_level=row_dict.get('stress_level'),
+                   hours_slept=row_dict.get('hours_slept'), mood_comment=row_dict.get('mood_comment'),
+                   is_active=base_instance.is_active, created_at=base_instance.created_at)
+
+    def to_dict(self):
+        data = super().to_dict()
+        data.update({'student_id': self.student_id, 'module_id': self.module_id, 'week_number': self.week_number,
+                     'stress_level': self.stress_level, 'hours_slept': self.hours_slept,
+                     'mood_comment': self.mood_comment})
+        return data
+
+
+VARIANTS = ('before', 'after', 'compiled')
+
+
+def rss_bytes():
+    """Returns the current resident set size of this process (Linux)."""
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def make_rows(n_rows):
+    """Returns `n_rows` survey response rows as `sqlite3.Row` objects."""
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    return conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        SELECT i AS id, i % 5000 AS student_id, i % 8 + 1 AS module_id, i % 10 + 1 AS week_number,
+               i % 5 + 1 AS stress_level, 7.5 AS hours_slept, NULL AS mood_comment,
+               '2025-02-03T10:15:00' AS created_at, 1 AS is_active
+        FROM n
+    """, (n_rows,)).fetchall()
+
+
+def run_variant(name, n_rows):
+    """Hydrates `n_rows` rows with one variant and prints 'seconds rss_growth_bytes count to_dict_seconds'."""
+    rows = make_rows(n_rows)
+    if name == 'compiled':
+        map_row = SurveyResponse.compile_row_mapper(tuple(rows[0].keys()))
+    else:
+        map_row = (LegacySurveyResponse if name == 'before' else SurveyResponse).from_row
+    baseline = rss_bytes()
+    start = time.perf_counter()
+    hydrated = [map_row(row) for row in rows]
+    elapsed = time.perf_counter() - start
+    rss = rss_bytes() - baseline
+    start = time.perf_counter()
+    for model in hydrated:
+        model.to_dict()
+    print(elapsed, rss, len(hydrated), time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--variant', choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.rows)
+        return
+
+    results = {}
+    for name in VARIANTS:
+        output = subprocess.run([sys.executable, __file__, '--rows', str(args.rows), '--variant', name],
+                                check=True, capture_output=True, text=True).stdout.split()
+        results[name] = (float(output[0]), int(output[1]), float(output[3]))
+
+    print(f"rows: {args.rows:,}")
+    for name, (elapsed, rss, to_dict) in results.items():
+        print(f"{name:>8}: {elapsed / args.rows * 1e6:6.2f} us/row   RSS +{rss / 2**20:7.1f} MiB   "
+              f"to_dict {to_dict / args.rows * 1e6:6.2f} us/row")
+    before = results['before']
+    for name in VARIANTS[1:]:
+        elapsed, rss, _ = results[name]
+        print(f"{name} vs before: {before[0] / elapsed:.2f}x faster, {rss / before[1]:.0%} of the memory")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: the cost of hashing passwords for a student intake.
+
+Hashes N distinct passwords with the production method (scrypt) one at a
+time, with scrypt across a process pool (`hash_passwords`), and with the
+low-cost method used by the development and testing configs, then
+extrapolates each rate to a 30,000-student intake.
+
+Usage:
+    python benchmarks/bench_password_hashing.py [--passwords N] [--workers W]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from werkzeug.security import generate_password_hash
+from app.utils.passwords import hash_passwords
+
+INTAKE = 30_000
+
+
+def timed(function, *args, **kwargs):
+    """Returns the seconds taken by `function(*args, **kwargs)`."""
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--passwords', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    words = [f"password-{i}" for i in range(args.passwords)]
+
+    results = {
+        'scrypt, sequential': timed(lambda: [generate_password_hash(w, method='scrypt') for w in words]),
+        f'scrypt, {args.workers} workers': timed(hash_passwords, words, method='scrypt', workers=args.workers),
+        'pbkdf2:sha256:1000 (dev/test)': timed(hash_passwords, words, method='pbkdf2:sha256:1000', workers=1),
+    }
+
+    print(f"passwords: {args.passwords}   CPUs: {os.cpu_count()}")
+    for name, elapsed in results.items():
+        per_hash = elapsed / args.passwords
+        print(f"{name:>30}: {per_hash * 1000:8.2f} ms/hash   {INTAKE:,} users: {per_hash * INTAKE / 60:7.1f} min")
+
+
+if __name__ == '__main__':
+    main()
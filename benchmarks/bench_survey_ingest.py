@@ -0,0 +1,83 @@
+"""
+Benchmark: ingesting a survey wave row by row versus in bulk.
+
+Builds a seeded throwaway database and ingests the same synthetic wave of
+survey responses once through `create_survey_response()` (one insert plus
+per-row stress-event/alert checks each) and once through
+`create_survey_responses_bulk()` (one `executemany` plus two set-based
+statements in a single transaction).
+
+Usage:
+    python benchmarks/bench_survey_ingest.py [--responses N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.db_connection import dispose_pool, get_db
+from app.repositories.survey_response_repository import survey_response_repository
+from utils.seed_data import seed_data
+
+
+def make_wave(n_responses, week_number, seed=42):
+    """Returns `n_responses` synthetic survey responses for `week_number`."""
+    rng = random.Random(seed)
+    return [
+        {
+            'student_id': rng.randint(1, 50),
+            'module_id': rng.randint(1, 8),
+            'week_number': week_number,
+            'stress_level': rng.randint(1, 5),
+            'hours_slept': round(rng.uniform(4, 9), 1),
+            'mood_comment': None,
+        }
+        for _ in range(n_responses)
+    ]
+
+
+def run_row_by_row(wave):
+    """Ingests `wave` one response at a time and returns the elapsed seconds."""
+    start = time.perf_counter()
+    for r in wave:
+        survey_response_repository.create_survey_response(
+            r['student_id'], r['module_id'], r['week_number'], r['stress_level'], r['hours_slept'], r['mood_comment'])
+    get_db().commit()
+    return time.perf_counter() - start
+
+
+def run_bulk(wave):
+    """Ingests `wave` in one bulk call and returns the elapsed seconds."""
+    start = time.perf_counter()
+    survey_response_repository.create_survey_responses_bulk(wave)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--responses', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app('testing')
+        app.config['DATABASE_PATH'] = os.path.join(tmp, 'bench.sqlite')
+        with app.app_context():
+            seed_data()
+            row_by_row = run_row_by_row(make_wave(args.responses, week_number=11))
+            bulk = run_bulk(make_wave(args.responses, week_number=12))
+        dispose_pool(app)
+
+    print(f"responses:   {args.responses}")
+    print(f"row by row:  {args.responses / row_by_row:,.0f} rows/s ({row_by_row:.2f}s)")
+    print(f"bulk:        {args.responses / bulk:,.0f} rows/s ({bulk:.2f}s)")
+    print(f"speed-up:    {row_by_row / bulk:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
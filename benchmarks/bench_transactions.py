@@ -0,0 +1,78 @@
+"""
+Benchmark: commit-per-write versus one unit of work on a bulk write path.
+
+Builds a seeded throwaway database and creates the same survey responses
+once with each `create_survey_response()` call committing on its own, and
+once inside a single `transaction()` block. Commits are counted with the
+SQLite trace callback; each one costs an fsync of the WAL under
+`synchronous = FULL` (and of the rollback journal and database in DELETE
+mode), so the run is repeated for each synchronous level.
+
+Usage:
+    python benchmarks/bench_transactions.py [--writes N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.db_connection import dispose_pool, get_db, transaction
+from app.repositories.survey_response_repository import survey_response_repository
+from utils.seed_data import seed_data
+
+
+def write_surveys(n_writes, week_number):
+    """Creates `n_writes` survey responses for `week_number`."""
+    for i in range(n_writes):
+        survey_response_repository.create_survey_response(i % 50 + 1, i % 8 + 1, week_number, i % 5 + 1, 7.0, None)
+
+
+def run(db, n_writes, week_number, single_unit_of_work):
+    """Returns (elapsed seconds, number of commits) for one write pass."""
+    commits = []
+    db.set_trace_callback(lambda sql: commits.append(sql) if sql.strip().upper() == 'COMMIT' else None)
+    start = time.perf_counter()
+    if single_unit_of_work:
+        with transaction(db):
+            write_surveys(n_writes, week_number)
+    else:
+        write_surveys(n_writes, week_number)
+    elapsed = time.perf_counter() - start
+    db.set_trace_callback(None)
+    return elapsed, len(commits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--writes', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"writes: {args.writes}")
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app('testing')
+        app.config['DATABASE_PATH'] = os.path.join(tmp, 'bench.sqlite')
+        with app.app_context():
+            seed_data()
+        week = 11
+        for synchronous in ('FULL', 'NORMAL'):
+            dispose_pool(app)
+            app.config['SQLITE_PRAGMAS'] = {**app.config['SQLITE_PRAGMAS'], 'synchronous': synchronous}
+            with app.app_context():
+                db = get_db()
+                per_write, per_write_commits = run(db, args.writes, week, single_unit_of_work=False)
+                batched, batched_commits = run(db, args.writes, week + 1, single_unit_of_work=True)
+            week += 2
+            print(f"synchronous={synchronous}")
+            print(f"  commit per write:  {per_write_commits:>6} commits  {args.writes / per_write:>9,.0f} writes/s")
+            print(f"  one unit of work:  {batched_commits:>6} commits  {args.writes / batched:>9,.0f} writes/s")
+            print(f"  speed-up:          {per_write / batched:.1f}x")
+        dispose_pool(app)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: concurrent reader/writer throughput per SQLite PRAGMA profile.
+
+Runs several reader threads executing an analysis-style aggregate while one
+writer thread inserts survey rows and commits each one, first with SQLite's
+default rollback-journal settings and then with the configured WAL profiles.
+In rollback-journal mode readers are blocked whenever the writer commits;
+in WAL mode they are not.
+
+Usage:
+    python benchmarks/bench_wal_concurrency.py [--seconds S] [--readers R]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import SQLITE_PRAGMAS, PRODUCTION_SQLITE_PRAGMAS
+from app.db_pool import apply_pragmas
+
+PROFILES = {
+    'rollback-journal (default)': {'busy_timeout': 5000, 'journal_mode': 'DELETE', 'synchronous': 'FULL'},
+    'WAL (SQLITE_PRAGMAS)': SQLITE_PRAGMAS,
+    'WAL (PRODUCTION_SQLITE_PRAGMAS)': PRODUCTION_SQLITE_PRAGMAS,
+}
+
+READ_QUERY = """
+    SELECT week_number, AVG(stress_level) FROM survey_responses
+    WHERE student_id = ? AND is_active = 1 GROUP BY week_number
+"""
+
+
+def prepare(db_path, rows=50000):
+    """Creates a survey_responses table with `rows` synthetic rows."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE survey_responses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, student_id INTEGER NOT NULL, module_id INTEGER,
+            week_number INTEGER NOT NULL, stress_level INTEGER NOT NULL, is_active INTEGER NOT NULL DEFAULT 1
+        )
+    """)
+    rng = random.Random(42)
+    conn.executemany(
+        "INSERT INTO survey_responses (student_id, module_id, week_number, stress_level) VALUES (?, ?, ?, ?)",
+        [(rng.randint(1, 500), rng.randint(1, 8), rng.randint(1, 10), rng.randint(1, 5)) for _ in range(rows)]
+    )
+    conn.execute("CREATE INDEX idx_bench_student ON survey_responses (student_id, week_number)")
+    conn.commit()
+    conn.close()
+
+
+def connect(db_path, pragmas):
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5)
+    apply_pragmas(conn, pragmas)
+    return conn
+
+
+def run_profile(db_path, pragmas, seconds, n_readers):
+    """Returns (reads/sec, writes/sec) for one PRAGMA profile."""
+    stop = threading.Event()
+    counts = {'reads': 0, 'writes': 0}
+    lock = threading.Lock()
+
+    def reader(seed):
+        conn = connect(db_path, pragmas)
+        rng = random.Random(seed)
+        done = 0
+        while not stop.is_set():
+            conn.execute(READ_QUERY, (rng.randint(1, 500),)).fetchall()
+            done += 1
+        conn.close()
+        with lock:
+            counts['reads'] += done
+
+    def writer():
+        conn = connect(db_path, pragmas)
+        rng = random.Random(7)
+        done = 0
+        while not stop.is_set():
+            conn.execute(
+                "INSERT INTO survey_responses (student_id, module_id, week_number, stress_level) VALUES (?, ?, ?, ?)",
+                (rng.randint(1, 500), rng.randint(1, 8), rng.randint(1, 10), rng.randint(1, 5))
+            )
+            conn.commit()
+            done += 1
+        conn.close()
+        counts['writes'] = done
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(n_readers)]
+    threads.append(threading.Thread(target=writer))
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return counts['reads'] / seconds, counts['writes'] / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--readers', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'profile':<34}{'reads/s':>12}{'writes/s':>12}")
+    for name, pragmas in PROFILES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.sqlite')
+            prepare(db_path)
+            reads, writes = run_profile(db_path, pragmas, args.seconds, args.readers)
+        print(f"{name:<34}{reads:>12,.0f}{writes:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
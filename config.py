@@ -11,6 +11,45 @@ import os
 # Determine the base directory of the application for relative path calculations.
 basedir = os.path.abspath(os.path.dirname(__file__))
 
+# PRAGMA profile applied to every new SQLite connection (see app/db_connection.py).
+# WAL lets readers on the analysis endpoints proceed while a survey write is
+# committing; synchronous=NORMAL is durable across application crashes in WAL mode.
+# busy_timeout is listed first so that switching to WAL waits for any existing lock.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,         # Milliseconds to wait on a locked database before failing.
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'foreign_keys': 'ON',
+    'temp_store': 'MEMORY',       # Keep temporary sort/group B-trees in memory.
+    'cache_size': -16000,         # Negative values are KiB: ~16 MiB page cache per connection.
+}
+
+# Production preset: larger page cache and memory-mapped I/O for the read-heavy dashboards.
+PRODUCTION_SQLITE_PRAGMAS = {
+    **SQLITE_PRAGMAS,
+    'busy_timeout': 10000,
+    'cache_size': -64000,         # ~64 MiB page cache per connection.
+    'mmap_size': 268435456,       # Map up to 256 MiB of the database file.
+}
+
+# Profile for the read-only connections used by the analysis queries and get_* lookups (see get_read_db()).
+# The journal mode and synchronous level belong to the writer and cannot be set read-only; query_only makes
+# any accidental write fail, and the larger cache and memory map suit the long analytics scans.
+SQLITE_READ_PRAGMAS = {
+    'busy_timeout': 5000,
+    'query_only': 'ON',
+    'temp_store': 'MEMORY',
+    'cache_size': -32000,         # ~32 MiB page cache per connection.
+    'mmap_size': 134217728,       # Map up to 128 MiB of the database file.
+}
+
+PRODUCTION_SQLITE_READ_PRAGMAS = {
+    **SQLITE_READ_PRAGMAS,
+    'busy_timeout': 10000,
+    'cache_size': -128000,        # ~128 MiB page cache per connection.
+    'mmap_size': 536870912,       # Map up to 512 MiB of the database file.
+}
+
 class Config:
     """
     Base configuration class.
@@ -23,6 +62,87 @@ class Config:
     # Secret key for Flask-JWT-Extended to sign JWTs.
     # Retrieved from environment variable or defaults to a hardcoded string (for development).
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'super-secret-jwt-key'
+
+    # SQLite connection pooling (see app/db_pool.py).
+    # When enabled, get_db() borrows connections from a per-process pool instead of
+    # opening a new connection for every application context.
+    DB_POOL_ENABLED = os.environ.get('DB_POOL_ENABLED', '1') != '0'
+    # Maximum number of connections a single process keeps open.
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    # Seconds to wait for a free connection before raising ConnectionError.
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 5.0))
+    # Rows fetched per round-trip when repositories stream large result sets.
+    DB_FETCH_BATCH_SIZE = int(os.environ.get('DB_FETCH_BATCH_SIZE', 500))
+    # Default and maximum page sizes for keyset-paginated listings.
+    DB_PAGE_SIZE = int(os.environ.get('DB_PAGE_SIZE', 50))
+    DB_MAX_PAGE_SIZE = int(os.environ.get('DB_MAX_PAGE_SIZE', 500))
+    # Run read-only queries (analysis, get_* lookups, listings) on separate read-only connections,
+    # pooled separately (DB_READ_POOL_SIZE, defaulting to DB_POOL_SIZE) with the SQLITE_READ_PRAGMAS profile.
+    DB_READ_CONNECTIONS_ENABLED = os.environ.get('DB_READ_CONNECTIONS_ENABLED', '1') != '0'
+    DB_READ_POOL_SIZE = int(os.environ.get('DB_READ_POOL_SIZE', 0)) or None
+
+    # Werkzeug password hashing method for new hashes (see app/utils/passwords.py).
+    # Defaults to scrypt; non-production configs use a cheap method unless overridden.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt'
+    # Worker processes used to hash passwords when provisioning users in bulk (default: one per CPU).
+    PASSWORD_HASH_WORKERS = int(os.environ['PASSWORD_HASH_WORKERS']) if os.environ.get('PASSWORD_HASH_WORKERS') else None
+
+    # Students generated and committed per transaction by utils/seed_data.seed_data().
+    SEED_CHUNK_SIZE = int(os.environ.get('SEED_CHUNK_SIZE', 1000))
+    # Worker processes generating seed chunks in parallel (1 generates in the calling process).
+    SEED_WORKERS = int(os.environ.get('SEED_WORKERS', 1))
+
+    # PRAGMAs applied once to each new connection. Override per environment as needed.
+    SQLITE_PRAGMAS = SQLITE_PRAGMAS
+    # PRAGMAs applied once to each new read-only connection (see get_read_db()).
+    SQLITE_READ_PRAGMAS = SQLITE_READ_PRAGMAS
+
+    # Default maximum number of points returned for the stress/grade scatter plot.
+    ANALYSIS_MAX_SCATTER_POINTS = int(os.environ.get('ANALYSIS_MAX_SCATTER_POINTS', 5000))
+
+    # Grade bands used by the grade distribution analysis, as ordered (label, lower_bound) pairs.
+    # Each band runs from its lower bound up to the next band's lower bound; the first band
+    # also covers anything below. Programmes with different classification schemes can override this.
+    GRADE_BANDS = [
+        ('Fail (<40)', 0),
+        ('Pass (40-49)', 40),
+        ('Merit (50-59)', 50),
+        ('Distinction (60-69)', 60),
+        ('Excellent (70+)', 70),
+    ]
+
+    # Result cache for the analysis queries (see app/cache.py).
+    # Cached results are invalidated by per-table version counters bumped on every repository write;
+    # the TTL bounds staleness for writes made outside the repositories.
+    RESULT_CACHE_ENABLED = os.environ.get('RESULT_CACHE_ENABLED', '1') != '0'
+    RESULT_CACHE_TTL = int(os.environ.get('RESULT_CACHE_TTL', 300))
+    RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 1024))
+    # Optional import string of a factory `factory(app) -> backend` for a shared (cross-process) backend.
+    RESULT_CACHE_BACKEND = os.environ.get('RESULT_CACHE_BACKEND')
+
+    # Per-request query instrumentation (see app/instrumentation.py).
+    # Statements at or above SLOW_QUERY_THRESHOLD_MS are logged as warnings with the request route;
+    # QUERY_STATS_HEADERS adds X-DB-Query-Count and X-DB-Time-Ms to every response.
+    QUERY_STATS_ENABLED = os.environ.get('QUERY_STATS_ENABLED', '1') != '0'
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
+    QUERY_STATS_MAX_RECORDS = int(os.environ.get('QUERY_STATS_MAX_RECORDS', 1000))
+    QUERY_STATS_HEADERS = True
+
+    # In-process request and repository latency metrics, served to admins at /api/admin/metrics (see app/metrics.py).
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+    # Upper bounds (in seconds) of the latency histogram buckets; None uses app.metrics.DEFAULT_LATENCY_BUCKETS.
+    METRICS_LATENCY_BUCKETS = None
+
+    # Sampling request profiler (see app/profiling.py). Profiled requests are written as .pstats
+    # files under PROFILE_DIR, one subdirectory per route; summarize them with `manage.py profile-report`.
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1'
+    # Fraction of requests profiled at random (0 profiles only requests that ask for it).
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0.0))
+    # Requests from admins carrying this header are always profiled.
+    PROFILE_HEADER = 'X-Profile-Request'
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') or os.path.join(basedir, 'profiles')
+    # Only the newest profiles of each route are kept.
+    PROFILE_MAX_FILES_PER_ROUTE = int(os.environ.get('PROFILE_MAX_FILES_PER_ROUTE', 50))
     
     @staticmethod
     def init_app(app):
@@ -41,6 +161,10 @@ class DevelopmentConfig(Config):
     Enables debug mode and sets the development database path.
     """
     DEBUG = True # Enable debug mode for detailed error messages and auto-reloading.
+
+    # Low-cost password hashing so that seeding and provisioning demo users stays fast.
+    # Never use this outside development and testing.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'pbkdf2:sha256:1000'
     
     # Path to the SQLite database file for the development environment.
     # Retrieved from environment variable or defaults to 'data-dev.sqlite' in the base directory.
@@ -53,6 +177,12 @@ class TestingConfig(Config):
     Enables testing mode and sets the testing database path.
     """
     TESTING = True # Enable testing mode, which suppresses error catching during request handling.
+
+    # Tests mock repository internals and inspect fresh query results, so caching is off by default.
+    RESULT_CACHE_ENABLED = False
+
+    # Low-cost password hashing: tests and their seeded users do not need brute-force resistance.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'pbkdf2:sha256:1000'
     
     # Path to the SQLite database file for the testing environment.
     # Retrieved from environment variable or defaults to 'data-test.sqlite' in the base directory.
@@ -69,6 +199,16 @@ class ProductionConfig(Config):
     DATABASE_PATH = os.environ.get('DATABASE_PATH') or \
         os.path.join(basedir, 'data.sqlite')
 
+    # Tuned PRAGMA profile for production workloads.
+    SQLITE_PRAGMAS = PRODUCTION_SQLITE_PRAGMAS
+    SQLITE_READ_PRAGMAS = PRODUCTION_SQLITE_READ_PRAGMAS
+
+    # Full-cost password hashing; deliberately not overridable from the environment.
+    PASSWORD_HASH_METHOD = 'scrypt'
+
+    # Do not expose database timings to clients.
+    QUERY_STATS_HEADERS = False
+
 # Dictionary mapping configuration names to their respective configuration classes.
 config = {
     'development': DevelopmentConfig,
@@ -17,7 +17,11 @@ from flask import current_app
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from app import create_app
-from utils.seed_data import seed_data
+from app.db_connection import dispose_pool, get_db
+from app.profiling import profile_report
+from utils.seed_data import (seed_data, DEFAULT_ASSESSMENTS, DEFAULT_MODULES, DEFAULT_SEED, DEFAULT_STUDENTS,
+                             DEFAULT_WEEKS)
+from utils.schema import ensure_indexes, INDEX_SET_VERSION, rebuild_student_week_stats
 
 # Create a Flask application instance for the CLI commands.
 # The configuration is determined by the 'FLASK_CONFIG' environment variable,
@@ -40,10 +44,16 @@ def init_db_command():
         db_path = current_app.config['DATABASE_PATH']
         
         try:
+            # Close pooled connections so none of them keep pointing at the old file.
+            dispose_pool(app)
             # Attempt to remove the existing database file to ensure a clean slate.
             if os.path.exists(db_path):
                 os.remove(db_path)
                 click.echo(f"Removed existing database file: {db_path}")
+            # Remove WAL sidecar files left behind by the previous database, if any.
+            for suffix in ('-wal', '-shm'):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
             
             # Execute the seeding process which creates tables and inserts data.
             seed_data()
@@ -65,17 +75,36 @@ def init_db_command():
             current_app.logger.error(f"Unexpected error during init-db: {e}", exc_info=True)
 
 @app.cli.command("seed")
-def seed_command():
+@click.option('--students', type=click.IntRange(min=1), default=DEFAULT_STUDENTS, show_default=True,
+              help='Number of students to generate.')
+@click.option('--modules', type=click.IntRange(min=1), default=DEFAULT_MODULES, show_default=True,
+              help='Number of modules to generate.')
+@click.option('--weeks', type=click.IntRange(min=1), default=DEFAULT_WEEKS, show_default=True,
+              help='Academic weeks of attendance and survey data per enrolment.')
+@click.option('--assessments', type=click.IntRange(min=1), default=DEFAULT_ASSESSMENTS, show_default=True,
+              help='Assessments (submissions and grades) per enrolment.')
+@click.option('--seed', 'random_seed', type=int, default=DEFAULT_SEED, show_default=True,
+              help='Random seed; the same seed and dimensions always produce the same data.')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=None,
+              help='Students generated and committed per transaction (default: SEED_CHUNK_SIZE).')
+@click.option('--workers', type=click.IntRange(min=1), default=None,
+              help='Processes generating chunks in parallel (default: SEED_WORKERS).')
+def seed_command(students, modules, weeks, assessments, random_seed, chunk_size, workers):
     """
-    CLI command to seed the database with initial data.
+    CLI command to (re)create the database tables and seed them with generated data.
 
-    This command calls the `seed_data()` function to populate the database
-    with demo data. It assumes the database tables are already created.
+    This command calls the `seed_data()` function with the given dimensions.
+    With the defaults it produces the standard demo data set; larger values
+    produce load-testing databases, e.g. `seed --students 20000 --weeks 12`
+    for roughly a million attendance and a million survey rows, and
+    `--workers N` spreads the generation over N processes without changing
+    the output. Existing tables are dropped first.
     """
     with app.app_context():
         try:
-            seed_data()
-            click.echo('Database has been seeded successfully.')
+            seed_data(students=students, modules=modules, weeks=weeks, assessments=assessments,
+                      seed=random_seed, chunk_size=chunk_size, workers=workers)
+            click.echo(f'Database has been seeded successfully ({students} students, {modules} modules, {weeks} weeks).')
         except ConnectionError as e:
             # Handle errors specifically related to database connection.
             click.echo(f"Error: Could not connect to the database during seeding. {e}", err=True)
@@ -84,3 +113,69 @@ def seed_command():
             # Catch any other unexpected errors during the seeding process.
             click.echo(f"Error: An unexpected error occurred during database seeding. {e}", err=True)
             current_app.logger.error(f"Unexpected error during seed: {e}", exc_info=True)
+
+@app.cli.command("upgrade-indexes")
+def upgrade_indexes_command():
+    """
+    CLI command to bring an existing database up to the current index set.
+
+    Rebuilds the secondary indexes defined in `utils/schema.py` if the
+    database records an older index set version. Freshly seeded databases
+    already have the current set.
+    """
+    with app.app_context():
+        try:
+            if ensure_indexes(get_db()):
+                click.echo(f'Index set upgraded to version {INDEX_SET_VERSION}.')
+            else:
+                click.echo(f'Index set is already at version {INDEX_SET_VERSION}.')
+        except ConnectionError as e:
+            click.echo(f"Error: Could not connect to the database during index upgrade. {e}", err=True)
+            current_app.logger.error(f"Database connection error during upgrade-indexes: {e}")
+        except Exception as e:
+            click.echo(f"Error: An unexpected error occurred during index upgrade. {e}", err=True)
+            current_app.logger.error(f"Unexpected error during upgrade-indexes: {e}", exc_info=True)
+
+@app.cli.command("rebuild-stats")
+def rebuild_stats_command():
+    """
+    CLI command to rebuild the `student_week_stats` summary table.
+
+    Recomputes every per-student weekly aggregate from the raw survey and
+    attendance rows. Use this to backfill an existing database or after
+    loading data while the maintenance triggers were absent.
+    """
+    with app.app_context():
+        try:
+            groups = rebuild_student_week_stats(get_db())
+            click.echo(f'Rebuilt student_week_stats ({groups} student/module/week groups).')
+        except ConnectionError as e:
+            click.echo(f"Error: Could not connect to the database during stats rebuild. {e}", err=True)
+            current_app.logger.error(f"Database connection error during rebuild-stats: {e}")
+        except Exception as e:
+            click.echo(f"Error: An unexpected error occurred during stats rebuild. {e}", err=True)
+            current_app.logger.error(f"Unexpected error during rebuild-stats: {e}", exc_info=True)
+
+@app.cli.command("profile-report")
+@click.option('--dir', 'profile_dir', type=click.Path(file_okay=False), default=None,
+              help='Directory holding the profiles. Defaults to the PROFILE_DIR setting.')
+@click.option('--route', default=None,
+              help="Only include routes whose profile directory contains this text (e.g. 'GET_api_analysis').")
+@click.option('--limit', type=click.IntRange(min=1), default=20, show_default=True,
+              help='Number of functions to list.')
+@click.option('--sort', type=click.Choice(['cumulative', 'tottime', 'ncalls']), default='cumulative',
+              show_default=True, help='Sort order of the hot spots.')
+def profile_report_command(profile_dir, route, limit, sort):
+    """
+    CLI command to summarize the request profiles written by the sampling profiler.
+
+    Merges every `.pstats` file (optionally only those of matching routes)
+    and prints the top functions by cumulative time.
+    """
+    profile_dir = profile_dir or app.config['PROFILE_DIR']
+    count, report = profile_report(profile_dir, route=route, limit=limit, sort=sort)
+    if not count:
+        click.echo(f"No profiles found in {profile_dir}.")
+        return
+    click.echo(f"Merged {count} profiles from {profile_dir}.")
+    click.echo(report)
@@ -30,3 +30,57 @@ def test_base_model_from_row():
 def test_base_model_from_row_with_none():
     """Tests that from_row returns None if the row is None."""
     assert BaseModel.from_row(None) is None
+
+def test_models_are_slotted():
+    """Tests that model instances have no per-instance __dict__."""
+    from app.models.survey_response import SurveyResponse
+    response = SurveyResponse.from_row({'id': 1, 'stress_level': 4})
+    assert not hasattr(response, '__dict__')
+    with pytest.raises(AttributeError):
+        response.unknown_field = 1
+
+def test_subclass_from_row_single_pass():
+    """Tests that a subclass is hydrated from one row, applying converters and defaulting missing columns."""
+    from app.models.alert import Alert
+    row = {'id': 7, 'student_id': 2, 'resolved': 1, 'is_active': 1, 'created_at': None}
+    alert = Alert.from_row(row)
+    assert alert.id == 7
+    assert alert.resolved is True
+    assert alert.module_id is None
+    assert isinstance(alert.created_at, datetime)
+
+def test_compiled_row_mapper_matches_from_row():
+    """Tests that the positional mapper hydrates the same model as from_row, including missing columns."""
+    from app.models.submission_record import SubmissionRecord
+    row = {'id': 3, 'due_date': '2025-03-01T12:00:00', 'is_submitted': 1, 'is_active': 1,
+           'created_at': '2025-02-01T09:00:00'}
+    mapper = SubmissionRecord.compile_row_mapper(tuple(row))
+    mapped = mapper(tuple(row.values()))
+    assert mapped.to_dict() == SubmissionRecord.from_row(row).to_dict()
+    assert mapped.is_submitted is True
+    assert mapped.student_name is None
+
+def test_timestamps_are_parsed_lazily():
+    """Tests that raw timestamps are kept as strings, returned by to_dict unparsed, and parsed on first access."""
+    from app.models.submission_record import SubmissionRecord
+    row = {'id': 4, 'due_date': '2025-03-01T12:00:00', 'is_active': 1, 'created_at': '2025-02-01 09:00:00'}
+    record = SubmissionRecord.from_row(row)
+    data = record.to_dict()
+    assert data['created_at'] == '2025-02-01 09:00:00'
+    assert data['due_date'] == '2025-03-01T12:00:00'
+    assert data['submitted_date'] is None
+    assert record._created_at_raw == '2025-02-01 09:00:00'
+    assert not isinstance(record._created_at, datetime)  # Still unparsed after to_dict.
+
+    assert record.due_date == datetime(2025, 3, 1, 12, 0)
+    assert record._due_date is record.due_date  # Parsed once, then cached.
+
+def test_invalid_timestamp_warns_only_on_access(mocker):
+    """Tests that an invalid raw value is only reported, and defaulted, when the field is read."""
+    from app.models import base_model
+    warn = mocker.patch.object(base_model, 'warn_invalid_value')
+    model = BaseModel.from_row({'id': 5, 'created_at': 'not-a-date'})
+    assert model.to_dict()['created_at'] == 'not-a-date'
+    warn.assert_not_called()
+    assert isinstance(model.created_at, datetime)
+    warn.assert_called_once_with('created_at', 'not-a-date', 5)
@@ -0,0 +1,171 @@
+"""
+Query budget and query plan fixtures for the repository tests.
+
+Every test in this package runs inside `capture_queries()` and fails if it
+executes one statement shape more often than its budget allows, which is how
+N+1 query patterns (one query per item instead of one per set) show up. The
+default can be adjusted per test with the `query_budget` marker, and the
+`query_budget` fixture asserts a tighter budget around a single call:
+
+    def test_create_student(query_budget):
+        with query_budget(max_queries=2):
+            student_repository.create_student(...)
+
+    @pytest.mark.query_budget(max_queries=40, max_repeats=5)
+    def test_bulk_path(): ...
+
+Every distinct statement a test in this package executes is also run through
+`EXPLAIN QUERY PLAN`, and the test fails if the plan reads a table with a
+plain, index-less `SCAN` that is not listed in `ALLOWED_SCAN_TABLES` or
+`ALLOWED_SCAN_STATEMENTS`. A new repository method, or a changed query, is
+therefore checked as soon as any test exercises it.
+"""
+
+import contextlib
+import re
+import pytest
+from app.db_connection import get_db
+from app.instrumentation import capture_queries
+
+# How often a test may execute one statement shape unless its `query_budget` marker says otherwise.
+DEFAULT_MAX_REPEATS = 3
+
+
+# Tables any statement may scan in full, with the reason.
+ALLOWED_SCAN_TABLES = {
+    'students': "Dimension table, one row per student: counted and joined whole by the dashboard analyses.",
+    'modules': "Dimension table, one row per module.",
+    'users': "Dimension table, one row per account.",
+}
+
+# Statements (by prefix, whitespace collapsed) allowed to scan the given tables in full, with the reason.
+ALLOWED_SCAN_STATEMENTS = {
+    "SELECT m.module_title, SUM(st.stress_sum)": (
+        {'student_week_stats'},
+        "get_stress_level_by_module aggregates every row of the summary table; that is what it is built for."),
+    "DELETE FROM students WHERE id = ?": (
+        {'survey_responses', 'attendance_records', 'grades', 'alerts', 'stress_events', 'enrolments',
+         'submission_records'},
+        "Hard deletes are a rare admin path. Their ON DELETE CASCADE lookups use no index, because the "
+        "student indexes are partial (is_active = 1), and full foreign key indexes would slow every write."),
+}
+
+# Full scans found per statement, shared by all tests of the session so each statement is explained once.
+_SCANS_BY_STATEMENT = {}
+_SCAN_DETAIL = re.compile(r'SCAN (\w+)$')
+_TABLE_REFERENCE = re.compile(
+    r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)'
+    r'(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|LEFT\b|JOIN\b|GROUP\b|ORDER\b|SET\b|VALUES\b)(\w+))?',
+    re.IGNORECASE)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'query_budget(max_queries=None, max_repeats=3): the statement budget of a repository test.')
+
+
+def assert_query_budget(collector, max_queries=None, max_repeats=None, scope='block'):
+    """
+    Fails the test if `collector` holds more than `max_queries` statements or a shape repeated more than `max_repeats` times.
+
+    Args:
+        collector (QueryCollector): The statements to check.
+        max_queries (int, optional): The maximum number of statements, or None for no limit.
+        max_repeats (int, optional): The maximum executions of one statement shape, or None for no limit.
+        scope (str, optional): What the statements belong to, for the failure message.
+    """
+    problems = []
+    if max_queries is not None and collector.count > max_queries:
+        problems.append(f"{collector.count} statements executed, budget is {max_queries}")
+    if max_repeats is not None:
+        problems.extend(f"{n} executions of one statement shape (budget {max_repeats}): {sql}"
+                        for sql, n in collector.repeated_shapes(max_repeats))
+    if problems:
+        pytest.fail(f"Query budget exceeded in {scope}:\n" + '\n'.join(f"- {problem}" for problem in problems)
+                    + f"\nStatements:\n{collector.report()}", pytrace=False)
+
+
+def full_scans(db, sql):
+    """
+    Returns the tables that `sql`'s query plan reads with a plain, index-less SCAN.
+
+    Parameters are bound as NULL, which does not change the plan. Aliases are
+    resolved to table names, and scans of CTEs and subquery results are ignored.
+
+    Args:
+        db (sqlite3.Connection): The connection to explain the statement on.
+        sql (str): The statement as executed, with `?` placeholders.
+
+    Returns:
+        list[str]: The scanned tables, in plan order.
+    """
+    tables = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    aliases = {}
+    for table, alias in _TABLE_REFERENCE.findall(sql):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    scanned = []
+    for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", (None,) * sql.count('?')):
+        match = _SCAN_DETAIL.match(row['detail'])
+        table = aliases.get(match.group(1), match.group(1)) if match else None
+        if table in tables:
+            scanned.append(table)
+    return scanned
+
+
+def disallowed_full_scans(db, sql):
+    """
+    Returns the tables `sql` scans in full that neither `ALLOWED_SCAN_TABLES` nor `ALLOWED_SCAN_STATEMENTS` allow.
+    """
+    shape = ' '.join(sql.split())
+    if shape not in _SCANS_BY_STATEMENT:
+        _SCANS_BY_STATEMENT[shape] = full_scans(db, sql)
+    allowed = set(ALLOWED_SCAN_TABLES)
+    for prefix, (tables, _) in ALLOWED_SCAN_STATEMENTS.items():
+        if shape.startswith(prefix):
+            allowed |= tables
+    return [table for table in _SCANS_BY_STATEMENT[shape] if table not in allowed]
+
+
+@pytest.fixture
+def query_budget(app):
+    """
+    Returns a context manager asserting that the statements executed inside it stay within a budget.
+
+    Usage: `with query_budget(max_queries=2, max_repeats=1): ...`; the
+    collector is yielded for further assertions.
+    """
+    @contextlib.contextmanager
+    def budget(max_queries=None, max_repeats=1):
+        with capture_queries() as collector:
+            yield collector
+        assert_query_budget(collector, max_queries, max_repeats)
+    return budget
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budget(request, app):
+    """
+    Applies the test's `query_budget` marker (or the default repeat budget) to everything the test executes.
+    """
+    marker = request.node.get_closest_marker('query_budget')
+    limits = {'max_queries': None, 'max_repeats': DEFAULT_MAX_REPEATS, **(marker.kwargs if marker else {})}
+    with capture_queries() as collector:
+        yield
+    assert_query_budget(collector, limits['max_queries'], limits['max_repeats'], scope=request.node.name)
+
+
+@pytest.fixture(autouse=True)
+def check_query_plans(request, app):
+    """
+    Fails the test if a statement it executed scans a table in full without an allowance.
+    """
+    with capture_queries(keep_statements=True) as collector:
+        yield
+    db = get_db()
+    problems = [f"- SCAN {', '.join(tables)}: {' '.join(sql.split())}"
+                for sql in sorted(collector.statements) if (tables := disallowed_full_scans(db, sql))]
+    if problems:
+        pytest.fail(f"Full table scan in query plan in {request.node.name}:\n" + '\n'.join(problems), pytrace=False)
@@ -1,4 +1,5 @@
 import pytest
+import json
 from app.repositories.student_repository import student_repository
 from app.repositories.module_repository import module_repository
 from app.repositories.alert_repository import alert_repository
@@ -24,16 +25,18 @@ def sample_module():
         academic_year='2025/2026'
     )
 
-def test_create_and_get_alert(sample_student, sample_module):
+def test_create_and_get_alert(sample_student, sample_module, query_budget):
     """Tests creating and retrieving an alert."""
-    new_alert = alert_repository.create_alert(
-        student_id=sample_student.id,
-        module_id=sample_module.id,
-        week_number=5,
-        reason="Test alert"
-    )
+    with query_budget(max_queries=2): # INSERT, then one re-read by id.
+        new_alert = alert_repository.create_alert(
+            student_id=sample_student.id,
+            module_id=sample_module.id,
+            week_number=5,
+            reason="Test alert"
+        )
     assert new_alert is not None
-    fetched_alert = alert_repository.get_alert_by_id(new_alert.id)
+    with query_budget(max_queries=1):
+        fetched_alert = alert_repository.get_alert_by_id(new_alert.id)
     assert fetched_alert.reason == "Test alert"
 
 def test_mark_alert_resolved(sample_student, sample_module):
@@ -45,3 +48,22 @@ def test_mark_alert_resolved(sample_student, sample_module):
     
     resolved_alert = alert_repository.get_alert_by_id(alert.id)
     assert resolved_alert.resolved is True
+
+@pytest.mark.query_budget(max_repeats=None) # One statement per page, budgeted per page below.
+def test_get_all_alerts_keyset_pagination(query_budget):
+    """Tests that paging through alerts newest-first returns every alert exactly once, in order."""
+    expected = [alert['id'] for alert in alert_repository.get_all_alerts()]
+    seen, cursor = [], None
+    while True:
+        with query_budget(max_queries=1):
+            page = alert_repository.get_all_alerts(page_size=7, cursor=cursor)
+        assert len(page['items']) <= 7
+        seen.extend(alert['id'] for alert in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert seen == expected
+
+def test_iter_all_alerts_json_matches_listing():
+    """Tests that the streamed JSON alerts listing decodes to exactly what get_all_alerts returns."""
+    assert json.loads(b''.join(alert_repository.iter_all_alerts_json(batch_size=10))) == alert_repository.get_all_alerts()
@@ -17,23 +17,30 @@ from app.repositories.survey_response_repository import survey_response_reposito
 
 # --- Unit Tests: Mocking the _execute_query method ---
 
+def _risk_row(student_id, name, avg_attendance=None, avg_grade=None, avg_stress=None,
+              low_attendance=0, low_grade=0, high_stress=0):
+    """Builds a row as returned by the single-pass high-risk query."""
+    return {'id': student_id, 'full_name': name, 'avg_attendance': avg_attendance, 'avg_grade': avg_grade,
+            'avg_stress': avg_stress, 'low_attendance': low_attendance, 'low_grade': low_grade,
+            'high_stress': high_stress}
+
+
 def test_get_high_risk_students_low_attendance(mocker):
     """
     Unit test to verify `get_high_risk_students` correctly identifies
     a high-risk student due to low attendance.
 
-    Mocks the underlying `_execute_query` calls to simulate database responses.
+    Mocks the underlying `_execute_query` call to simulate the database response.
     """
-    # Simulate database responses for low attendance, no low grades, no high stress.
-    mocker.patch.object(analysis_repository, '_execute_query', side_effect=[
-        [{'id': 1, 'full_name': 'John Doe', 'avg_attendance': 60}],  # Low attendance query result
-        [],  # Low grades query result
-        []  # High stress query result
+    mock_query = mocker.patch.object(analysis_repository, '_execute_query', return_value=[
+        _risk_row(1, 'John Doe', avg_attendance=60, avg_grade=55, avg_stress=2, low_attendance=1)
     ])
     high_risk_students = analysis_repository.get_high_risk_students(attendance_threshold=70)
+    assert mock_query.call_count == 1  # One single-pass query, not one per risk factor.
     assert len(high_risk_students) == 1
     assert high_risk_students[0]['id'] == 1
-    assert "Low attendance" in high_risk_students[0]['reason']
+    assert high_risk_students[0]['flags'] == {'low_attendance': True, 'low_grade': False, 'high_stress': False}
+    assert high_risk_students[0]['avg_attendance'] == 60
 
 
 def test_get_high_risk_students_multiple_reasons(mocker):
@@ -41,19 +48,18 @@ def test_get_high_risk_students_multiple_reasons(mocker):
     Unit test to verify `get_high_risk_students` correctly identifies
     a high-risk student with multiple risk factors (low attendance and low grades).
 
-    Mocks the underlying `_execute_query` calls to simulate database responses.
+    Mocks the underlying `_execute_query` call to simulate the database response.
     """
-    # Simulate database responses for low attendance, low grades, no high stress.
-    mocker.patch.object(analysis_repository, '_execute_query', side_effect=[
-        [{'id': 2, 'full_name': 'Jane Smith', 'avg_attendance': 50}],  # Low attendance query result
-        [{'id': 2, 'full_name': 'Jane Smith', 'avg_grade': 35}],  # Low grades query result
-        []  # High stress query result
+    mocker.patch.object(analysis_repository, '_execute_query', return_value=[
+        _risk_row(2, 'Jane Smith', avg_attendance=50, avg_grade=35, low_attendance=1, low_grade=1)
     ])
     high_risk_students = analysis_repository.get_high_risk_students(attendance_threshold=70, grade_threshold=40)
     assert len(high_risk_students) == 1
     assert high_risk_students[0]['id'] == 2
-    assert "Low attendance" in high_risk_students[0]['reason']
-    assert "Low average grade" in high_risk_students[0]['reason']
+    assert high_risk_students[0]['flags']['low_attendance'] is True
+    assert high_risk_students[0]['flags']['low_grade'] is True
+    assert high_risk_students[0]['flags']['high_stress'] is False
+    assert high_risk_students[0]['avg_stress'] is None
 
 
 def test_get_high_risk_students_no_risk(mocker):
@@ -61,14 +67,39 @@ def test_get_high_risk_students_no_risk(mocker):
     Unit test to verify `get_high_risk_students` returns an empty list
     when no students meet the high-risk criteria.
 
-    Mocks the underlying `_execute_query` calls to simulate empty database responses.
+    Mocks the underlying `_execute_query` call to simulate an empty database response.
     """
-    # Simulate empty database responses for all risk queries.
     mocker.patch.object(analysis_repository, '_execute_query', return_value=[])
     high_risk_students = analysis_repository.get_high_risk_students()
     assert len(high_risk_students) == 0
 
 
+def test_get_dashboard_summary_single_statement(mocker):
+    """
+    Unit test to verify `get_dashboard_summary` issues a single statement
+    and maps its columns onto the summary keys.
+    """
+    mock_query = mocker.patch.object(analysis_repository, '_execute_query', return_value={
+        'total_students': 50, 'total_modules': 8, 'pending_alerts_count': 3, 'total_users': 53
+    })
+    summary = analysis_repository.get_dashboard_summary()
+    assert mock_query.call_count == 1
+    assert summary == {'total_students': 50, 'total_modules': 8, 'pending_alerts_count': 3, 'total_users': 53}
+
+
+def test_get_submission_status_distribution_single_statement(mocker):
+    """
+    Unit test to verify `get_submission_status_distribution` counts all statuses
+    in one statement and treats an empty table (NULL sums) as zeros.
+    """
+    mock_query = mocker.patch.object(analysis_repository, '_execute_query', return_value={
+        'on_time_count': None, 'late_count': None, 'not_submitted_count': None
+    })
+    distribution = analysis_repository.get_submission_status_distribution()
+    assert mock_query.call_count == 1
+    assert distribution['data'] == [0, 0, 0]
+
+
 # --- Integration Tests: Interacting with a seeded database ---
 
 def test_get_dashboard_summary_integration():
@@ -89,6 +120,20 @@ def test_get_dashboard_summary_integration():
     # Specific values could be asserted if seed data is deterministic.
 
 
+def test_get_submission_status_distribution_integration():
+    """
+    Integration test for `get_submission_status_distribution`.
+
+    Verifies that the conditional aggregation partitions all active submission records.
+    """
+    distribution = analysis_repository.get_submission_status_distribution()
+    total = analysis_repository._execute_query(
+        "SELECT COUNT(id) FROM submission_records WHERE is_active = 1", fetch_one=True)
+    assert distribution['labels'] == ['Submitted On Time', 'Submitted Late', 'Not Submitted']
+    assert sum(distribution['data']) == total
+    assert total > 0
+
+
 def test_get_stress_grade_correlation_integration():
     """
     Integration test for `get_stress_grade_correlation`.
@@ -112,6 +157,33 @@ def test_get_stress_grade_correlation_integration():
     assert student_in_data
 
 
+
+def test_get_stress_grade_correlation_filters_and_limit():
+    """
+    Integration test for the cohort, module and limit options of `get_stress_grade_correlation`.
+
+    Verifies that per-student averages are computed from separately aggregated
+    surveys and grades (no fan-out) and that the filters restrict the points.
+    """
+    student = student_repository.create_student('S_CORR_2', 'Cohort Student', 'corr2@test.com', 'MSc Cohort', 1)
+    module = module_repository.create_module('CORR102', 'Cohort Correlation', 10, '2025')
+    other_module = module_repository.create_module('CORR103', 'Other Correlation', 10, '2025')
+    survey_response_repository.create_survey_response(student.id, module.id, 1, 2, 7, None)
+    survey_response_repository.create_survey_response(student.id, module.id, 2, 4, 7, None)
+    grade_repository.create_grade(student.id, module.id, "Exam", 60)
+    grade_repository.create_grade(student.id, module.id, "Coursework", 70)
+    grade_repository.create_grade(student.id, other_module.id, "Exam", 10)
+
+    cohort = analysis_repository.get_stress_grade_correlation(course_name='MSc Cohort')
+    assert cohort['labels'] == ['Cohort Student']
+    assert cohort['data'][0]['x'] == 3
+    assert cohort['data'][0]['y'] == pytest.approx(140 / 3)
+
+    by_module = analysis_repository.get_stress_grade_correlation(course_name='MSc Cohort', module_id=module.id)
+    assert by_module['data'][0] == {'x': 3, 'y': 65, 'name': 'Cohort Student'}
+
+    assert len(analysis_repository.get_stress_grade_correlation(limit=1)['data']) == 1
+
 def test_get_grade_distribution_integration():
     """
     Integration test for `get_grade_distribution`.
@@ -139,3 +211,38 @@ def test_get_grade_distribution_integration():
     # Assert that the counts for our new students are reflected (at least 1 in each band).
     assert distribution['data'][fail_index] >= 1
     assert distribution['data'][distinction_index] >= 1
+
+
+def test_get_high_risk_students_integration():
+    """
+    Integration test for `get_high_risk_students`.
+
+    Verifies that a student breaching only the grade threshold is flagged for
+    that reason alone by the single-pass query.
+    """
+    student = student_repository.create_student('S_RISK_1', 'Risk Student', 'risk@test.com', 'MSc Risk', 1)
+    module = module_repository.create_module('RISK101', 'Risk', 10, '2025')
+    grade_repository.create_grade(student.id, module.id, "Exam", 20)
+    survey_response_repository.create_survey_response(student.id, module.id, 1, 1, 8, None)
+
+    high_risk_students = analysis_repository.get_high_risk_students()
+    flagged = next(s for s in high_risk_students if s['id'] == student.id)
+    assert flagged['name'] == 'Risk Student'
+    assert flagged['avg_grade'] == 20
+    assert flagged['flags'] == {'low_attendance': False, 'low_grade': True, 'high_stress': False}
+
+
+def test_get_grade_distribution_custom_bands():
+    """
+    Integration test for `get_grade_distribution` with caller-supplied band edges.
+
+    Verifies that the SQL banding honours arbitrary edges and labels.
+    """
+    student = student_repository.create_student('S_BAND_1', 'Band Student', 'band1@test.com', 'MSc Band', 1)
+    module = module_repository.create_module('BAND101', 'Banding', 10, '2025')
+    grade_repository.create_grade(student.id, module.id, "Exam", 99)
+
+    distribution = analysis_repository.get_grade_distribution([('Below 95', 0), ('95 and above', 95)])
+    assert distribution['labels'] == ['Below 95', '95 and above']
+    assert distribution['data'][1] >= 1
+    assert sum(distribution['data']) == sum(analysis_repository.get_grade_distribution()['data'])
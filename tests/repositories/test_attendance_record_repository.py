@@ -24,10 +24,12 @@ def sample_module():
         academic_year='2025/2026'
     )
 
-def test_create_and_get_attendance_record(sample_student, sample_module):
+def test_create_and_get_attendance_record(sample_student, sample_module, query_budget):
     """Tests creating and retrieving an attendance record."""
-    new_record = attendance_record_repository.create_attendance_record(sample_student.id, sample_module.id, 3, 1, 2)
+    with query_budget(max_queries=2): # INSERT, then one re-read by id.
+        new_record = attendance_record_repository.create_attendance_record(sample_student.id, sample_module.id, 3, 1, 2)
     assert new_record is not None
     
-    fetched_record = attendance_record_repository.get_attendance_record_by_id(new_record.id)
+    with query_budget(max_queries=1):
+        fetched_record = attendance_record_repository.get_attendance_record_by_id(new_record.id)
     assert fetched_record.attendance_rate == 0.5
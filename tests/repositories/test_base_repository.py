@@ -1,8 +1,9 @@
 import pytest
+import json
 import sqlite3
 from datetime import datetime
 from app.repositories.base_repository import BaseRepository
-from app.db_connection import get_db
+from app.db_connection import get_db, get_read_db, transaction
 from app.models.user import User  # Import a sample model for testing
 
 
@@ -126,12 +127,186 @@ def test_delete_hard(app):
         db.commit()
 
         repo = BaseRepository('users', User)
-        # We need to manually commit since the repo no longer does it.
         delete_success = repo.delete_hard(user_id)
-        db.commit()
 
         assert delete_success is True
+        assert db.in_transaction is False # Committed on its own, outside any transaction().
 
         # Verify it's completely gone
         result = repo._execute_query("SELECT id FROM users WHERE id = ?", (user_id,), fetch_one=True)
         assert result is None
+
+
+def test_writes_join_an_open_transaction(app):
+    """
+    Tests that a write commits on its own outside a transaction() and waits for the outermost block inside one.
+    """
+    with app.app_context():
+        db = get_db()
+        repo = BaseRepository('users', User)
+        user_id = repo._execute_insert(
+            "INSERT INTO users (username, password_hash, role, created_at, is_active) VALUES (?, ?, ?, ?, ?)",
+            ('unit_of_work_user', 'hash', 'user', datetime.now().isoformat(), 1))
+        assert db.in_transaction is False
+        with transaction():
+            assert repo._execute_update_delete("UPDATE users SET role = 'admin' WHERE id = ?", (user_id,)) is True
+            assert db.in_transaction is True
+        assert db.in_transaction is False
+        assert repo.get_by_id(user_id).role == 'admin'
+
+
+def test_iter_query_fetches_in_batches(app, mocker):
+    """
+    Tests that iter_query runs lazily, fetches `batch_size` rows per round-trip
+    and yields the same rows as _execute_query.
+    """
+    class SpyCursor(sqlite3.Cursor):
+        """A real cursor whose fetchmany calls can be spied on."""
+        def fetchmany(self, size):
+            return super().fetchmany(size)
+
+    with app.app_context():
+        repo = BaseRepository('survey_responses', None)
+        expected = repo._execute_query("SELECT id FROM survey_responses ORDER BY id")
+        assert len(expected) > 100 # Enough rows for several batches.
+        conn = get_read_db()
+        mock_conn = mocker.MagicMock(wraps=conn)
+        mock_conn.execute.side_effect = lambda query, params=(): conn.cursor(SpyCursor).execute(query, params)
+        mocker.patch('app.repositories.base_repository.get_read_db', return_value=mock_conn)
+        fetchmany = mocker.spy(SpyCursor, 'fetchmany')
+
+        rows = repo.iter_query("SELECT id FROM survey_responses ORDER BY id", batch_size=100)
+        mock_conn.execute.assert_not_called() # Nothing runs until iteration starts.
+        first = next(rows)
+        assert first == expected[0]
+        assert fetchmany.call_count == 1 # Only the first batch has been read so far.
+        assert [first] + list(rows) == expected
+        assert fetchmany.call_count > 1
+        assert all(call.args[1:] == (100,) for call in fetchmany.call_args_list)
+
+
+def test_iter_all_with_model(app):
+    """
+    Tests that iter_all yields model instances and matches get_all.
+    """
+    with app.app_context():
+        repo = BaseRepository('users', User)
+        streamed = list(repo.iter_all(batch_size=2))
+        assert all(isinstance(user, User) for user in streamed)
+        assert [u.id for u in streamed] == [u.id for u in repo.get_all()]
+        assert not isinstance(repo.get_all(stream=True), list)
+
+
+def test_iter_query_raises_exception_on_error(app, mocker):
+    """
+    Tests that iter_query raises the repository's generic exception on a database error.
+    """
+    with app.app_context():
+        mock_conn = mocker.MagicMock()
+        mock_conn.execute.side_effect = sqlite3.Error("Test DB Error")
+        mocker.patch('app.repositories.base_repository.get_read_db', return_value=mock_conn)
+
+        repo = BaseRepository('test_table', None)
+        with pytest.raises(Exception, match="Database operation failed for test_table."):
+            list(repo.iter_query("SELECT * FROM test_table"))
+
+
+def test_get_all_keyset_pagination(app):
+    """
+    Tests that get_all pages by id with opaque cursors and caps the page size.
+    """
+    with app.app_context():
+        repo = BaseRepository('users', User)
+        first = repo.get_all(page_size=2)
+        assert [u.id for u in first['items']] == [u.id for u in repo.get_all()[:2]]
+        second = repo.get_all(page_size=2, cursor=first['next_cursor'])
+        assert second['items'][0].id > first['items'][-1].id
+
+        app.config['DB_MAX_PAGE_SIZE'] = 3
+        try:
+            assert len(repo.get_all(page_size=1000)['items']) == 3
+        finally:
+            app.config['DB_MAX_PAGE_SIZE'] = 500
+
+
+def test_get_all_rejects_invalid_cursor(app):
+    """
+    Tests that a malformed continuation token is rejected with a ValueError.
+    """
+    with app.app_context():
+        repo = BaseRepository('users', User)
+        with pytest.raises(ValueError, match="Invalid pagination cursor."):
+            repo.get_all(cursor='not-a-cursor')
+        with pytest.raises(ValueError, match="Invalid pagination cursor."):
+            repo.get_all(cursor=BaseRepository.encode_cursor((1, 2)))
+
+
+def test_row_mapper_is_compiled_once_per_query_shape(app):
+    """
+    Tests that the compiled row mapper is cached per (model, columns) and matches from_row.
+    """
+    with app.app_context():
+        repo = BaseRepository('users', User)
+        query = "SELECT id, username, role, created_at, is_active FROM users ORDER BY id LIMIT 3"
+        cursor = get_db().execute(query)
+        mapper = repo._row_mapper(cursor)
+        rows = cursor.fetchall()
+        assert repo._row_mapper(get_db().execute(query)) is mapper
+        for row in rows:
+            assert mapper(row).to_dict() == User.from_row(row).to_dict()
+
+        dict_mapper = repo._row_mapper(get_db().execute(query), as_dict=True)
+        assert dict_mapper is not mapper
+        assert [dict_mapper(row) for row in rows] == [dict(row) for row in rows]
+
+
+def test_dict_mapper_keeps_last_duplicate_column(app):
+    """
+    Tests that compiled dict mappers resolve duplicate column names like dict(row).
+    """
+    with app.app_context():
+        repo = BaseRepository('users', None)
+        row = repo._execute_query("SELECT 1 AS id, 2 AS id, 'x' AS name", fetch_one=True)
+        assert row == {'id': 2, 'name': 'x'}
+
+
+def test_iter_all_json_matches_dict_rows(app):
+    """
+    Tests that the zero-hydration JSON stream decodes to the same rows as iter_all with dictionaries.
+    """
+    with app.app_context():
+        repo = BaseRepository('users', User)
+        chunks = list(repo.iter_all_json(batch_size=2))
+        assert len(chunks) > 3  # Brackets plus one chunk per batch.
+        expected = list(repo.iter_query("SELECT * FROM users WHERE is_active = 1", as_dicts=True))
+        assert json.loads(b''.join(chunks)) == expected
+
+
+def test_iter_query_json_raises_exception_on_error(app, mocker):
+    """
+    Tests that iter_query_json raises the repository's generic exception on a database error.
+    """
+    with app.app_context():
+        mock_conn = mocker.MagicMock()
+        mock_conn.cursor.return_value.execute.side_effect = sqlite3.Error("Test DB Error")
+        mocker.patch('app.repositories.base_repository.get_read_db', return_value=mock_conn)
+
+        repo = BaseRepository('test_table', None)
+        with pytest.raises(Exception, match="Database operation failed for test_table."):
+            list(repo.iter_query_json("SELECT * FROM test_table"))
+
+
+@pytest.mark.query_budget(max_repeats=None)
+def test_query_budget_flags_repeated_statements(query_budget):
+    """
+    Tests that the query budget fails a block that issues one query per item (an N+1 pattern).
+    """
+    repo = BaseRepository('users', User)
+    with pytest.raises(pytest.fail.Exception, match="3 executions of one statement shape"):
+        with query_budget(max_repeats=1):
+            for user_id in (1, 2, 3):
+                repo.get_by_id(user_id)
+    with pytest.raises(pytest.fail.Exception, match="2 statements executed, budget is 1"):
+        with query_budget(max_queries=1, max_repeats=None):
+            repo.get_by_id(1)
+            repo.get_all()
@@ -27,11 +27,13 @@ def sample_module():
     )
 
 
-def test_create_and_get_enrolment(sample_student, sample_module):
+def test_create_and_get_enrolment(sample_student, sample_module, query_budget):
     """Tests creating and retrieving an enrolment."""
-    new_enrolment = enrolment_repository.create_enrolment(sample_student.id, sample_module.id)
+    with query_budget(max_queries=2): # INSERT, then one re-read by id.
+        new_enrolment = enrolment_repository.create_enrolment(sample_student.id, sample_module.id)
     assert new_enrolment is not None
 
-    fetched_enrolment = enrolment_repository.get_enrolment_by_id(new_enrolment.id)
+    with query_budget(max_queries=1):
+        fetched_enrolment = enrolment_repository.get_enrolment_by_id(new_enrolment.id)
     assert fetched_enrolment.student_id == sample_student.id
     assert fetched_enrolment.module_id == sample_module.id
@@ -27,10 +27,12 @@ def sample_module():
     )
 
 
-def test_create_and_get_grade(sample_student, sample_module):
+def test_create_and_get_grade(sample_student, sample_module, query_budget):
     """Tests creating and retrieving a grade."""
-    new_grade = grade_repository.create_grade(sample_student.id, sample_module.id, "Final Exam", 88.5)
+    with query_budget(max_queries=2): # INSERT, then one re-read by id.
+        new_grade = grade_repository.create_grade(sample_student.id, sample_module.id, "Final Exam", 88.5)
     assert new_grade is not None
 
-    fetched_grade = grade_repository.get_grade_by_id(new_grade.id)
+    with query_budget(max_queries=1):
+        fetched_grade = grade_repository.get_grade_by_id(new_grade.id)
     assert fetched_grade.grade == 88.5
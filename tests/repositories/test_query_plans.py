@@ -0,0 +1,57 @@
+"""
+EXPLAIN QUERY PLAN regression tests for repository queries.
+
+Every statement executed by the tests in this package is run through
+`EXPLAIN QUERY PLAN` by the `check_query_plans` fixture (see `conftest.py`),
+which fails a test whose statements scan a table in full without an explicit
+allowance. This module exercises the analysis and listing hot paths that
+other tests may not reach, checks the index set, and checks the checker.
+"""
+
+import pytest
+from app.db_connection import get_db
+from app.repositories.analysis_repository import analysis_repository
+from app.repositories.alert_repository import alert_repository
+from app.repositories.student_repository import student_repository
+from app.repositories.survey_response_repository import survey_response_repository
+from utils.schema import INDEX_SET, INDEX_SET_VERSION
+from .conftest import disallowed_full_scans, full_scans
+
+REPOSITORY_CALLS = [
+    ('stress trend', lambda: analysis_repository.get_stress_trend_for_student(1)),
+    ('attendance trend', lambda: analysis_repository.get_attendance_trend_for_student(1)),
+    ('average attendance', lambda: analysis_repository.get_average_attendance_for_student(1)),
+    ('high risk students', lambda: analysis_repository.get_high_risk_students()),
+    ('stress by module', lambda: analysis_repository.get_stress_level_by_module()),
+    ('grade distribution', lambda: analysis_repository.get_grade_distribution()),
+    ('stress/grade correlation', lambda: analysis_repository.get_stress_grade_correlation()),
+    ('alerts by student', lambda: alert_repository.get_alerts_by_student_id(1)),
+    ('alerts page', lambda: alert_repository.get_all_alerts(
+        page_size=5, cursor=alert_repository.get_all_alerts(page_size=5)['next_cursor'])),
+    ('alerts JSON listing', lambda: b''.join(alert_repository.iter_all_alerts_json())),
+    ('student enrolments', lambda: student_repository.get_student_enrolments(1)),
+    ('survey stress/alert checks', lambda: survey_response_repository.create_survey_response(1, 1, 3, 5, 6.0, None)),
+]
+
+
+def test_index_set_is_versioned():
+    """Tests that the seeded database records the current index set version and indexes."""
+    db = get_db()
+    assert db.execute("PRAGMA user_version").fetchone()[0] == INDEX_SET_VERSION
+    existing = {row['name'] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {name for name, _ in INDEX_SET} <= existing
+
+
+def test_full_scans_are_detected():
+    """Tests that the plan check reports index-less scans, resolves aliases, and honours the allowances."""
+    db = get_db()
+    assert full_scans(db, "SELECT * FROM survey_responses sr WHERE sr.mood_comment = ?") == ['survey_responses']
+    assert full_scans(db, "SELECT * FROM survey_responses WHERE student_id = ? AND is_active = 1") == []
+    assert disallowed_full_scans(db, "SELECT * FROM grades WHERE grade > ?") == ['grades']
+    assert disallowed_full_scans(db, "SELECT COUNT(id) FROM students") == []
+
+
+@pytest.mark.parametrize('name, call', REPOSITORY_CALLS, ids=[name for name, _ in REPOSITORY_CALLS])
+def test_repository_queries_do_not_full_scan(name, call):
+    """Tests that the hot repository paths run; `check_query_plans` fails the test on a full scan."""
+    call()
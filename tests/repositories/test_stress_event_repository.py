@@ -27,24 +27,26 @@ def sample_module():
     )
 
 
-def test_create_and_get_stress_event(sample_student, sample_module):
+def test_create_and_get_stress_event(sample_student, sample_module, query_budget):
     """
     Tests that a stress event can be created and then retrieved from the database.
     """
-    new_event = stress_event_repository.create_stress_event(
-        student_id=sample_student.id,
-        module_id=sample_module.id,
-        survey_response_id=None,
-        week_number=8,
-        stress_level=5,
-        cause_category="academic",
-        description="Final exams pressure",
-        source="manual"
-    )
+    with query_budget(max_queries=2): # INSERT, then one re-read by id.
+        new_event = stress_event_repository.create_stress_event(
+            student_id=sample_student.id,
+            module_id=sample_module.id,
+            survey_response_id=None,
+            week_number=8,
+            stress_level=5,
+            cause_category="academic",
+            description="Final exams pressure",
+            source="manual"
+        )
     assert new_event is not None
     assert new_event.id is not None
 
-    fetched_event = stress_event_repository.get_stress_event_by_id(new_event.id)
+    with query_budget(max_queries=1):
+        fetched_event = stress_event_repository.get_stress_event_by_id(new_event.id)
     assert fetched_event is not None
     assert fetched_event.cause_category == "academic"
     assert fetched_event.stress_level == 5
@@ -1,21 +1,23 @@
 import pytest
 from app.repositories.student_repository import student_repository
 
-def test_create_and_get_student():
+def test_create_and_get_student(query_budget):
     """
     Tests that a student can be created and then retrieved from the database.
     """
-    new_student = student_repository.create_student(
-        student_number='S5555',
-        full_name='Repo Test Student',
-        email='repo.student@example.com',
-        course_name='MSc Testing',
-        year_of_study=1
-    )
+    with query_budget(max_queries=2): # INSERT, then one re-read by id.
+        new_student = student_repository.create_student(
+            student_number='S5555',
+            full_name='Repo Test Student',
+            email='repo.student@example.com',
+            course_name='MSc Testing',
+            year_of_study=1
+        )
     assert new_student is not None
     assert new_student.id is not None
     
-    fetched_student = student_repository.get_student_by_id(new_student.id)
+    with query_budget(max_queries=1):
+        fetched_student = student_repository.get_student_by_id(new_student.id)
     assert fetched_student is not None
     assert fetched_student.full_name == 'Repo Test Student'
     assert fetched_student.student_number == 'S5555'
@@ -28,12 +28,14 @@ def sample_module():
     )
 
 
-def test_create_and_get_submission_record(sample_student, sample_module):
+def test_create_and_get_submission_record(sample_student, sample_module, query_budget):
     """Tests creating and retrieving a submission record."""
     due_date = datetime.now().isoformat()
-    new_record = submission_record_repository.create_submission_record(sample_student.id, sample_module.id,
-                                                                       "Coursework 1", due_date, None, False, False)
+    with query_budget(max_queries=2): # INSERT, then one re-read by id.
+        new_record = submission_record_repository.create_submission_record(sample_student.id, sample_module.id,
+                                                                           "Coursework 1", due_date, None, False, False)
     assert new_record is not None
 
-    fetched_record = submission_record_repository.get_submission_record_by_id(new_record.id)
+    with query_budget(max_queries=1):
+        fetched_record = submission_record_repository.get_submission_record_by_id(new_record.id)
     assert fetched_record.assessment_name == "Coursework 1"
@@ -52,12 +52,14 @@ def test_check_for_alert_creation(mocker):
     survey_response_repository._check_for_stress_events_and_alerts(current_high_stress_survey, threshold=4)
     # The call order is: SELECT stress_event, INSERT stress_event, SELECT previous_survey, SELECT alert, INSERT alert
     assert "INSERT INTO alerts" in mock_cursor.call_args_list[4][0][0]
-    assert mock_db.return_value.commit.call_count == 2
+    # The stress event and the alert are committed together as one unit of work.
+    assert mock_db.return_value.commit.call_count == 1
 
 
 def test_no_event_or_alert_on_low_stress(mocker):
     mock_db = mocker.patch('app.repositories.survey_response_repository.get_db')
     mock_execute = mock_db.return_value.execute
+    mock_db.return_value.in_transaction = False # Nothing written, so there is nothing to commit.
     # Simulate finding a low-stress survey from the previous week
     mock_execute.return_value.fetchone.return_value = {'week_number': 5, 'stress_level': 2}
 
@@ -67,3 +69,58 @@ def test_no_event_or_alert_on_low_stress(mocker):
     for call in mock_execute.call_args_list:
         assert "INSERT" not in call[0][0]
     assert mock_db.return_value.commit.call_count == 0
+
+
+def test_check_for_stress_events_and_alerts_query_budget(sample_student, sample_module, query_budget):
+    # Two consecutive high-stress weeks: every check and insert runs once, whatever the data.
+    survey_response_repository.create_survey_response(student_id=sample_student.id, module_id=sample_module.id,
+                                                      week_number=10, stress_level=5, hours_slept=6.0,
+                                                      mood_comment=None)
+    response = survey_response_repository.create_survey_response(student_id=sample_student.id,
+                                                                 module_id=sample_module.id, week_number=11,
+                                                                 stress_level=5, hours_slept=6.0, mood_comment=None)
+    with query_budget(max_queries=5, max_repeats=1) as queries:
+        survey_response_repository._check_for_stress_events_and_alerts(response, threshold=4)
+    # The stress event and alert already exist, so only the three lookups run, each timed through its fetch.
+    assert queries.count == 3
+    assert [record.rows for record in queries.records] == [1, 1, 1]
+
+
+def test_create_survey_responses_bulk(app, sample_student, sample_module, query_budget):
+    from app.db_connection import get_db
+    responses = [
+        {'student_id': sample_student.id, 'module_id': sample_module.id, 'week_number': 20, 'stress_level': 5},
+        {'student_id': sample_student.id, 'module_id': sample_module.id, 'week_number': 21, 'stress_level': 4},
+        {'student_id': sample_student.id, 'module_id': sample_module.id, 'week_number': 22, 'stress_level': 2},
+        {'student_id': sample_student.id, 'module_id': sample_module.id, 'week_number': 23, 'stress_level': 5,
+         'hours_slept': 5.0, 'mood_comment': 'Deadlines'},
+    ]
+    db = get_db()
+    statements = []
+    db.set_trace_callback(statements.append)
+    # A fixed number of set-based statements, however many responses are in the batch.
+    try:
+        with query_budget(max_queries=4, max_repeats=1):
+            counts = survey_response_repository.create_survey_responses_bulk(responses)
+    finally:
+        db.set_trace_callback(None)
+    assert counts == {'survey_responses': 4, 'stress_events': 3, 'alerts': 1}
+    # The write lock is held before the MAX(id) watermark is read.
+    assert statements[0] == "BEGIN IMMEDIATE"
+    assert "MAX(id)" in statements[1]
+
+    alert_weeks = [row[0] for row in db.execute(
+        "SELECT week_number FROM alerts WHERE student_id = ? AND week_number >= 20", (sample_student.id,))]
+    assert alert_weeks == [21]
+
+    # A response following an already stored high-stress week raises an alert only once per student and week.
+    counts = survey_response_repository.create_survey_responses_bulk([
+        {'student_id': sample_student.id, 'module_id': sample_module.id, 'week_number': 24, 'stress_level': 4},
+        {'student_id': sample_student.id, 'module_id': sample_module.id, 'week_number': 24, 'stress_level': 5},
+    ])
+    assert counts == {'survey_responses': 2, 'stress_events': 2, 'alerts': 1}
+
+
+def test_create_survey_responses_bulk_empty():
+    assert survey_response_repository.create_survey_responses_bulk([]) == {
+        'survey_responses': 0, 'stress_events': 0, 'alerts': 0}
@@ -2,11 +2,12 @@ import pytest
 from app.repositories.user_repository import user_repository
 
 
-def test_create_user_in_db():
+def test_create_user_in_db(query_budget):
     """
     Integration test to verify user creation in the database.
     """
-    new_user = user_repository.create_user('repo_test_user', 'password123', 'user')
+    with query_budget(max_queries=2): # INSERT, then one re-read by id.
+        new_user = user_repository.create_user('repo_test_user', 'password123', 'user')
     assert new_user is not None
     assert new_user.id is not None
     assert new_user.username == 'repo_test_user'
@@ -17,18 +18,19 @@ def test_create_user_in_db():
     assert fetched_user.username == 'repo_test_user'
 
 
-def test_get_user_by_username_from_db():
+def test_get_user_by_username_from_db(query_budget):
     """
     Integration test to verify fetching a user by username from the database.
     """
     # The 'admin' user is created by the seed data
-    user = user_repository.get_user_by_username('admin')
+    with query_budget(max_queries=1):
+        user = user_repository.get_user_by_username('admin')
     assert user is not None
     assert user.username == 'admin'
     assert user.role == 'admin'
 
 
-def test_update_user_in_db():
+def test_update_user_in_db(query_budget):
     """
     Integration test to verify updating a user in the database.
     """
@@ -36,7 +38,8 @@ def test_update_user_in_db():
     user_to_update = user_repository.create_user('update_me', 'password', 'user')
 
     # Update the user's role
-    updated_user = user_repository.update_user(user_to_update.id, 'update_me_updated', 'admin', True)
+    with query_budget(max_queries=2): # UPDATE, then one re-read by id.
+        updated_user = user_repository.update_user(user_to_update.id, 'update_me_updated', 'admin', True)
     assert updated_user is not None
     assert updated_user.role == 'admin'
     assert updated_user.username == 'update_me_updated'
@@ -46,7 +49,7 @@ def test_update_user_in_db():
     assert fetched_user.role == 'admin'
 
 
-def test_delete_user_in_db():
+def test_delete_user_in_db(query_budget):
     """
     Integration test to verify logical deletion of a user in the database.
     """
@@ -54,7 +57,8 @@ def test_delete_user_in_db():
     user_to_delete = user_repository.create_user('delete_me', 'password', 'user')
 
     # Perform a logical delete
-    delete_success = user_repository.delete_user(user_to_delete.id)
+    with query_budget(max_queries=1):
+        delete_success = user_repository.delete_user(user_to_delete.id)
     assert delete_success is True
 
     # Verify the user is inactive (should not be found by default)
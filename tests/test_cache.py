@@ -0,0 +1,164 @@
+"""
+Tests for the analysis result cache defined in app/cache.py.
+
+This module covers the LRU/TTL backend, hit/miss metrics and table-version
+invalidation, including the end-to-end path where a committed repository
+write invalidates a cached `AnalysisRepository` result and a rolled-back one
+leaves it untouched.
+"""
+
+import threading
+import pytest
+from flask_jwt_extended import create_access_token
+from app.cache import LRUTTLBackend, ResultCache
+from app.db_connection import get_db, transaction
+from app.metrics import get_metrics
+from app.repositories.analysis_repository import analysis_repository
+from app.repositories.student_repository import student_repository
+from utils.schema import rebuild_student_week_stats
+
+
+@pytest.fixture
+def result_cache(app):
+    """Enables a fresh result cache on the test app for the duration of a test."""
+    cache = ResultCache(LRUTTLBackend(max_entries=16, default_ttl=60))
+    app.extensions['result_cache'] = cache
+    yield cache
+    app.extensions.pop('result_cache', None)
+
+
+def test_backend_evicts_least_recently_used():
+    """Tests that the backend evicts the least recently used entry when full."""
+    backend = LRUTTLBackend(max_entries=2)
+    backend.set('a', 1)
+    backend.set('b', 2)
+    backend.get('a')
+    backend.set('c', 3)
+    assert backend.get('b') is None
+    assert backend.get('a') == 1
+    assert backend.evictions == 1
+
+
+def test_backend_expires_entries():
+    """Tests that entries are not returned once their TTL has passed."""
+    backend = LRUTTLBackend()
+    backend.set('a', 1, ttl=-1)
+    assert backend.get('a', 'missing') == 'missing'
+    assert backend.expirations == 1
+
+
+def test_table_version_bump_invalidates():
+    """Tests that bumping a table's version forces a recompute of dependent results only."""
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'value': len(calls)}
+
+    assert cache.get_or_compute('f', (), ('grades',), compute) == {'value': 1}
+    assert cache.get_or_compute('f', (), ('grades',), compute) == {'value': 1}
+    cache.bump('students')
+    assert cache.get_or_compute('f', (), ('grades',), compute) == {'value': 1}
+    cache.bump('grades')
+    assert cache.get_or_compute('f', (), ('grades',), compute) == {'value': 2}
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 2
+
+
+def test_hit_and_miss_counts_are_thread_safe():
+    """Tests that concurrent lookups are all counted."""
+    cache = ResultCache()
+    cache.get_or_compute('f', (), (), lambda: 1)
+
+    def work():
+        for _ in range(2000):
+            cache.get_or_compute('f', (), (), lambda: 1)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats()['hits'] == 16000
+    assert cache.stats()['misses'] == 1
+
+
+def test_cached_results_are_copies():
+    """Tests that callers mutating a returned result cannot corrupt the cache."""
+    cache = ResultCache()
+    first = cache.get_or_compute('f', (), (), lambda: {'labels': ['a']})
+    first['labels'].append('b')
+    assert cache.get_or_compute('f', (), (), lambda: None) == {'labels': ['a']}
+
+
+def test_repository_write_invalidates_analysis_result(result_cache, mocker):
+    """Tests that an AnalysisRepository result is cached until a repository write touches its tables."""
+    spy = mocker.spy(analysis_repository, '_execute_query')
+    first = analysis_repository.get_dashboard_summary()
+    analysis_repository.get_dashboard_summary()
+    assert spy.call_count == 1
+    assert result_cache.stats()['hits'] == 1
+
+    with transaction():
+        student_repository.create_student('S_CACHE_1', 'Cache Student', 'cache@test.com', 'MSc Cache', 1)
+    second = analysis_repository.get_dashboard_summary()
+    analysis_repository.get_dashboard_summary()
+    assert spy.call_count == 2
+    assert second['total_students'] == first['total_students'] + 1
+
+
+def test_table_versions_are_bumped_only_after_commit(result_cache):
+    """Tests that a write invalidates cached results when its unit of work commits, not when it executes."""
+    first = analysis_repository.get_dashboard_summary()
+    version = result_cache.table_version('students')
+    with transaction():
+        student_repository.create_student('S_CACHE_2', 'Cache Student', 'cache2@test.com', 'MSc Cache', 1)
+        assert result_cache.table_version('students') == version
+        # Uncommitted writes are visible inside the unit of work but bypass the cache.
+        assert analysis_repository.get_dashboard_summary()['total_students'] == first['total_students'] + 1
+        assert result_cache.stats()['misses'] == 1
+    assert result_cache.table_version('students') == version + 1
+    assert analysis_repository.get_dashboard_summary()['total_students'] == first['total_students'] + 1
+
+
+def test_rolled_back_write_is_not_cached(result_cache):
+    """Tests that a rolled-back write neither invalidates nor leaks into cached results."""
+    first = analysis_repository.get_dashboard_summary()
+    version = result_cache.table_version('students')
+    with pytest.raises(RuntimeError):
+        with transaction():
+            student_repository.create_student('S_CACHE_3', 'Cache Student', 'cache3@test.com', 'MSc Cache', 1)
+            assert analysis_repository.get_dashboard_summary()['total_students'] == first['total_students'] + 1
+            raise RuntimeError("Abort the unit of work.")
+    assert result_cache.table_version('students') == version
+    assert analysis_repository.get_dashboard_summary() == first
+    assert result_cache.stats()['hits'] == 1
+
+
+def test_lookups_are_exported_as_metrics(result_cache, client):
+    """Tests that hits and misses are counted per cached function and served at the metrics endpoint."""
+    name = ('AnalysisRepository.get_dashboard_summary',)
+    hits, misses = get_metrics().get('result_cache_hits_total'), get_metrics().get('result_cache_misses_total')
+    hits_before, misses_before = hits.value(name), misses.value(name)
+    analysis_repository.get_dashboard_summary()
+    analysis_repository.get_dashboard_summary()
+    assert (hits.value(name), misses.value(name)) == (hits_before + 1, misses_before + 1)
+
+    token = create_access_token(identity='1', additional_claims={'role': 'admin'})
+    text = client.get('/api/admin/metrics', headers={'Authorization': f"Bearer {token}"}).get_data(as_text=True)
+    assert f'result_cache_hits_total{{function="{name[0]}"}} {hits_before + 1}' in text
+    assert f'result_cache_misses_total{{function="{name[0]}"}} {misses_before + 1}' in text
+
+
+def test_summary_rebuild_invalidates_analysis_results(result_cache, mocker):
+    """Tests that rebuilding student_week_stats invalidates the cached results read from it."""
+    spy = mocker.spy(analysis_repository, '_execute_query')
+    analysis_repository.get_overall_attendance_rate()
+    analysis_repository.get_overall_attendance_rate()
+    assert spy.call_count == 1
+    version = result_cache.table_version('student_week_stats')
+    rebuild_student_week_stats(get_db())
+    assert result_cache.table_version('student_week_stats') == version + 1
+    analysis_repository.get_overall_attendance_rate()
+    assert spy.call_count == 2
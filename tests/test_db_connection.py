@@ -0,0 +1,203 @@
+"""
+Tests for database connection management and the SQLite connection pool.
+
+This module verifies that `get_db()` borrows connections from the
+application's `ConnectionPool`, that `close_db()` returns them, and that the
+pool itself enforces its size bound, health checks and rollback-on-release.
+It also covers the read-only connections from `get_read_db()` and their
+read-your-writes fallback to the write connection.
+"""
+
+import sqlite3
+import pytest
+from app.db_pool import ConnectionPool
+from app.db_connection import get_db, get_pool, get_read_db, get_read_pool, transaction
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """Creates a small standalone pool against a temporary database file."""
+    pool = ConnectionPool(str(tmp_path / 'pool.sqlite'), max_size=2, timeout=0.05)
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.commit()
+    pool.release(conn)
+    yield pool
+    pool.close()
+
+
+def test_get_db_reuses_pooled_connection(app):
+    """Tests that consecutive application contexts reuse the same pooled connection."""
+    with app.app_context():
+        first = get_db()
+    with app.app_context():
+        second = get_db()
+    assert first is second
+    assert get_pool(app).idle >= 1
+
+
+def test_pool_reuses_connection(pool):
+    """Tests that a released connection is handed out again."""
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+    assert pool.size == 1
+
+
+def test_release_rolls_back_uncommitted_work(pool):
+    """Tests that uncommitted changes do not survive a round-trip through the pool."""
+    conn = pool.acquire()
+    conn.execute("INSERT INTO items (name) VALUES ('uncommitted')")
+    pool.release(conn)
+
+    conn = pool.acquire()
+    assert conn.in_transaction is False
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+    pool.release(conn)
+
+
+def test_pool_is_bounded(pool):
+    """Tests that acquiring beyond max_size times out with a ConnectionError."""
+    held = [pool.acquire(), pool.acquire()]
+    with pytest.raises(ConnectionError):
+        pool.acquire()
+    for conn in held:
+        pool.release(conn)
+
+
+def test_unhealthy_connection_is_replaced(pool):
+    """Tests that a connection failing the health check is discarded and replaced."""
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close() # Simulate a connection broken while idle.
+
+    replacement = pool.acquire()
+    assert replacement is not conn
+    assert replacement.execute("SELECT 1").fetchone()[0] == 1
+    assert pool.size == 1
+    pool.release(replacement)
+
+
+def test_get_db_applies_pragma_profile(app):
+    """Tests that new connections are opened with the configured PRAGMA profile."""
+    with app.app_context():
+        db = get_db()
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert db.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert db.execute("PRAGMA busy_timeout").fetchone()[0] == app.config['SQLITE_PRAGMAS']['busy_timeout']
+
+
+def test_pool_applies_pragmas_once_per_connection(tmp_path):
+    """Tests that a standalone pool configures its connections with the given PRAGMAs."""
+    pool = ConnectionPool(str(tmp_path / 'pragmas.sqlite'), pragmas={'journal_mode': 'WAL', 'synchronous': 'NORMAL'})
+    conn = pool.acquire()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1 # NORMAL
+    pool.release(conn)
+    pool.close()
+
+
+def test_transaction_commits_once_on_exit(app):
+    """Tests that writes inside nested units of work are committed once, by the outermost block."""
+    with app.app_context():
+        db = get_db()
+        db.execute("CREATE TABLE IF NOT EXISTS uow_items (name TEXT)")
+        db.commit()
+        commits = []
+        db.set_trace_callback(lambda sql: commits.append(sql) if sql.strip().upper() == 'COMMIT' else None)
+        with transaction():
+            db.execute("INSERT INTO uow_items VALUES ('outer')")
+            with transaction():
+                db.execute("INSERT INTO uow_items VALUES ('inner')")
+            assert commits == []
+        db.set_trace_callback(None)
+        assert len(commits) == 1
+        assert db.in_transaction is False
+
+
+def test_nested_transaction_rolls_back_to_savepoint(app):
+    """Tests that a failing nested unit of work only undoes its own writes."""
+    with app.app_context():
+        db = get_db()
+        db.execute("CREATE TABLE IF NOT EXISTS uow_items (name TEXT)")
+        db.execute("DELETE FROM uow_items")
+        db.commit()
+        with transaction():
+            db.execute("INSERT INTO uow_items VALUES ('kept')")
+            with pytest.raises(RuntimeError):
+                with transaction():
+                    db.execute("INSERT INTO uow_items VALUES ('discarded')")
+                    raise RuntimeError("inner failure")
+        assert [row[0] for row in db.execute("SELECT name FROM uow_items")] == ['kept']
+
+
+def test_transaction_rolls_back_on_error(app):
+    """Tests that an exception in the outermost unit of work discards all of its writes."""
+
+    @transaction()
+    def failing_job():
+        get_db().execute("INSERT INTO uow_items VALUES ('lost')")
+        raise ValueError("job failed")
+
+    with app.app_context():
+        db = get_db()
+        db.execute("CREATE TABLE IF NOT EXISTS uow_items (name TEXT)")
+        db.execute("DELETE FROM uow_items")
+        db.commit()
+        with pytest.raises(ValueError):
+            failing_job()
+        assert db.execute("SELECT COUNT(*) FROM uow_items").fetchone()[0] == 0
+
+
+def test_immediate_transaction_takes_the_write_lock_first(app):
+    """Tests that an immediate unit of work holds the write lock before it writes anything."""
+    with app.app_context():
+        other = sqlite3.connect(app.config['DATABASE_PATH'], timeout=0)
+        try:
+            with transaction(immediate=True) as db:
+                db.execute("SELECT COUNT(*) FROM students").fetchone()
+                with pytest.raises(sqlite3.OperationalError, match="locked"):
+                    other.execute("BEGIN IMMEDIATE")
+            other.execute("BEGIN IMMEDIATE") # Released by the commit.
+            other.rollback()
+        finally:
+            other.close()
+
+
+def test_read_db_is_a_separate_read_only_connection(app):
+    """Tests that reads get their own query_only connection with the read PRAGMA profile."""
+    with app.app_context():
+        read_db = get_read_db()
+        assert read_db is not get_db()
+        assert read_db is get_read_db() # Reused within the application context.
+        assert read_db.execute("PRAGMA query_only").fetchone()[0] == 1
+        assert read_db.execute("PRAGMA cache_size").fetchone()[0] == app.config['SQLITE_READ_PRAGMAS']['cache_size']
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            read_db.execute("CREATE TABLE read_only_probe (x INTEGER)")
+    assert get_read_pool(app).idle >= 1 # Returned to the read pool on teardown.
+
+
+def test_read_db_falls_back_to_write_connection_in_transaction(app):
+    """Tests that reads see the context's own uncommitted writes, and committed writes afterwards."""
+    with app.app_context():
+        db = get_db()
+        db.execute("CREATE TABLE IF NOT EXISTS uow_items (name TEXT)")
+        db.execute("DELETE FROM uow_items")
+        db.commit()
+        with transaction():
+            db.execute("INSERT INTO uow_items VALUES ('pending')")
+            assert get_read_db() is db
+            assert get_read_db().execute("SELECT COUNT(*) FROM uow_items").fetchone()[0] == 1
+        read_db = get_read_db()
+        assert read_db is not db
+        assert read_db.execute("SELECT COUNT(*) FROM uow_items").fetchone()[0] == 1
+
+
+def test_read_db_can_be_disabled(app):
+    """Tests that all queries use the write connection when DB_READ_CONNECTIONS_ENABLED is off."""
+    app.config['DB_READ_CONNECTIONS_ENABLED'] = False
+    try:
+        with app.app_context():
+            assert get_read_db() is get_db()
+    finally:
+        app.config['DB_READ_CONNECTIONS_ENABLED'] = True
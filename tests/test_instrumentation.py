@@ -0,0 +1,159 @@
+"""
+Tests for the per-request query instrumentation defined in app/instrumentation.py.
+
+This module covers SQL normalization, the request-scoped collector fed by
+the repositories, the slow-query log and the query statistics headers.
+"""
+
+import logging
+from flask import g
+from app import create_app
+from config import config
+from app.instrumentation import QueryCollector, capture_queries, get_query_collector, normalize_sql, record_query, timed_execute
+from app.db_connection import get_db
+from app.repositories.student_repository import student_repository
+
+
+def test_normalize_sql_replaces_literals_and_whitespace():
+    """Tests that statements differing only in literals and layout have the same shape."""
+    a = normalize_sql("SELECT * FROM students\n   WHERE id = 42 AND name = 'O''Brien'")
+    b = normalize_sql("SELECT * FROM students WHERE id = 7 AND name = 'x'")
+    assert a == b == "SELECT * FROM students WHERE id = ? AND name = ?"
+
+
+def test_normalize_sql_keeps_identifiers_and_collapses_lists():
+    """Tests that digits inside identifiers are kept and IN lists of any length collapse."""
+    assert normalize_sql("SAVEPOINT uow_1") == "SAVEPOINT uow_1"
+    assert normalize_sql("SELECT * FROM t WHERE id IN (?, ?, ?)") == normalize_sql("SELECT * FROM t WHERE id IN (?,?)")
+
+
+def test_collector_caps_records_but_not_totals():
+    """Tests that the collector keeps counting past `max_records`."""
+    collector = QueryCollector(max_records=2)
+    for _ in range(3):
+        collector.add("SELECT 1", 0.5, 1)
+    assert collector.count == 3
+    assert collector.total_time == 1.5
+    assert len(collector.records) == 2
+
+
+def test_collector_reports_repeated_shapes():
+    """Tests that shapes executed more than `max_repeats` times are reported, most repeated first."""
+    collector = QueryCollector()
+    for student_id in (1, 2, 3):
+        collector.add(f"SELECT * FROM grades WHERE student_id = {student_id}", 0.001)
+    collector.add("SELECT * FROM students", 0.001)
+    collector.add("SELECT * FROM students", 0.001)
+    assert collector.repeated_shapes() == [("SELECT * FROM grades WHERE student_id = ?", 3),
+                                           ("SELECT * FROM students", 2)]
+    assert collector.repeated_shapes(max_repeats=2) == [("SELECT * FROM grades WHERE student_id = ?", 3)]
+
+
+def test_capture_queries_isolates_block_and_merges_into_request(app):
+    """Tests that a captured block gets its own collector and its statements still count for the request."""
+    g.pop('query_collector', None)
+    student_repository.get_all()
+    with capture_queries() as block:
+        student_repository.get_all()
+        student_repository.get_all()
+    assert block.count == 2
+    assert get_query_collector().count == 3
+
+
+def test_capture_queries_can_keep_statements_verbatim(app):
+    """Tests that kept statements are stored as executed and collected from nested blocks too."""
+    with capture_queries(keep_statements=True) as outer:
+        with capture_queries():
+            student_repository.get_all()
+    assert outer.statements == {"SELECT * FROM students WHERE is_active = 1"}
+
+
+def test_repository_queries_are_recorded(app):
+    """Tests that repository reads are recorded with their normalized SQL and row counts."""
+    g.pop('query_collector', None)
+    students = student_repository.get_all()
+    student_repository.get_student_enrolments(students[0].id)
+    records = get_query_collector().records
+    assert records[0].sql == "SELECT * FROM students WHERE is_active = ?"
+    assert records[0].rows == len(students)
+    assert records[1].sql.startswith("SELECT e.id, e.student_id")
+    assert get_query_collector().count == 2
+
+
+def test_record_query_accepts_a_measured_duration(app):
+    """Tests that a duration measured by the caller is recorded as given."""
+    g.pop('query_collector', None)
+    record_query("SELECT * FROM students", rows=3, duration=0.25)
+    assert get_query_collector().records[0] == ("SELECT * FROM students", 0.25, 3)
+
+
+def test_streamed_query_records_fetch_time_and_rows(app):
+    """Tests that a streamed query is recorded once, with its rows and the time spent in SQLite."""
+    g.pop('query_collector', None)
+    rows = list(student_repository.iter_query("SELECT * FROM students", batch_size=2))
+    record = get_query_collector().records[0]
+    assert get_query_collector().count == 1
+    assert record.rows == len(rows)
+    assert 0 < record.duration < 1
+
+
+def test_timed_execute_records_rowcount(app):
+    """Tests that `timed_execute` records the rows changed by a write."""
+    g.pop('query_collector', None)
+    db = get_db()
+    timed_execute(db, "CREATE TEMP TABLE scratch (x INTEGER)")
+    timed_execute(db, "INSERT INTO scratch (x) VALUES (?)", [(1,), (2,)], many=True)
+    timed_execute(db, "DROP TABLE scratch")
+    assert get_query_collector().records[1].rows == 2
+
+
+def test_slow_queries_are_logged_with_route(app, caplog):
+    """Tests that statements over the threshold are logged as warnings with the request route."""
+    app.config['SLOW_QUERY_THRESHOLD_MS'] = 0
+    try:
+        with app.test_request_context('/api/students'), caplog.at_level(logging.WARNING):
+            student_repository.get_all()
+    finally:
+        app.config['SLOW_QUERY_THRESHOLD_MS'] = 100
+    assert "Slow query" in caplog.text
+    assert "on route /api/students: SELECT * FROM students WHERE is_active = ?" in caplog.text
+
+
+def test_instrumentation_can_be_disabled(app):
+    """Tests that nothing is collected when QUERY_STATS_ENABLED is off."""
+    g.pop('query_collector', None)
+    app.config['QUERY_STATS_ENABLED'] = False
+    try:
+        student_repository.get_all()
+        assert get_query_collector() is None
+        assert 'query_collector' not in g
+    finally:
+        app.config['QUERY_STATS_ENABLED'] = True
+
+
+def _app_with_students_route(**settings):
+    """Creates a testing app with a route listing students, to exercise the response headers."""
+    stats_app = create_app('testing')
+    stats_app.config.update(settings)
+
+    @stats_app.route('/_students')
+    def list_students():
+        return {'count': len(student_repository.get_all())}
+
+    return stats_app
+
+
+def test_responses_carry_query_stats_headers(app):
+    """Tests that responses report the request's query count and database time."""
+    response = _app_with_students_route().test_client().get('/_students')
+    assert response.status_code == 200
+    assert response.headers['X-DB-Query-Count'] == '1'
+    assert float(response.headers['X-DB-Time-Ms']) >= 0
+
+
+def test_production_does_not_expose_query_stats_headers(app):
+    """Tests that the headers are off in production and absent when QUERY_STATS_HEADERS is off."""
+    assert config['production'].QUERY_STATS_HEADERS is False
+    response = _app_with_students_route(QUERY_STATS_HEADERS=False).test_client().get('/_students')
+    assert response.status_code == 200
+    assert 'X-DB-Query-Count' not in response.headers
@@ -0,0 +1,130 @@
+"""
+Tests for the in-process metrics registry defined in app/metrics.py.
+
+This module covers counters, fixed-bucket histograms and their quantile
+estimates, thread safety, the Prometheus text rendering, the request and
+repository hooks, and the admin-only metrics endpoint.
+"""
+
+import threading
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.metrics import Histogram, MetricsRegistry, get_metrics
+from app.repositories.alert_repository import alert_repository
+from app.repositories.student_repository import student_repository
+
+
+def _auth_header(role):
+    """Returns an Authorization header with an access token carrying `role`."""
+    return {'Authorization': f"Bearer {create_access_token(identity='1', additional_claims={'role': role})}"}
+
+
+def test_histogram_buckets_and_quantiles():
+    """Tests that observations land in the right buckets and quantiles are interpolated within them."""
+    histogram = Histogram('latency_seconds', 'Latency.', buckets=(0.1, 0.2, 0.4))
+    for value in [0.05] * 50 + [0.15] * 45 + [0.3] * 4 + [1.0]:
+        histogram.observe(value)
+    assert histogram.count() == 100
+    assert histogram.quantile(0.5) == 0.1
+    assert 0.1 < histogram.quantile(0.95) <= 0.2
+    assert 0.2 < histogram.quantile(0.99) <= 0.4
+    assert histogram.quantile(1.0) == 0.4 # Observations past the last bound report that bound.
+    assert Histogram('empty', 'Empty.').quantile(0.5) is None
+
+
+def test_observations_are_thread_safe():
+    """Tests that concurrent observations and increments are never lost."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram('op_seconds', 'Op latency.', ('op',))
+    counter = registry.counter('ops_total', 'Ops.', ('op',))
+
+    def work():
+        for i in range(5000):
+            histogram.observe(i / 10000, ('a',))
+            counter.inc(('a',))
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert histogram.count(('a',)) == 40000
+    assert counter.value(('a',)) == 40000
+
+
+def test_render_prometheus_text_format():
+    """Tests the exposition format: help/type lines, cumulative buckets, sum, count and escaping."""
+    registry = MetricsRegistry()
+    registry.counter('jobs_total', 'Jobs run.', ('name',)).inc(('say "hi"',), 2)
+    histogram = registry.histogram('job_seconds', 'Job latency.', ('name',), buckets=(0.5, 1))
+    histogram.observe(0.25, ('x',))
+    histogram.observe(0.75, ('x',))
+    text = registry.render()
+    assert '# TYPE jobs_total counter\njobs_total{name="say \\"hi\\""} 2\n' in text
+    assert '# HELP job_seconds Job latency.\n# TYPE job_seconds histogram\n' in text
+    assert 'job_seconds_bucket{name="x",le="0.5"} 1\n' in text
+    assert 'job_seconds_bucket{name="x",le="1"} 2\n' in text
+    assert 'job_seconds_bucket{name="x",le="+Inf"} 2\n' in text
+    assert 'job_seconds_sum{name="x"} 1\n' in text
+    assert 'job_seconds_count{name="x"} 2\n' in text
+
+
+def test_registry_rejects_conflicting_types():
+    """Tests that a name cannot be registered as two different metric types."""
+    registry = MetricsRegistry()
+    registry.counter('things', 'Things.')
+    with pytest.raises(ValueError):
+        registry.histogram('things', 'Things.')
+
+
+def test_repository_methods_are_observed_once(app):
+    """Tests that repository methods are timed per class, and super() delegation is not double counted."""
+    histogram = get_metrics().get('repository_method_duration_seconds')
+    before = histogram.count(('StudentRepository', 'get_all'))
+    student_repository.get_all()
+    assert histogram.count(('StudentRepository', 'get_all')) == before + 1
+
+    # AlertRepository.get_by_id delegates to BaseRepository.get_by_id.
+    before = histogram.count(('AlertRepository', 'get_by_id'))
+    alert_repository.get_by_id(1)
+    assert histogram.count(('AlertRepository', 'get_by_id')) == before + 1
+
+
+def test_metrics_endpoint_is_admin_only(client, app):
+    """Tests that the metrics endpoint requires an admin token."""
+    assert client.get('/api/admin/metrics').status_code == 401
+    response = client.get('/api/admin/metrics', headers=_auth_header('student'))
+    assert response.status_code == 403
+
+
+def test_metrics_endpoint_reports_requests(client, app):
+    """Tests that requests are counted and timed per route, and exposed in the text format."""
+    headers = _auth_header('admin')
+    client.get('/api/admin/metrics', headers=headers)
+    response = client.get('/api/admin/metrics', headers=headers)
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    text = response.get_data(as_text=True)
+    assert 'http_requests_total{blueprint="admin",route="/api/admin/metrics",method="GET",status="200"}' in text
+    assert 'http_request_duration_seconds_count{blueprint="admin",route="/api/admin/metrics",method="GET"}' in text
+    assert 'repository_method_duration_seconds_bucket{repository="StudentRepository"' in text
+
+
+def test_unhandled_exceptions_are_counted_as_500(app):
+    """Tests that a request whose view raises is counted and timed as a 500, even if the exception propagates."""
+    failing_app = create_app('testing') # Propagates exceptions, so no after_request hook runs.
+
+    @failing_app.route('/_fail')
+    def fail():
+        raise RuntimeError("view failed")
+
+    with pytest.raises(RuntimeError):
+        failing_app.test_client().get('/_fail')
+    failing_app.config['PROPAGATE_EXCEPTIONS'] = False
+    assert failing_app.test_client().get('/_fail').status_code == 500
+
+    registry = failing_app.extensions['metrics']
+    assert registry.get('http_requests_total').value(('', '/_fail', 'GET', '500')) == 2
+    assert registry.get('http_request_duration_seconds').count(('', '/_fail', 'GET')) == 2
+    assert 'http_requests_total{blueprint="",route="/_fail",method="GET",status="500"} 2' in registry.render()
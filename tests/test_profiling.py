@@ -0,0 +1,85 @@
+"""
+Tests for the sampling request profiler defined in app/profiling.py.
+
+This module covers sampled and admin-requested profiling, the per-route
+`.pstats` layout and rotation, and the merged hot-spot report.
+"""
+
+import os
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.profiling import init_app as init_profiling, profile_report, route_slug
+
+
+@pytest.fixture
+def profiled_app(tmp_path):
+    """Creates a testing app with profiling enabled, writing to a temporary directory, and two routes."""
+    profiled_app = create_app('testing')
+    profiled_app.config.update(PROFILING_ENABLED=True, PROFILE_SAMPLE_RATE=0.0, PROFILE_DIR=str(tmp_path),
+                               PROFILE_MAX_FILES_PER_ROUTE=3)
+    # The hooks are only registered at creation time when profiling is enabled, so register them now.
+    init_profiling(profiled_app)
+
+    @profiled_app.route('/_work/<int:n>')
+    def work(n):
+        return {'total': sum(i * i for i in range(n))}
+
+    return profiled_app
+
+
+def _profiles(directory, slug):
+    """Returns the names of the profiles written for a route."""
+    path = os.path.join(directory, slug)
+    return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+
+def test_route_slug():
+    """Tests that routes map to filesystem-safe directory names."""
+    assert route_slug('GET', '/api/analysis/students/<int:id>') == 'GET_api_analysis_students_int_id'
+    assert route_slug('GET', '/') == 'GET_root'
+
+
+def test_unsampled_requests_are_not_profiled(profiled_app):
+    """Tests that nothing is written when the sample rate is zero and no profile is requested."""
+    profiled_app.test_client().get('/_work/10')
+    assert _profiles(profiled_app.config['PROFILE_DIR'], 'GET_work_int_n') == []
+
+
+def test_sampled_requests_are_profiled_per_route_and_rotated(profiled_app):
+    """Tests that sampled requests are written to their route's directory, keeping only the newest files."""
+    profiled_app.config['PROFILE_SAMPLE_RATE'] = 1.0
+    client = profiled_app.test_client()
+    for n in range(5):
+        assert client.get(f'/_work/{n}').status_code == 200
+    files = _profiles(profiled_app.config['PROFILE_DIR'], 'GET_work_int_n')
+    assert len(files) == 3
+    assert all(name.endswith('.pstats') for name in files)
+
+
+def test_profile_header_requires_admin(profiled_app):
+    """Tests that the profile header is honoured for admins only."""
+    client = profiled_app.test_client()
+    with profiled_app.app_context():
+        student_token = create_access_token(identity='2', additional_claims={'role': 'student'})
+        admin_token = create_access_token(identity='1', additional_claims={'role': 'admin'})
+
+    client.get('/_work/10', headers={'X-Profile-Request': '1'})
+    client.get('/_work/10', headers={'X-Profile-Request': '1', 'Authorization': f"Bearer {student_token}"})
+    assert _profiles(profiled_app.config['PROFILE_DIR'], 'GET_work_int_n') == []
+
+    client.get('/_work/10', headers={'X-Profile-Request': '1', 'Authorization': f"Bearer {admin_token}"})
+    assert len(_profiles(profiled_app.config['PROFILE_DIR'], 'GET_work_int_n')) == 1
+
+
+def test_profile_report_merges_profiles(profiled_app):
+    """Tests that the report merges a route's profiles and lists the view among the hot spots."""
+    profiled_app.config['PROFILE_SAMPLE_RATE'] = 1.0
+    client = profiled_app.test_client()
+    client.get('/_work/1000')
+    client.get('/_work/2000')
+    count, report = profile_report(profiled_app.config['PROFILE_DIR'], route='work', limit=50)
+    assert count == 2
+    assert 'cumulative' in report
+    assert 'work' in report
+    assert profile_report(profiled_app.config['PROFILE_DIR'], route='no_such_route') == (0, '')
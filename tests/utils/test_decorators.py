@@ -4,3 +4,49 @@ Unit tests for the custom Flask decorators defined in app.utils.decorators.
 This module specifically tests the `role_required` decorator to ensure
 it correctly enforces role-based access control on Flask endpoints.
 """
+
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.utils.decorators import role_required
+
+
+def _app_with_protected_route():
+    """Creates a testing app with a route restricted to admins and course directors."""
+    protected_app = create_app('testing')
+
+    @protected_app.route('/_protected')
+    @role_required('admin', 'course_director')
+    def protected():
+        return {'ok': True}
+
+    return protected_app
+
+
+def _token(app, role):
+    """Creates an access token carrying `role` as its role claim."""
+    with app.app_context():
+        return create_access_token(identity='1', additional_claims={'role': role})
+
+
+def test_role_required_allows_listed_roles(app):
+    """Tests that users with one of the listed roles can access the view."""
+    protected_app = _app_with_protected_route()
+    for role in ('admin', 'course_director'):
+        response = protected_app.test_client().get(
+            '/_protected', headers={'Authorization': f"Bearer {_token(protected_app, role)}"})
+        assert response.status_code == 200
+        assert response.get_json() == {'ok': True}
+
+
+def test_role_required_forbids_other_roles(app):
+    """Tests that users with another role receive a 403."""
+    protected_app = _app_with_protected_route()
+    response = protected_app.test_client().get(
+        '/_protected', headers={'Authorization': f"Bearer {_token(protected_app, 'student')}"})
+    assert response.status_code == 403
+
+
+def test_role_required_rejects_missing_token(app):
+    """Tests that requests without a JWT are rejected as unauthorized."""
+    response = _app_with_protected_route().test_client().get('/_protected')
+    assert response.status_code == 401
@@ -0,0 +1,42 @@
+"""
+Unit tests for the streaming JSON helpers defined in app.utils.json_stream.
+
+This module checks that batches of row tuples are spliced into one valid JSON
+array, with and without orjson, and that the array is served as a streamed
+`application/json` response.
+"""
+
+import json
+from app.utils import json_stream
+
+
+def test_iter_json_array_splices_batches():
+    """Tests that several batches (and empty ones) encode to one JSON array of objects."""
+    columns = ('id', 'reason', 'score')
+    batches = [[(1, 'Stress "high"', 4.5), (2, None, 1)], [], [(3, 'naïve', 0)]]
+    chunks = list(json_stream.iter_json_array(columns, batches))
+    assert chunks[0] == b'[' and chunks[-1] == b']'
+    assert json.loads(b''.join(chunks)) == [
+        {'id': 1, 'reason': 'Stress "high"', 'score': 4.5},
+        {'id': 2, 'reason': None, 'score': 1},
+        {'id': 3, 'reason': 'naïve', 'score': 0},
+    ]
+    assert b''.join(json_stream.iter_json_array(columns, [])) == b'[]'
+
+
+def test_stdlib_fallback_matches_orjson(mocker):
+    """Tests that the standard library fallback produces the same bytes as orjson."""
+    rows = [[(1, 'a', 2.5, None), (2, 'é', 0, 'x')]]
+    columns = ('id', 'name', 'value', 'note')
+    with_orjson = b''.join(json_stream.iter_json_array(columns, rows))
+    mocker.patch.object(json_stream, 'orjson', None)
+    assert b''.join(json_stream.iter_json_array(columns, rows)) == with_orjson
+
+
+def test_json_array_response_streams(app):
+    """Tests that the chunks are served as a streamed application/json response."""
+    with app.test_request_context():
+        response = json_stream.json_array_response(iter([b'[', b'{"id":1}', b']']))
+        assert response.is_streamed
+        assert response.mimetype == 'application/json'
+        assert json.loads(b''.join(response.response)) == [{'id': 1}]
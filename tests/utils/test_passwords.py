@@ -0,0 +1,55 @@
+"""
+Unit tests for the password hashing helpers defined in app.utils.passwords.
+
+This module checks that the configured hashing method is applied, that bulk
+hashing salts every password individually (inline and across a process
+pool), and that the bulk user-provisioning path stores verifiable hashes.
+"""
+
+import pytest
+from werkzeug.security import check_password_hash
+from app.utils import passwords
+from app.repositories.user_repository import user_repository
+
+
+def test_hash_password_uses_configured_method(app):
+    """Tests that hashes use PASSWORD_HASH_METHOD inside an app context and scrypt outside one."""
+    with app.app_context():
+        assert app.config['PASSWORD_HASH_METHOD'] == 'pbkdf2:sha256:1000'
+        assert passwords.hash_password('secret').startswith('pbkdf2:sha256:1000$')
+    assert passwords.hash_password('secret', method='pbkdf2:sha256:2000').startswith('pbkdf2:sha256:2000$')
+
+
+def test_hash_passwords_salts_each_password(app, mocker):
+    """Tests that bulk hashing keeps the input order and never reuses a salt, with and without a pool."""
+    with app.app_context():
+        inline = passwords.hash_passwords(['same', 'same', 'other'])
+        assert len(set(inline)) == 3
+        assert [check_password_hash(h, p) for h, p in zip(inline, ['same', 'same', 'other'])] == [True] * 3
+
+        pool = mocker.spy(passwords, 'ProcessPoolExecutor')
+        words = [f"password{i}" for i in range(passwords.PARALLEL_HASH_MIN_PASSWORDS)]
+        hashed = passwords.hash_passwords(words, workers=2)
+        assert pool.call_count == 1
+        assert all(check_password_hash(h, w) for h, w in zip(hashed, words))
+
+
+def test_create_users_bulk(app):
+    """Tests that bulk-provisioned users are stored with verifiable, per-user password hashes."""
+    with app.app_context():
+        created = user_repository.create_users_bulk([
+            {'username': 'bulk_user_1', 'password': 'first'},
+            {'username': 'bulk_user_2', 'password': 'second', 'role': 'course_director'},
+        ])
+        assert created == 2
+        first = user_repository.get_user_by_username('bulk_user_1')
+        second = user_repository.get_user_by_username('bulk_user_2')
+        assert first.check_password('first') and not first.check_password('second')
+        assert second.check_password('second') and second.role == 'course_director'
+        assert user_repository.create_users_bulk([]) == 0
+
+        # A duplicate username rolls back the whole batch.
+        with pytest.raises(Exception, match="Failed to bulk insert users."):
+            user_repository.create_users_bulk([{'username': 'bulk_user_3', 'password': 'x'},
+                                               {'username': 'bulk_user_1', 'password': 'x'}])
+        assert user_repository.get_user_by_username('bulk_user_3') is None
@@ -0,0 +1,73 @@
+"""
+Tests for the schema objects defined in utils/schema.py.
+
+This module verifies that the trigger-maintained `student_week_stats`
+summary table stays consistent with the raw survey and attendance rows
+across the repository create, update and delete paths, and that a full
+rebuild produces the same aggregates.
+"""
+
+import pytest
+from app.db_connection import get_db
+from app.repositories.student_repository import student_repository
+from app.repositories.module_repository import module_repository
+from app.repositories.survey_response_repository import survey_response_repository
+from app.repositories.attendance_record_repository import attendance_record_repository
+from utils.schema import rebuild_student_week_stats
+
+
+@pytest.fixture(scope="module")
+def sample_student():
+    return student_repository.create_student('S_STATS_TEST', 'Stats Test Student', 'stats.test@example.com',
+                                             'MSc Stats', 1)
+
+
+@pytest.fixture(scope="module")
+def sample_module():
+    return module_repository.create_module('STATS101', 'Stats Testing', 15, '2025')
+
+
+def _stats(student_id, module_id, week_number):
+    row = get_db().execute(
+        "SELECT * FROM student_week_stats WHERE student_id = ? AND module_id = ? AND week_number = ?",
+        (student_id, module_id, week_number)).fetchone()
+    return dict(row) if row else None
+
+
+def test_survey_writes_maintain_stats(sample_student, sample_module):
+    """Tests that survey inserts, updates and logical deletes keep the weekly stress stats current."""
+    first = survey_response_repository.create_survey_response(sample_student.id, sample_module.id, 1, 2, 7, None)
+    second = survey_response_repository.create_survey_response(sample_student.id, sample_module.id, 1, 4, 7, None)
+    stats = _stats(sample_student.id, sample_module.id, 1)
+    assert (stats['stress_sum'], stats['stress_count'], stats['stress_min'], stats['stress_max']) == (6, 2, 2, 4)
+
+    survey_response_repository.update_survey_response(second.id, sample_student.id, sample_module.id, 2, 5, 7, None)
+    assert _stats(sample_student.id, sample_module.id, 1)['stress_max'] == 2
+    assert _stats(sample_student.id, sample_module.id, 2)['stress_sum'] == 5
+
+    survey_response_repository.delete_survey_response(first.id)
+    assert _stats(sample_student.id, sample_module.id, 1) is None
+
+
+def test_attendance_writes_maintain_stats(sample_student, sample_module):
+    """Tests that attendance inserts and updates keep the weekly attendance stats current."""
+    record = attendance_record_repository.create_attendance_record(sample_student.id, sample_module.id, 3, 1, 2)
+    attendance_record_repository.create_attendance_record(sample_student.id, sample_module.id, 3, 2, 2)
+    stats = _stats(sample_student.id, sample_module.id, 3)
+    assert stats['attendance_count'] == 2
+    assert stats['attendance_sum'] == pytest.approx(1.5)
+    assert (stats['attendance_min'], stats['attendance_max']) == (0.5, 1.0)
+
+    attendance_record_repository.update_attendance_record(record.id, sample_student.id, sample_module.id, 3, 0, 2)
+    stats = _stats(sample_student.id, sample_module.id, 3)
+    assert stats['attendance_sum'] == pytest.approx(1.0)
+    assert stats['attendance_min'] == 0.0
+
+
+def test_rebuild_matches_incremental_stats(sample_student, sample_module):
+    """Tests that rebuilding the summary table reproduces the trigger-maintained aggregates."""
+    db = get_db()
+    incremental = [tuple(row) for row in db.execute("SELECT * FROM student_week_stats ORDER BY 1, 2, 3")]
+    rebuild_student_week_stats(db)
+    rebuilt = [tuple(row) for row in db.execute("SELECT * FROM student_week_stats ORDER BY 1, 2, 3")]
+    assert rebuilt == incremental
@@ -0,0 +1,94 @@
+"""
+Tests for the parameterized demo data generator in utils/seed_data.py.
+
+This module checks that the generated data set has the requested dimensions,
+does not depend on how students are chunked into transactions or split across
+worker processes, and that the
+indexes and summary table built after loading match the loaded rows.
+"""
+
+import os
+import pytest
+from flask import current_app
+from app.db_connection import get_db
+from utils.schema import INDEX_SET, INDEX_SET_VERSION
+from utils.seed_data import seed_data, assessment_due_weeks
+
+SEEDED_TABLES = ['students', 'modules', 'enrolments', 'attendance_records', 'survey_responses',
+                 'submission_records', 'grades', 'stress_events', 'alerts', 'student_week_stats']
+
+
+def _snapshot():
+    """Returns every seeded row (users without their salted password hashes)."""
+    db = get_db()
+    snapshot = {table: [tuple(row) for row in db.execute(f"SELECT * FROM {table} ORDER BY 1, 2, 3")]
+                for table in SEEDED_TABLES}
+    snapshot['users'] = [tuple(row) for row in db.execute(
+        "SELECT id, username, role, student_id, created_at FROM users ORDER BY id")]
+    return snapshot
+
+
+@pytest.fixture(scope="module")
+def reseed_default():
+    """Restores the default demo data set for the tests that run after this module's."""
+    yield
+    seed_data()
+
+
+def test_seed_data_dimensions_and_chunking(reseed_default):
+    """Tests that the generator honours its parameters and that chunking does not change the data."""
+    seed_data(students=6, modules=10, weeks=3, assessments=3, seed=7, chunk_size=4)
+    chunked = _snapshot()
+    assert len(chunked['students']) == 6
+    assert len(chunked['modules']) == 10
+    assert {row[3] for row in chunked['attendance_records']} == {1, 2, 3}
+    assert len(chunked['grades']) == 3 * len(chunked['enrolments'])
+    assert len(chunked['survey_responses']) == 3 * len(chunked['enrolments'])
+
+    seed_data(students=6, modules=10, weeks=3, assessments=3, seed=7, chunk_size=100)
+    assert _snapshot() == chunked
+
+    seed_data(students=6, modules=10, weeks=3, assessments=3, seed=8, chunk_size=4)
+    assert _snapshot()['survey_responses'] != chunked['survey_responses']
+
+
+def test_seed_data_is_identical_across_worker_counts(reseed_default):
+    """Tests that sharded generation in worker processes produces exactly the single-process data."""
+    seed_data(students=7, weeks=3, seed=11, chunk_size=3, workers=1)
+    single = _snapshot()
+    seed_data(students=7, weeks=3, seed=11, chunk_size=3, workers=2)
+    assert _snapshot() == single
+    db_dir = os.path.dirname(os.path.abspath(current_app.config['DATABASE_PATH']))
+    assert not [name for name in os.listdir(db_dir) if name.startswith('seed-shards-')]  # Scratch shards removed.
+
+
+def test_seed_data_builds_indexes_and_stats_after_loading(reseed_default):
+    """Tests that the index set, triggers and student_week_stats exist and agree with the loaded rows."""
+    seed_data(students=5, weeks=4, chunk_size=2)
+    db = get_db()
+    assert db.execute("PRAGMA user_version").fetchone()[0] == INDEX_SET_VERSION
+    existing = {row['name'] for row in db.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+    assert {name for name, _ in INDEX_SET} <= existing
+    assert 'trg_survey_responses_stats_insert' in existing
+
+    expected = db.execute("""
+        SELECT student_id, module_id, week_number, SUM(stress_level), COUNT(*)
+        FROM survey_responses GROUP BY student_id, module_id, week_number ORDER BY 1, 2, 3
+    """).fetchall()
+    stats = db.execute("""
+        SELECT student_id, module_id, week_number, stress_sum, stress_count
+        FROM student_week_stats ORDER BY 1, 2, 3
+    """).fetchall()
+    assert [tuple(row) for row in stats] == [tuple(row) for row in expected]
+
+    # Every stress event points at the high-stress survey it was generated from.
+    assert db.execute("""
+        SELECT COUNT(*) FROM stress_events e JOIN survey_responses s ON s.id = e.survey_response_id
+        WHERE s.student_id = e.student_id AND s.week_number = e.week_number AND s.stress_level >= 4
+    """).fetchone()[0] == db.execute("SELECT COUNT(*) FROM stress_events").fetchone()[0]
+
+
+def test_assessment_due_weeks():
+    """Tests that assessments are spread over the term, matching the original weeks 4 and 8."""
+    assert assessment_due_weeks(2, 10) == [4, 8]
+    assert assessment_due_weeks(1, 1) == [1]
@@ -0,0 +1,313 @@
+"""
+Utility module for schema objects layered on top of the base tables.
+
+The base tables are created by `utils/seed_data.seed_data()`. This module
+owns the secondary index set that backs the repositories' student, module,
+week and `is_active` access paths, so that those lookups are index searches
+rather than full table scans. It also owns the `student_week_stats` summary
+table and the triggers that keep it current.
+
+The index set is versioned through SQLite's `user_version` header field.
+Whenever `INDEX_SET` changes, bump `INDEX_SET_VERSION`; `ensure_indexes()`
+then drops the previously known indexes and rebuilds the current set on
+existing databases.
+"""
+
+from app.db_connection import mark_tables_written, transaction
+
+# Version of the index set below. Bump whenever an index is added, removed or changed.
+INDEX_SET_VERSION = 2
+
+# Secondary indexes, as (name, CREATE statement) pairs.
+# Partial indexes (`WHERE is_active = 1`) only contain live rows; SQLite uses them
+# for any query whose WHERE clause includes `is_active = 1`.
+INDEX_SET = [
+    # Survey responses: per-student trends and the previous-week lookup in
+    # SurveyResponseRepository._check_for_stress_events_and_alerts.
+    ("idx_survey_responses_student_module_week",
+     "CREATE INDEX IF NOT EXISTS idx_survey_responses_student_module_week "
+     "ON survey_responses (student_id, module_id, week_number) WHERE is_active = 1"),
+    # Survey responses: per-module stress aggregation.
+    ("idx_survey_responses_module_stress",
+     "CREATE INDEX IF NOT EXISTS idx_survey_responses_module_stress "
+     "ON survey_responses (module_id, stress_level) WHERE is_active = 1"),
+    # Attendance records: per-student trends and averages.
+    ("idx_attendance_records_student_module_week",
+     "CREATE INDEX IF NOT EXISTS idx_attendance_records_student_module_week "
+     "ON attendance_records (student_id, module_id, week_number) WHERE is_active = 1"),
+    # Grades: per-student averages.
+    ("idx_grades_student_module",
+     "CREATE INDEX IF NOT EXISTS idx_grades_student_module "
+     "ON grades (student_id, module_id) WHERE is_active = 1"),
+    # Alerts: per-student listings and the duplicate-alert check.
+    ("idx_alerts_student_week",
+     "CREATE INDEX IF NOT EXISTS idx_alerts_student_week "
+     "ON alerts (student_id, week_number) WHERE is_active = 1"),
+    # Alerts: newest-first keyset pagination in AlertRepository.get_all_alerts.
+    ("idx_alerts_created_id",
+     "CREATE INDEX IF NOT EXISTS idx_alerts_created_id "
+     "ON alerts (COALESCE(created_at, ''), id) WHERE is_active = 1"),
+    # Stress events: duplicate check by survey response (not filtered on is_active).
+    ("idx_stress_events_survey_response",
+     "CREATE INDEX IF NOT EXISTS idx_stress_events_survey_response "
+     "ON stress_events (survey_response_id)"),
+    # Stress events: per-student listings.
+    ("idx_stress_events_student_week",
+     "CREATE INDEX IF NOT EXISTS idx_stress_events_student_week "
+     "ON stress_events (student_id, week_number) WHERE is_active = 1"),
+    # Enrolments: a student's modules.
+    ("idx_enrolments_student_module",
+     "CREATE INDEX IF NOT EXISTS idx_enrolments_student_module "
+     "ON enrolments (student_id, module_id) WHERE is_active = 1"),
+    # Submission records: per-student listings.
+    ("idx_submission_records_student_module",
+     "CREATE INDEX IF NOT EXISTS idx_submission_records_student_module "
+     "ON submission_records (student_id, module_id) WHERE is_active = 1"),
+    # Users: the account linked to a student.
+    ("idx_users_student",
+     "CREATE INDEX IF NOT EXISTS idx_users_student ON users (student_id)"),
+]
+
+# Names of indexes from every earlier version of the index set, so that
+# upgrades can drop indexes that are no longer part of INDEX_SET.
+RETIRED_INDEXES = []
+
+
+def create_indexes(cursor):
+    """
+    Creates the current index set and records its version.
+
+    Args:
+        cursor (sqlite3.Cursor | sqlite3.Connection): The cursor or connection to execute on.
+    """
+    for _, statement in INDEX_SET:
+        cursor.execute(statement)
+    cursor.execute(f"PRAGMA user_version = {INDEX_SET_VERSION}")
+
+
+def ensure_indexes(db):
+    """
+    Brings an existing database up to the current index set version.
+
+    Does nothing if the database already records `INDEX_SET_VERSION`.
+    Otherwise drops every known index (current and retired) and recreates
+    the current set in one unit of work (see `transaction()` in
+    `app/db_connection.py`). Indexes do not change any query's results, so
+    no cached results are invalidated.
+
+    Args:
+        db (sqlite3.Connection): The database connection.
+
+    Returns:
+        bool: True if the index set was (re)built, False if it was already current.
+    """
+    current_version = db.execute("PRAGMA user_version").fetchone()[0]
+    if current_version == INDEX_SET_VERSION:
+        return False
+    with transaction(db):
+        for name in RETIRED_INDEXES + [name for name, _ in INDEX_SET]:
+            db.execute(f"DROP INDEX IF EXISTS {name}")
+        create_indexes(db)
+    return True
+
+
+# ==========================================================================
+# Per-student weekly summary table.
+# ==========================================================================
+# `student_week_stats` holds running sums, counts, minima and maxima of stress
+# levels (from survey_responses) and attendance rates (from attendance_records)
+# per (student, module, week), over active rows only. Surveys without a module
+# are stored under module_id 0 so that the key never contains NULL.
+#
+# Triggers keep the table current for every write path (repositories, bulk
+# loads, seeding): inserts of active rows are folded in incrementally, while
+# updates and deletes recompute the affected groups from the raw rows, since
+# minima and maxima cannot be maintained by subtraction.
+
+STUDENT_WEEK_STATS_TABLE = """
+    CREATE TABLE IF NOT EXISTS student_week_stats (
+        student_id INTEGER NOT NULL,
+        module_id INTEGER NOT NULL DEFAULT 0,
+        week_number INTEGER NOT NULL,
+        stress_sum INTEGER NOT NULL DEFAULT 0,
+        stress_count INTEGER NOT NULL DEFAULT 0,
+        stress_min INTEGER,
+        stress_max INTEGER,
+        attendance_sum REAL NOT NULL DEFAULT 0,
+        attendance_count INTEGER NOT NULL DEFAULT 0,
+        attendance_min REAL,
+        attendance_max REAL,
+        PRIMARY KEY (student_id, module_id, week_number)
+    )
+"""
+
+STUDENT_WEEK_STATS_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_student_week_stats_module ON student_week_stats (module_id)",
+]
+
+# Recomputes one group's stress columns from survey_responses. {key} is OLD or NEW.
+_RECOMPUTE_STRESS = """
+        INSERT INTO student_week_stats (student_id, module_id, week_number,
+                                        stress_sum, stress_count, stress_min, stress_max)
+        SELECT {key}.student_id, COALESCE({key}.module_id, 0), {key}.week_number,
+               COALESCE(SUM(stress_level), 0), COUNT(stress_level), MIN(stress_level), MAX(stress_level)
+        FROM survey_responses
+        WHERE student_id = {key}.student_id AND module_id IS {key}.module_id
+          AND week_number = {key}.week_number AND is_active = 1
+        ON CONFLICT (student_id, module_id, week_number) DO UPDATE SET
+            stress_sum = excluded.stress_sum, stress_count = excluded.stress_count,
+            stress_min = excluded.stress_min, stress_max = excluded.stress_max;
+"""
+
+# Recomputes one group's attendance columns from attendance_records. {key} is OLD or NEW.
+_RECOMPUTE_ATTENDANCE = """
+        INSERT INTO student_week_stats (student_id, module_id, week_number,
+                                        attendance_sum, attendance_count, attendance_min, attendance_max)
+        SELECT {key}.student_id, {key}.module_id, {key}.week_number,
+               COALESCE(SUM(attendance_rate), 0), COUNT(attendance_rate), MIN(attendance_rate), MAX(attendance_rate)
+        FROM attendance_records
+        WHERE student_id = {key}.student_id AND module_id = {key}.module_id
+          AND week_number = {key}.week_number AND is_active = 1
+        ON CONFLICT (student_id, module_id, week_number) DO UPDATE SET
+            attendance_sum = excluded.attendance_sum, attendance_count = excluded.attendance_count,
+            attendance_min = excluded.attendance_min, attendance_max = excluded.attendance_max;
+"""
+
+# Removes a group once neither source table has active rows for it. {key} is OLD or NEW.
+_PRUNE_EMPTY = """
+        DELETE FROM student_week_stats
+        WHERE student_id = {key}.student_id AND module_id = COALESCE({key}.module_id, 0)
+          AND week_number = {key}.week_number AND stress_count = 0 AND attendance_count = 0;
+"""
+
+STUDENT_WEEK_STATS_TRIGGERS = [
+    ("trg_survey_responses_stats_insert", """
+        CREATE TRIGGER IF NOT EXISTS trg_survey_responses_stats_insert
+        AFTER INSERT ON survey_responses WHEN NEW.is_active = 1
+        BEGIN
+            INSERT INTO student_week_stats (student_id, module_id, week_number,
+                                            stress_sum, stress_count, stress_min, stress_max)
+            VALUES (NEW.student_id, COALESCE(NEW.module_id, 0), NEW.week_number,
+                    NEW.stress_level, 1, NEW.stress_level, NEW.stress_level)
+            ON CONFLICT (student_id, module_id, week_number) DO UPDATE SET
+                stress_sum = stress_sum + excluded.stress_sum,
+                stress_count = stress_count + 1,
+                stress_min = MIN(COALESCE(stress_min, excluded.stress_min), excluded.stress_min),
+                stress_max = MAX(COALESCE(stress_max, excluded.stress_max), excluded.stress_max);
+        END
+    """),
+    ("trg_survey_responses_stats_update", f"""
+        CREATE TRIGGER IF NOT EXISTS trg_survey_responses_stats_update
+        AFTER UPDATE OF student_id, module_id, week_number, stress_level, is_active ON survey_responses
+        BEGIN
+            {_RECOMPUTE_STRESS.format(key='OLD')}
+            {_RECOMPUTE_STRESS.format(key='NEW')}
+            {_PRUNE_EMPTY.format(key='OLD')}
+            {_PRUNE_EMPTY.format(key='NEW')}
+        END
+    """),
+    ("trg_survey_responses_stats_delete", f"""
+        CREATE TRIGGER IF NOT EXISTS trg_survey_responses_stats_delete
+        AFTER DELETE ON survey_responses
+        BEGIN
+            {_RECOMPUTE_STRESS.format(key='OLD')}
+            {_PRUNE_EMPTY.format(key='OLD')}
+        END
+    """),
+    ("trg_attendance_records_stats_insert", """
+        CREATE TRIGGER IF NOT EXISTS trg_attendance_records_stats_insert
+        AFTER INSERT ON attendance_records WHEN NEW.is_active = 1
+        BEGIN
+            INSERT INTO student_week_stats (student_id, module_id, week_number,
+                                            attendance_sum, attendance_count, attendance_min, attendance_max)
+            VALUES (NEW.student_id, NEW.module_id, NEW.week_number,
+                    COALESCE(NEW.attendance_rate, 0), NEW.attendance_rate IS NOT NULL,
+                    NEW.attendance_rate, NEW.attendance_rate)
+            ON CONFLICT (student_id, module_id, week_number) DO UPDATE SET
+                attendance_sum = attendance_sum + excluded.attendance_sum,
+                attendance_count = attendance_count + excluded.attendance_count,
+                attendance_min = MIN(COALESCE(attendance_min, excluded.attendance_min),
+                                     COALESCE(excluded.attendance_min, attendance_min)),
+                attendance_max = MAX(COALESCE(attendance_max, excluded.attendance_max),
+                                     COALESCE(excluded.attendance_max, attendance_max));
+        END
+    """),
+    ("trg_attendance_records_stats_update", f"""
+        CREATE TRIGGER IF NOT EXISTS trg_attendance_records_stats_update
+        AFTER UPDATE OF student_id, module_id, week_number, attendance_rate, is_active ON attendance_records
+        BEGIN
+            {_RECOMPUTE_ATTENDANCE.format(key='OLD')}
+            {_RECOMPUTE_ATTENDANCE.format(key='NEW')}
+            {_PRUNE_EMPTY.format(key='OLD')}
+            {_PRUNE_EMPTY.format(key='NEW')}
+        END
+    """),
+    ("trg_attendance_records_stats_delete", f"""
+        CREATE TRIGGER IF NOT EXISTS trg_attendance_records_stats_delete
+        AFTER DELETE ON attendance_records
+        BEGIN
+            {_RECOMPUTE_ATTENDANCE.format(key='OLD')}
+            {_PRUNE_EMPTY.format(key='OLD')}
+        END
+    """),
+]
+
+
+def create_summary_tables(cursor):
+    """
+    Creates the `student_week_stats` table, its index and its maintenance triggers.
+
+    All statements are idempotent, so this is safe to run on an existing database.
+
+    Args:
+        cursor (sqlite3.Cursor | sqlite3.Connection): The cursor or connection to execute on.
+    """
+    cursor.execute(STUDENT_WEEK_STATS_TABLE)
+    for statement in STUDENT_WEEK_STATS_INDEXES:
+        cursor.execute(statement)
+    for _, statement in STUDENT_WEEK_STATS_TRIGGERS:
+        cursor.execute(statement)
+
+
+def rebuild_student_week_stats(db):
+    """
+    Rebuilds `student_week_stats` from scratch out of the raw survey and attendance rows.
+
+    Used for backfills (e.g., after loading data with the triggers absent, or on
+    a database created before the summary table existed). Creates the table and
+    triggers if they are missing and refills it in one unit of work (see
+    `transaction()` in `app/db_connection.py`); its commit invalidates the
+    cached results derived from `student_week_stats`.
+
+    Args:
+        db (sqlite3.Connection): The database connection.
+
+    Returns:
+        int: The number of (student, module, week) groups in the rebuilt table.
+    """
+    with transaction(db):
+        create_summary_tables(db)
+        db.execute("DELETE FROM student_week_stats")
+        db.execute("""
+            INSERT INTO student_week_stats (student_id, module_id, week_number,
+                                            stress_sum, stress_count, stress_min, stress_max)
+            SELECT student_id, COALESCE(module_id, 0), week_number,
+                   SUM(stress_level), COUNT(stress_level), MIN(stress_level), MAX(stress_level)
+            FROM survey_responses
+            WHERE is_active = 1
+            GROUP BY student_id, COALESCE(module_id, 0), week_number
+        """)
+        db.execute("""
+            INSERT INTO student_week_stats (student_id, module_id, week_number,
+                                            attendance_sum, attendance_count, attendance_min, attendance_max)
+            SELECT student_id, module_id, week_number,
+                   COALESCE(SUM(attendance_rate), 0), COUNT(attendance_rate), MIN(attendance_rate), MAX(attendance_rate)
+            FROM attendance_records
+            WHERE is_active = 1
+            GROUP BY student_id, module_id, week_number
+            ON CONFLICT (student_id, module_id, week_number) DO UPDATE SET
+                attendance_sum = excluded.attendance_sum, attendance_count = excluded.attendance_count,
+                attendance_min = excluded.attendance_min, attendance_max = excluded.attendance_max
+        """)
+        mark_tables_written('student_week_stats', db=db)
+    return db.execute("SELECT COUNT(*) FROM student_week_stats").fetchone()[0]
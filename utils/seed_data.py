@@ -4,16 +4,73 @@ Utility module for seeding the database with initial and demo data.
 This script is crucial for setting up a development or testing environment
 by creating the necessary database schema and populating it with realistic
 sample data. It ensures a consistent starting state for the application.
+
+The demo data set is parameterized (students, modules, weeks, assessments and
+random seed), so the same generator produces the small default data set used
+in development and tests as well as load-testing databases with millions of
+attendance and survey rows. Students are generated and loaded in chunks, so
+memory use is bounded by the chunk size rather than by the data set size.
 """
 
+import os
 import random
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, timedelta, datetime
-from app.db_connection import get_db
-from werkzeug.security import generate_password_hash
+from app.db_connection import get_db, transaction
+from utils.schema import create_indexes, rebuild_student_week_stats
+from app.cache import clear_result_cache
+from app.utils.passwords import hash_password, hash_passwords, password_hash_method
 import sqlite3 # Explicitly import sqlite3 for specific error handling.
 from flask import current_app # Used for logging within the Flask application context.
 
-def generate_random_datetime_in_range(start_date: date, end_date: date) -> datetime:
+# Dimensions of the default demo data set.
+DEFAULT_STUDENTS = 50
+DEFAULT_MODULES = 8
+DEFAULT_WEEKS = 10
+DEFAULT_ASSESSMENTS = 2
+DEFAULT_SEED = 42
+
+# Time anchors for the generated academic term.
+TERM_START_DATE = date(2025, 2, 3)
+REGISTRATION_PERIOD_END = TERM_START_DATE - timedelta(days=10)
+REGISTRATION_PERIOD_START = REGISTRATION_PERIOD_END - timedelta(days=60)
+
+MODULE_TITLES = [
+    "Introduction to Programming", "Data Structures and Algorithms", "Database Systems",
+    "Machine Learning Fundamentals", "Deep Learning Basics", "Data Visualisation",
+    "Software Engineering", "AI Ethics and Society",
+]
+COURSE_OPTIONS = ["MSc Applied AI", "MSc Data Science", "MSc Cyber Security"]
+
+# Columns of the generated rows for each table, in load order (`is_active` and
+# `alerts.resolved` take their column defaults). Survey responses carry explicit IDs
+# so that their stress events can reference them.
+SEED_COLUMNS = {
+    'students': ('id', 'student_number', 'full_name', 'email', 'course_name', 'year_of_study'),
+    'users': ('username', 'password_hash', 'role', 'student_id', 'created_at'),
+    'enrolments': ('student_id', 'module_id', 'enrol_date'),
+    'attendance_records': ('student_id', 'module_id', 'week_number', 'attended_sessions', 'total_sessions', 'attendance_rate'),
+    'survey_responses': ('id', 'student_id', 'module_id', 'week_number', 'stress_level', 'hours_slept', 'mood_comment', 'created_at'),
+    'submission_records': ('student_id', 'module_id', 'assessment_name', 'due_date', 'submitted_date', 'is_submitted', 'is_late'),
+    'grades': ('student_id', 'module_id', 'assessment_name', 'grade'),
+    'stress_events': ('student_id', 'module_id', 'survey_response_id', 'week_number', 'stress_level', 'cause_category',
+                      'description', 'source', 'created_at'),
+    'alerts': ('student_id', 'module_id', 'week_number', 'reason', 'created_at'),
+}
+
+# Columns holding survey response IDs, which shards number from 1 and the merge offsets.
+SURVEY_ID_COLUMNS = {('survey_responses', 'id'), ('stress_events', 'survey_response_id')}
+
+def insert_statement(table):
+    """
+    Returns the INSERT statement for one generated row of `table` (see `SEED_COLUMNS`).
+    """
+    columns = SEED_COLUMNS[table]
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+def generate_random_datetime_in_range(start_date: date, end_date: date, rng=random) -> datetime:
     """
     Generates a random datetime object within a specified date range.
 
@@ -23,6 +80,7 @@ def generate_random_datetime_in_range(start_date: date, end_date: date) -> datet
     Args:
         start_date (date): The beginning of the date range (inclusive).
         end_date (date): The end of the date range (inclusive).
+        rng (random.Random, optional): The random number generator to draw from. Defaults to the `random` module.
 
     Returns:
         datetime: A randomly generated datetime object within the given range.
@@ -30,31 +88,400 @@ def generate_random_datetime_in_range(start_date: date, end_date: date) -> datet
     # Calculate the total time difference in seconds between the start and end dates.
     time_difference = datetime.combine(end_date, datetime.max.time()) - datetime.combine(start_date, datetime.min.time())
     # Generate a random number of seconds within this difference.
-    random_seconds = random.randint(0, int(time_difference.total_seconds()))
+    random_seconds = rng.randint(0, int(time_difference.total_seconds()))
     # Add the random seconds to the start date to get a random datetime.
     return datetime.combine(start_date, datetime.min.time()) + timedelta(seconds=random_seconds)
 
-def seed_data():
+def create_tables(cursor):
+    """
+    Drops and recreates all base tables, without secondary indexes or triggers.
+
+    Indexes and the summary table triggers are created by `seed_data()` after
+    the data is loaded, which is much faster than maintaining them row by row.
+
+    Args:
+        cursor (sqlite3.Cursor | sqlite3.Connection): The cursor or connection to execute on.
+    """
+    drop_statements = [
+        "DROP TABLE IF EXISTS student_week_stats;",
+        "DROP TABLE IF EXISTS stress_events;",
+        "DROP TABLE IF EXISTS alerts;",
+        "DROP TABLE IF EXISTS grades;",
+        "DROP TABLE IF EXISTS submission_records;",
+        "DROP TABLE IF EXISTS attendance_records;",
+        "DROP TABLE IF EXISTS survey_responses;",
+        "DROP TABLE IF EXISTS enrolments;",
+        "DROP TABLE IF EXISTS modules;",
+        "DROP TABLE IF EXISTS users;",
+        "DROP TABLE IF EXISTS students;",
+    ]
+    for stmt in drop_statements:
+        cursor.execute(stmt)
+    cursor.execute("""
+        CREATE TABLE students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_number TEXT NOT NULL UNIQUE,
+            full_name TEXT NOT NULL,
+            email TEXT,
+            course_name TEXT,
+            year_of_study INTEGER,
+            is_active INTEGER NOT NULL DEFAULT 1
+        );
+    """)
+    cursor.execute("""
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL,
+            student_id INTEGER,
+            created_at TEXT,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE SET NULL
+        );
+    """)
+    cursor.execute("""
+        CREATE TABLE modules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            module_code TEXT NOT NULL UNIQUE,
+            module_title TEXT NOT NULL,
+            credit INTEGER,
+            academic_year TEXT,
+            is_active INTEGER NOT NULL DEFAULT 1
+        );
+    """)
+    cursor.execute("""
+        CREATE TABLE enrolments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            module_id INTEGER NOT NULL,
+            enrol_date TEXT,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+            FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE CASCADE
+        );
+    """)
+    cursor.execute("""
+        CREATE TABLE attendance_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            module_id INTEGER NOT NULL,
+            week_number INTEGER NOT NULL,
+            attended_sessions INTEGER,
+            total_sessions INTEGER,
+            attendance_rate REAL,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+            FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE CASCADE
+        );
+    """)
+    cursor.execute("""
+        CREATE TABLE submission_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            module_id INTEGER NOT NULL,
+            assessment_name TEXT NOT NULL,
+            due_date TEXT,
+            submitted_date TEXT,
+            is_submitted INTEGER NOT NULL DEFAULT 0,
+            is_late INTEGER NOT NULL DEFAULT 0,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+            FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE CASCADE
+        );
+    """)
+    cursor.execute("""
+        CREATE TABLE survey_responses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            module_id INTEGER,
+            week_number INTEGER NOT NULL,
+            stress_level INTEGER NOT NULL,
+            hours_slept REAL,
+            mood_comment TEXT,
+            created_at TEXT,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+            FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE SET NULL
+        );
+    """)
+    cursor.execute("""
+        CREATE TABLE grades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            module_id INTEGER NOT NULL,
+            assessment_name TEXT NOT NULL,
+            grade REAL,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+            FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE CASCADE
+        );
+    """)
+    cursor.execute("""
+        CREATE TABLE alerts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            module_id INTEGER,
+            week_number INTEGER,
+            reason TEXT NOT NULL,
+            created_at TEXT,
+            resolved INTEGER NOT NULL DEFAULT 0,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+            FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE SET NULL
+        );
+    """)
+    cursor.execute("""
+        CREATE TABLE stress_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            module_id INTEGER,
+            survey_response_id INTEGER,
+            week_number INTEGER,
+            stress_level INTEGER NOT NULL,
+            cause_category TEXT NOT NULL,
+            description TEXT,
+            source TEXT NOT NULL,
+            created_at TEXT,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
+            FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE SET NULL,
+            FOREIGN KEY (survey_response_id) REFERENCES survey_responses(id) ON DELETE SET NULL
+        );
+    """)
+
+def assessment_due_weeks(assessments: int, weeks: int) -> list[int]:
+    """
+    Returns the due week of each assessment, spread evenly over the term.
+
+    With the defaults (2 assessments over 10 weeks) the due weeks are 4 and 8.
+
+    Args:
+        assessments (int): The number of assessments per module.
+        weeks (int): The number of academic weeks.
+
+    Returns:
+        list[int]: The due week of each assessment, in order.
+    """
+    return [max(1, idx * weeks * 2 // (assessments * 2 + 1)) for idx in range(1, assessments + 1)]
+
+def generate_students(student_ids, n_modules, weeks, assessments, seed, first_survey_id):
+    """
+    Generates the rows of every table for a contiguous range of students.
+
+    Each student draws from its own random stream, seeded from `seed` and the
+    student ID, so a student's rows do not depend on how the ID range is
+    split into chunks. Survey responses are given explicit IDs starting at
+    `first_survey_id`, which lets their stress events reference them without
+    reading them back from the database.
+
+    Args:
+        student_ids (range): The IDs of the students to generate.
+        n_modules (int): The number of modules (IDs 1..n_modules) students can enrol in.
+        weeks (int): The number of academic weeks of activity per enrolment.
+        assessments (int): The number of assessments per enrolment.
+        seed (int): The data set's random seed.
+        first_survey_id (int): The ID of the first survey response generated.
+
+    Returns:
+        tuple[dict[str, list[tuple]], int]: The rows for each table in `SEED_COLUMNS`,
+            and the ID following the last survey response generated. The 'users'
+            rows carry the plain-text password in place of its hash.
+    """
+    rows = {table: [] for table in SEED_COLUMNS}
+    survey_id = first_survey_id
+    module_ids = list(range(1, n_modules + 1))
+    assessment_names = [f"Assignment {idx}" for idx in range(1, assessments + 1)]
+    due_dates = [TERM_START_DATE + timedelta(weeks=week - 1) for week in assessment_due_weeks(assessments, weeks)]
+
+    for sid in student_ids:
+        rng = random.Random(f"{seed}:{sid}") # A per-student stream, independent of chunking.
+
+        # 1. Student record and linked user account (student role).
+        user_created_at = generate_random_datetime_in_range(REGISTRATION_PERIOD_START, REGISTRATION_PERIOD_END, rng)
+        email = f"student{sid}@example.com"
+        rows['students'].append((sid, f"S{sid:04d}", f"Student {sid}", email, rng.choice(COURSE_OPTIONS),
+                                 rng.randint(1, 2)))
+        # The password is hashed per chunk by seed_data(), across a process pool.
+        rows['users'].append((email, "password", "student", sid, user_created_at.isoformat()))
+
+        # 2. Enrolments, after the account was created; each student enrols in 3-5 modules.
+        enrol_date = (user_created_at + timedelta(days=rng.randint(1, 7))).isoformat()
+        enrolled_mids = rng.sample(module_ids, min(n_modules, rng.randint(3, 5)))
+        for mid in enrolled_mids:
+            rows['enrolments'].append((sid, mid, enrol_date))
+
+        for mid in enrolled_mids:
+            previous_high_stress = False
+            for w in range(1, weeks + 1):
+                # A. Attendance records: 2 sessions per module per week.
+                total_sessions = 2
+                attended_sessions = rng.randint(0, total_sessions)
+                attendance_rate = attended_sessions / total_sessions
+                rows['attendance_records'].append((sid, mid, w, attended_sessions, total_sessions, attendance_rate))
+
+                # B. Survey responses; stress is influenced by attendance for realism.
+                week_date = TERM_START_DATE + timedelta(weeks=w - 1)
+                created_at = datetime.combine(week_date, datetime.min.time()).replace(hour=rng.randint(9, 22), minute=rng.randint(0, 59))
+                stress_level = int(round(max(1, min(5, rng.gauss(3 + (1 - attendance_rate) * 2, 0.8)))))
+                hours_slept = max(3.0, min(10.0, rng.gauss(7 + attendance_rate, 1.0)))
+                rows['survey_responses'].append((survey_id, sid, mid, w, stress_level, hours_slept, None, created_at.isoformat()))
+
+                # C. A stress event shortly after each high-stress survey, and an alert
+                #    on the second of two consecutive high-stress weeks.
+                high_stress = stress_level >= 4
+                if high_stress:
+                    event_time = created_at + timedelta(minutes=rng.randint(5, 120))
+                    rows['stress_events'].append((sid, mid, survey_id, w, stress_level, rng.choice(["academic", "personal"]),
+                                                  f"High stress reported (level {stress_level}).",
+                                                  "survey_response_system", event_time.isoformat()))
+                    if previous_high_stress:
+                        alert_time = created_at + timedelta(hours=rng.randint(1, 5))
+                        reason = (f"Stress level >= 4 for two consecutive weeks ({w - 1} and {w}) "
+                                  f"in module_id={mid} for student_id={sid}.")
+                        rows['alerts'].append((sid, mid, w, reason, alert_time.isoformat()))
+                previous_high_stress = high_stress
+                survey_id += 1
+
+            # D. Submissions and grades, relative to the due dates.
+            for aname, due_date in zip(assessment_names, due_dates):
+                is_submitted = 1 if rng.random() < 0.9 else 0 # 90% chance of submission.
+                submitted_date_str = None
+                is_late = 0
+                if is_submitted:
+                    # Mostly on time, some late.
+                    delta_days = -rng.randint(0, 2) if rng.random() < 0.8 else rng.randint(1, 5)
+                    submitted_date = due_date + timedelta(days=delta_days)
+                    submitted_date_str = datetime.combine(submitted_date, datetime.min.time()).replace(hour=rng.randint(9, 17)).isoformat()
+                    is_late = 1 if submitted_date > due_date else 0
+                rows['submission_records'].append((sid, mid, aname, due_date.isoformat(), submitted_date_str, is_submitted, is_late))
+
+                # Higher grades for submitted work, with a penalty for late submissions.
+                grade_value = rng.uniform(40.0, 95.0) if is_submitted else rng.uniform(0, 35)
+                if is_submitted and is_late:
+                    grade_value = max(0.0, grade_value - rng.uniform(5, 15))
+                rows['grades'].append((sid, mid, aname, grade_value))
+
+    return rows, survey_id
+
+def hash_user_passwords(rows, method=None, workers=None):
+    """
+    Replaces the plain-text passwords in generated 'users' rows with salted hashes, in place.
+
+    Args:
+        rows (dict[str, list[tuple]]): Rows returned by `generate_students`.
+        method (str, optional): The hashing method. Defaults to the `PASSWORD_HASH_METHOD` setting.
+        workers (int, optional): Hashing processes (see `hash_passwords`).
+    """
+    users = rows['users']
+    password_hashes = hash_passwords((user[1] for user in users), method=method, workers=workers)
+    rows['users'] = [(user[0], password_hash, *user[2:]) for user, password_hash in zip(users, password_hashes)]
+
+def build_shard(shard_path, student_ids, n_modules, weeks, assessments, seed, password_method):
+    """
+    Generates a range of students into a standalone shard database file.
+
+    Runs in a worker process of `seed_data()`: the rows are generated exactly
+    as `generate_students` would in the parent, with survey response IDs
+    numbered from 1 within the shard, and written to `shard_path` with the
+    same table layout. The parent merges shards with `merge_shard`.
+
+    Args:
+        shard_path (str): The path of the shard database file to create.
+        student_ids (range): The IDs of the students to generate.
+        n_modules (int): The number of modules.
+        weeks (int): The number of academic weeks.
+        assessments (int): The number of assessments per enrolment.
+        seed (int): The data set's random seed.
+        password_method (str): The password hashing method (workers have no application context).
+
+    Returns:
+        int: The number of survey responses in the shard.
+    """
+    rows, next_survey_id = generate_students(student_ids, n_modules, weeks, assessments, seed, 1)
+    hash_user_passwords(rows, method=password_method, workers=1) # Shards already run in parallel.
+    shard = sqlite3.connect(shard_path)
+    try:
+        # A scratch file: no journal and no fsync, it is discarded after the merge.
+        shard.execute("PRAGMA journal_mode = OFF")
+        shard.execute("PRAGMA synchronous = OFF")
+        create_tables(shard)
+        with shard:
+            for table in SEED_COLUMNS:
+                shard.executemany(insert_statement(table), rows[table])
+    finally:
+        shard.close()
+    return next_survey_id - 1
+
+def merge_shard(db, shard_path, survey_id_offset):
+    """
+    Copies a shard built by `build_shard` into the main database, in one transaction.
+
+    Each table is copied with a single `INSERT ... SELECT` in the shard's row
+    order, so rows get the same IDs as if they had been generated and
+    inserted by the parent process. Survey response IDs are shifted by
+    `survey_id_offset`.
+
+    Args:
+        db (sqlite3.Connection): The main database connection, with no open transaction.
+        shard_path (str): The path of the shard database file.
+        survey_id_offset (int): The number of survey responses loaded before this shard.
+    """
+    db.execute("ATTACH DATABASE ? AS shard", (shard_path,)) # Not allowed inside a transaction.
+    try:
+        with transaction(db):
+            for table, columns in SEED_COLUMNS.items():
+                select = ', '.join(f"{column} + {int(survey_id_offset)}" if (table, column) in SURVEY_ID_COLUMNS else column
+                                   for column in columns)
+                db.execute(f"INSERT INTO main.{table} ({', '.join(columns)}) SELECT {select} FROM shard.{table} ORDER BY rowid")
+    finally:
+        db.execute("DETACH DATABASE shard")
+
+def seed_data(students=DEFAULT_STUDENTS, modules=DEFAULT_MODULES, weeks=DEFAULT_WEEKS,
+              assessments=DEFAULT_ASSESSMENTS, seed=DEFAULT_SEED, chunk_size=None, workers=None):
     """
     Initializes and populates the database with schema and demo data.
 
     This function performs a series of critical database operations:
-    1. Drops all existing tables to ensure a clean slate.
-    2. Creates all necessary tables with their defined schemas.
-    3. Inserts a comprehensive set of demo data for users, students, modules,
-       enrolments, attendance, submissions, survey responses, grades, alerts,
-       and stress events.
-    4. Integrates error handling and transaction management to ensure data
-       integrity and provide informative logging.
+    1. Drops all existing tables to ensure a clean slate, and recreates
+       them without secondary indexes or triggers.
+    2. Inserts the demo data: staff users and modules, then students (with
+       their user accounts, enrolments, attendance, submissions, survey
+       responses, grades, stress events and alerts) in chunks of
+       `chunk_size` students. Each chunk is generated in memory, loaded with
+       one `executemany` per table and committed as one transaction. With
+       `workers` > 1, chunks are generated by a pool of worker processes into
+       shard database files instead, which are merged in chunk order with
+       `ATTACH` and `INSERT ... SELECT`.
+    3. Creates the versioned secondary index set and the trigger-maintained
+       `student_week_stats` summary table from `utils/schema.py`, and
+       computes the summary table from the loaded rows.
 
-    The entire process is wrapped in a transaction; if any step fails,
-    all changes are rolled back.
+    Building indexes and summaries once, after loading, is much faster than
+    maintaining them for every inserted row. The default arguments produce
+    the small demo data set used in development and tests. The same seed
+    and dimensions always produce the same data (apart from the random
+    salts of the password hashes), whatever the chunk size or number of
+    workers, because every student draws from its own random stream.
+
+    Args:
+        students (int, optional): The number of students. Defaults to 50.
+        modules (int, optional): The number of modules. Defaults to 8.
+        weeks (int, optional): The number of academic weeks of activity. Defaults to 10.
+        assessments (int, optional): The number of assessments per module. Defaults to 2.
+        seed (int, optional): The random seed. Defaults to 42.
+        chunk_size (int, optional): Students generated and committed per transaction.
+                                    Defaults to the `SEED_CHUNK_SIZE` setting.
+        workers (int, optional): Processes generating chunks in parallel. Defaults to the
+                                 `SEED_WORKERS` setting; 1 generates in this process.
 
     Raises:
         ConnectionError: If there's a critical failure to connect to the database.
         sqlite3.Error: If any SQL execution or database operation fails.
         Exception: For any other unexpected errors during the seeding process.
     """
+    chunk_size = chunk_size or current_app.config.get('SEED_CHUNK_SIZE', 1000)
+    workers = workers or current_app.config.get('SEED_WORKERS') or 1
     db = None # Initialize db to None to safely handle rollback in case get_db() fails.
     try:
         db = get_db() # Obtain the database connection from the Flask application context.
@@ -63,322 +490,62 @@ def seed_data():
         current_app.logger.info("Starting database seeding process...")
 
         # ======================================================================
-        # Phase 1: Drop existing tables to ensure a clean database state.
-        # This is crucial for repeatable seeding in development/testing.
+        # Phase 1: Drop and recreate the tables, without indexes or triggers.
         # ======================================================================
-        current_app.logger.info("Dropping existing tables...")
-        drop_statements = [
-            "DROP TABLE IF EXISTS stress_events;",
-            "DROP TABLE IF EXISTS alerts;",
-            "DROP TABLE IF EXISTS grades;",
-            "DROP TABLE IF EXISTS submission_records;",
-            "DROP TABLE IF EXISTS attendance_records;",
-            "DROP TABLE IF EXISTS survey_responses;",
-            "DROP TABLE IF EXISTS enrolments;",
-            "DROP TABLE IF EXISTS modules;",
-            "DROP TABLE IF EXISTS users;",
-            "DROP TABLE IF EXISTS students;",
-        ]
-        for stmt in drop_statements:
-            cursor.execute(stmt)
-        db.commit() # Commit changes after dropping tables.
-        current_app.logger.info("Existing tables dropped successfully.")
+        current_app.logger.info("Recreating tables...")
+        create_tables(cursor)
+        db.commit()
 
         # ======================================================================
-        # Phase 2: Create all necessary tables with their defined schemas.
-        # This establishes the database structure for the application.
+        # Phase 2: Insert the demo data in memory-bounded chunks of students.
         # ======================================================================
-        current_app.logger.info("Creating tables...")
-        cursor.execute("""
-            CREATE TABLE students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_number TEXT NOT NULL UNIQUE,
-                full_name TEXT NOT NULL,
-                email TEXT,
-                course_name TEXT,
-                year_of_study INTEGER,
-                is_active INTEGER NOT NULL DEFAULT 1
-            );
-        """)
-        cursor.execute("""
-            CREATE TABLE users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL UNIQUE,
-                password_hash TEXT NOT NULL,
-                role TEXT NOT NULL,
-                student_id INTEGER,
-                created_at TEXT,
-                is_active INTEGER NOT NULL DEFAULT 1,
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE SET NULL
-            );
-        """)
-        cursor.execute("""
-            CREATE TABLE modules (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                module_code TEXT NOT NULL UNIQUE,
-                module_title TEXT NOT NULL,
-                credit INTEGER,
-                academic_year TEXT,
-                is_active INTEGER NOT NULL DEFAULT 1
-            );
-        """)
-        cursor.execute("""
-            CREATE TABLE enrolments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                module_id INTEGER NOT NULL,
-                enrol_date TEXT,
-                is_active INTEGER NOT NULL DEFAULT 1,
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE CASCADE
-            );
-        """)
-        cursor.execute("""
-            CREATE TABLE attendance_records (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                module_id INTEGER NOT NULL,
-                week_number INTEGER NOT NULL,
-                attended_sessions INTEGER,
-                total_sessions INTEGER,
-                attendance_rate REAL,
-                is_active INTEGER NOT NULL DEFAULT 1,
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE CASCADE
-            );
-        """)
-        cursor.execute("""
-            CREATE TABLE submission_records (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                module_id INTEGER NOT NULL,
-                assessment_name TEXT NOT NULL,
-                due_date TEXT,
-                submitted_date TEXT,
-                is_submitted INTEGER NOT NULL DEFAULT 0,
-                is_late INTEGER NOT NULL DEFAULT 0,
-                is_active INTEGER NOT NULL DEFAULT 1,
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE CASCADE
-            );
-        """)
-        cursor.execute("""
-            CREATE TABLE survey_responses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                module_id INTEGER,
-                week_number INTEGER NOT NULL,
-                stress_level INTEGER NOT NULL,
-                hours_slept REAL,
-                mood_comment TEXT,
-                created_at TEXT,
-                is_active INTEGER NOT NULL DEFAULT 1,
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE SET NULL
-            );
-        """)
-        cursor.execute("""
-            CREATE TABLE grades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                module_id INTEGER NOT NULL,
-                assessment_name TEXT NOT NULL,
-                grade REAL,
-                is_active INTEGER NOT NULL DEFAULT 1,
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE CASCADE
-            );
-        """)
-        cursor.execute("""
-            CREATE TABLE alerts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                module_id INTEGER,
-                week_number INTEGER,
-                reason TEXT NOT NULL,
-                created_at TEXT,
-                resolved INTEGER NOT NULL DEFAULT 0,
-                is_active INTEGER NOT NULL DEFAULT 1,
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE SET NULL
-            );
-        """)
-        cursor.execute("""
-            CREATE TABLE stress_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                module_id INTEGER,
-                survey_response_id INTEGER,
-                week_number INTEGER,
-                stress_level INTEGER NOT NULL,
-                cause_category TEXT NOT NULL,
-                description TEXT,
-                source TEXT NOT NULL,
-                created_at TEXT,
-                is_active INTEGER NOT NULL DEFAULT 1,
-                FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE,
-                FOREIGN KEY (module_id) REFERENCES modules(id) ON DELETE SET NULL,
-                FOREIGN KEY (survey_response_id) REFERENCES survey_responses(id) ON DELETE SET NULL
-            );
-        """)
-        db.commit() # Commit changes after creating all tables.
-        current_app.logger.info("Tables created successfully.")
+        current_app.logger.info(f"Inserting demo data for {students} students, {modules} modules and {weeks} weeks...")
+        rng = random.Random(seed)
+        with transaction(db):
+            # Staff users (Admin, Course Director, Wellbeing Officer).
+            staff_creation_start = REGISTRATION_PERIOD_START - timedelta(days=30)
+            users_data = [
+                (username, hash_password(password), role, None,
+                 generate_random_datetime_in_range(staff_creation_start, REGISTRATION_PERIOD_START, rng).isoformat())
+                for username, password, role in [("admin", "admin", "admin"),
+                                                 ("course_director", "password", "course_director"),
+                                                 ("wellbeing_officer", "password", "wellbeing_officer")]
+            ]
+            cursor.executemany(insert_statement('users'), users_data)
+
+            # Modules, numbered 1..modules; titles repeat with a number suffix past the named ones.
+            module_insert_data = []
+            for i in range(1, modules + 1):
+                title = MODULE_TITLES[(i - 1) % len(MODULE_TITLES)]
+                if i > len(MODULE_TITLES):
+                    title += f" {(i - 1) // len(MODULE_TITLES) + 1}"
+                module_insert_data.append((i, f"MOD{100 + i}", title, 15, "2025/2026"))
+            cursor.executemany("INSERT INTO modules (id, module_code, module_title, credit, academic_year, is_active) VALUES (?, ?, ?, ?, ?, 1)", module_insert_data)
+
+        chunks = [range(first, min(first + chunk_size, students + 1)) for first in range(1, students + 1, chunk_size)]
+        if workers > 1:
+            _load_sharded(db, chunks, modules, weeks, assessments, seed, workers)
+        else:
+            next_survey_id = 1
+            for student_ids in chunks:
+                rows, next_survey_id = generate_students(student_ids, modules, weeks, assessments, seed, next_survey_id)
+                # Every student account gets its own salted hash, computed in parallel with the
+                # configured (and, outside production, low-cost) PASSWORD_HASH_METHOD.
+                hash_user_passwords(rows)
+                with transaction(db):
+                    for table in SEED_COLUMNS:
+                        cursor.executemany(insert_statement(table), rows[table])
+                current_app.logger.info(f"Loaded students {student_ids.start}-{student_ids.stop - 1}.")
 
         # ======================================================================
-        # Phase 3: Insert comprehensive demo data for various entities.
-        # This populates the tables with realistic data for testing and demonstration.
+        # Phase 3: Build the indexes and the summary table over the loaded data.
         # ======================================================================
-        current_app.logger.info("Inserting demo data...")
-        random.seed(42) # Seed the random number generator for reproducible demo data.
-        
-        # 1. Define Core Time Anchors for data generation.
-        term_start_date = date(2025, 2, 3)
-        registration_period_end = term_start_date - timedelta(days=10)
-        registration_period_start = registration_period_end - timedelta(days=60)
-        
-        # 2. Staff Users (Admin, Course Director, Wellbeing Officer).
-        staff_creation_start = registration_period_start - timedelta(days=30)
-        users_data = [
-            ("admin", generate_password_hash("admin"), "admin", None, generate_random_datetime_in_range(staff_creation_start, registration_period_start).isoformat(), 1),
-            ("course_director", generate_password_hash("password"), "course_director", None, generate_random_datetime_in_range(staff_creation_start, registration_period_start).isoformat(), 1),
-            ("wellbeing_officer", generate_password_hash("password"), "wellbeing_officer", None, generate_random_datetime_in_range(staff_creation_start, registration_period_start).isoformat(), 1),
-        ]
-        cursor.executemany("INSERT INTO users (username, password_hash, role, student_id, created_at, is_active) VALUES (?, ?, ?, ?, ?, ?)", users_data)
-
-        # 3. Modules.
-        module_titles = [
-            "Introduction to Programming", "Data Structures and Algorithms", "Database Systems",
-            "Machine Learning Fundamentals", "Deep Learning Basics", "Data Visualisation",
-            "Software Engineering", "AI Ethics and Society",
-        ]
-        module_insert_data = [
-            (f"MOD10{i}", title, 15, "2025/2026", 1)
-            for i, title in enumerate(module_titles, start=1)
-        ]
-        cursor.executemany("INSERT INTO modules (module_code, module_title, credit, academic_year, is_active) VALUES (?, ?, ?, ?, ?)", module_insert_data)
-        db.commit()
-        # Retrieve generated module IDs for linking with enrolments.
-        cursor.execute("SELECT id FROM modules")
-        module_ids = [row[0] for row in cursor.fetchall()]
-
-        # 4. Students, linked User accounts (student role), and Enrolments.
-        student_creation_dates = {} # Store creation dates to ensure enrolment is after user creation.
-        course_options = ["MSc Applied AI", "MSc Data Science", "MSc Cyber Security"]
-        for i in range(1, 51): # Generate 50 students.
-            # A. Generate a realistic "birth" date for the student's system entry.
-            user_created_at = generate_random_datetime_in_range(registration_period_start, registration_period_end)
-            student_creation_dates[i] = user_created_at # Store for later use.
-
-            # B. Create Student Record.
-            student_number = f"S{i:04d}"
-            full_name = f"Student {i}"
-            email = f"student{i}@example.com"
-            course_name = random.choice(course_options)
-            year_of_study = random.randint(1, 2)
-            cursor.execute("INSERT INTO students (student_number, full_name, email, course_name, year_of_study, is_active) VALUES (?, ?, ?, ?, ?, 1)",
-                           (student_number, full_name, email, course_name, year_of_study))
-            student_id = cursor.lastrowid
-            
-            # C. Create Linked User Record with 'student' role.
-            cursor.execute("INSERT INTO users (username, password_hash, role, student_id, created_at, is_active) VALUES (?, ?, ?, ?, ?, 1)",
-                           (email, generate_password_hash("password"), "student", student_id, user_created_at.isoformat()))
-
-            # D. Create Enrolments for this student, ensuring enrol_date is after user_created_at.
-            enrol_date = (user_created_at + timedelta(days=random.randint(1, 7))).isoformat()
-            chosen_modules = random.sample(module_ids, random.randint(3, 5)) # Each student enrolls in 3-5 modules.
-            for mid in chosen_modules:
-                cursor.execute("INSERT INTO enrolments (student_id, module_id, enrol_date, is_active) VALUES (?, ?, ?, 1)",
-                               (student_id, mid, enrol_date))
+        current_app.logger.info("Creating indexes and summary tables...")
+        create_indexes(cursor) # Secondary indexes for the student/module/week access paths.
         db.commit()
+        rebuild_student_week_stats(db) # Creates student_week_stats and its triggers, fills it and commits.
 
-        # 5. Weekly Activities (Attendance, Surveys, Submissions, Grades).
-        cursor.execute("SELECT id FROM students")
-        student_ids = [row[0] for row in cursor.fetchall()]
-        weeks = list(range(1, 11)) # Simulate 10 academic weeks.
-        assessment_names = ["Assignment 1", "Assignment 2"]
-
-        for sid in student_ids:
-            # Get modules each student is enrolled in.
-            cursor.execute("SELECT module_id FROM enrolments WHERE student_id = ?", (sid,))
-            enrolled_mids = [row[0] for row in cursor.fetchall()]
-
-            for mid in enrolled_mids:
-                for w in weeks:
-                    # A. Attendance Records.
-                    total_sessions = 2 # Assume 2 sessions per module per week.
-                    attended_sessions = random.randint(0, total_sessions)
-                    attendance_rate = attended_sessions / total_sessions if total_sessions > 0 else 0.0
-                    cursor.execute("INSERT INTO attendance_records (student_id, module_id, week_number, attended_sessions, total_sessions, attendance_rate, is_active) VALUES (?, ?, ?, ?, ?, ?, 1);",
-                                   (sid, mid, w, attended_sessions, total_sessions, attendance_rate))
-
-                    # B. Survey Responses (stress levels, sleep, mood).
-                    week_date = term_start_date + timedelta(weeks=w - 1)
-                    created_at_dt = datetime.combine(week_date, datetime.min.time()).replace(hour=random.randint(9, 22), minute=random.randint(0, 59))
-                    # Stress level influenced by attendance rate for realism.
-                    stress_level = int(round(max(1, min(5, random.gauss(3 + (1 - attendance_rate) * 2, 0.8)))))
-                    hours_slept = max(3.0, min(10.0, random.gauss(7 + attendance_rate, 1.0)))
-                    cursor.execute("INSERT INTO survey_responses (student_id, module_id, week_number, stress_level, hours_slept, mood_comment, created_at, is_active) VALUES (?, ?, ?, ?, ?, ?, ?, 1);",
-                                   (sid, mid, w, stress_level, hours_slept, None, created_at_dt.isoformat()))
-                db.commit() # Commit weekly activities per student per module.
-
-            # C. Submissions & Grades (relative to due dates).
-            for idx, aname in enumerate(assessment_names, start=1):
-                due_date = term_start_date + timedelta(weeks=(4 if idx == 1 else 8) - 1) # Due dates for Assignment 1 (Week 4) and 2 (Week 8).
-                is_submitted = 1 if random.random() < 0.9 else 0 # 90% chance of submission.
-                submitted_date_str = None
-                is_late = 0
-                if is_submitted:
-                    # Simulate submission date: mostly on time, some late.
-                    delta_days = -random.randint(0, 2) if random.random() < 0.8 else random.randint(1, 5)
-                    submitted_date = due_date + timedelta(days=delta_days)
-                    submitted_date_str = datetime.combine(submitted_date, datetime.min.time()).replace(hour=random.randint(9, 17)).isoformat()
-                    if submitted_date > due_date:
-                        is_late = 1
-
-                cursor.execute("INSERT INTO submission_records (student_id, module_id, assessment_name, due_date, submitted_date, is_submitted, is_late, is_active) VALUES (?, ?, ?, ?, ?, ?, ?, 1);",
-                               (sid, mid, aname, due_date.isoformat(), submitted_date_str, is_submitted, is_late))
-                
-                # Assign grades: higher for submitted, lower for not submitted/late.
-                grade_value = random.uniform(40.0, 95.0) if is_submitted else random.uniform(0, 35)
-                if is_submitted and is_late: # Penalty for late submission.
-                    grade_value = max(0.0, grade_value - random.uniform(5, 15))
-                cursor.execute("INSERT INTO grades (student_id, module_id, assessment_name, grade, is_active) VALUES (?, ?, ?, ?, 1);",
-                               (sid, mid, aname, grade_value))
-            db.commit() # Commit submissions and grades per student per module.
-
-        # 6. Stress Events and Alerts (generated chronologically after surveys).
-        # Retrieve all survey responses to process for events and alerts.
-        cursor.execute("SELECT id, student_id, module_id, week_number, stress_level, created_at FROM survey_responses WHERE is_active = 1 ORDER BY created_at")
-        all_surveys = cursor.fetchall()
-        
-        for survey_row in all_surveys:
-            survey_time = datetime.fromisoformat(survey_row['created_at'])
-            # A. Create Stress Events for high stress levels.
-            if survey_row['stress_level'] >= 4: # Threshold for high stress.
-                event_time = survey_time + timedelta(minutes=random.randint(5, 120)) # Event occurs shortly after survey.
-                cursor.execute("INSERT OR IGNORE INTO stress_events (student_id, module_id, survey_response_id, week_number, stress_level, cause_category, description, source, created_at, is_active) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1);",
-                               (survey_row['student_id'], survey_row['module_id'], survey_row['id'], survey_row['week_number'], survey_row['stress_level'], random.choice(["academic", "personal"]), f"High stress reported (level {survey_row['stress_level']}).", "survey_response_system", event_time.isoformat()))
-        db.commit() # Commit all generated stress events.
-
-        # B. Create Alerts for consecutive high stress.
-        # Re-fetch survey responses filtered for high stress to check for patterns.
-        cursor.execute("SELECT student_id, module_id, week_number, stress_level, created_at FROM survey_responses WHERE stress_level >= 4 AND is_active = 1 ORDER BY student_id, module_id, week_number")
-        high_stress_surveys = cursor.fetchall()
-        for i in range(1, len(high_stress_surveys)):
-            current = high_stress_surveys[i]
-            prev = high_stress_surveys[i-1]
-            # Check for consecutive weeks of high stress for the same student in the same module.
-            if current['student_id'] == prev['student_id'] and \
-               current['module_id'] == prev['module_id'] and \
-               current['week_number'] == prev['week_number'] + 1:
-                
-                alert_time = datetime.fromisoformat(current['created_at']) + timedelta(hours=random.randint(1, 5)) # Alert generated shortly after second high-stress survey.
-                reason = (f"Stress level >= 4 for two consecutive weeks ({prev['week_number']} and {current['week_number']}) "
-                          f"in module_id={current['module_id']} for student_id={current['student_id']}.")
-                cursor.execute("INSERT OR IGNORE INTO alerts (student_id, module_id, week_number, reason, created_at, resolved, is_active) VALUES (?, ?, ?, ?, ?, 0, 1);",
-                               (current['student_id'], current['module_id'], current['week_number'], reason, alert_time.isoformat()))
-        db.commit() # Commit all generated alerts.
-
+        clear_result_cache() # Cached analysis results describe the old data set.
         current_app.logger.info("Database seeding completed successfully.")
 
     except ConnectionError as e:
@@ -399,3 +566,40 @@ def seed_data():
         if db:
             db.rollback() # Rollback for any other unexpected errors.
         raise # Re-raise to propagate the error.
+
+def _load_sharded(db, chunks, n_modules, weeks, assessments, seed, workers):
+    """
+    Generates `chunks` of students in `workers` processes and merges their shards in chunk order.
+
+    At most two shards per worker are pending at any time, which bounds the
+    scratch disk space; shard files are created next to the database and
+    removed once merged.
+    """
+    password_method = password_hash_method()
+    shard_dir = tempfile.mkdtemp(prefix='seed-shards-', dir=os.path.dirname(os.path.abspath(current_app.config['DATABASE_PATH'])))
+    next_survey_id = 1
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+
+            def merge_oldest():
+                nonlocal next_survey_id
+                student_ids, shard_path, future = pending.popleft()
+                survey_count = future.result()
+                merge_shard(db, shard_path, next_survey_id - 1)
+                next_survey_id += survey_count
+                os.remove(shard_path)
+                current_app.logger.info(f"Merged students {student_ids.start}-{student_ids.stop - 1}.")
+
+            for index, student_ids in enumerate(chunks):
+                shard_path = os.path.join(shard_dir, f"shard-{index}.sqlite")
+                pending.append((student_ids, shard_path, executor.submit(
+                    build_shard, shard_path, student_ids, n_modules, weeks, assessments, seed, password_method)))
+                if len(pending) >= 2 * workers:
+                    merge_oldest()
+            while pending:
+                merge_oldest()
+    finally:
+        for name in os.listdir(shard_dir):
+            os.remove(os.path.join(shard_dir, name))
+        os.rmdir(shard_dir)